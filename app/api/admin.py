@@ -0,0 +1,175 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+
+from core.audit import audit_log
+from core.auth import get_current_admin
+from core.database import get_db, get_read_db
+from core.pagination import MAX_PAGE_SIZE
+from core.principal_cache import Principal
+from core.rate_limit import rate_limit
+from schemas.audit import AuditPage
+from schemas.auth import UserProvisionRequest, UserProvisionResult
+from schemas.job import JobList, JobResponse
+from services.audit import list_audit
+from services.jobs import list_jobs, retry_job
+from services.moderation_stats import get_counts, last_reconcile, reconcile
+from services.user import provision_users
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(rate_limit("admin"))],
+)
+
+@router.post("/users/bulk", response_model=UserProvisionResult)
+async def bulk_create_users(
+    request: UserProvisionRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    批量创建用户（仅管理员），用于迁移其他系统的已有用户
+
+    密码在工作池中并行哈希，用户分批以多行 INSERT 写入；
+    与已有用户或请求中前面的用户重复的条目跳过，并在结果中说明原因。
+
+    Args:
+        request: 待创建的用户列表
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        UserProvisionResult: 创建数量和跳过的用户
+    """
+    result = await provision_users(db, request.users)
+    audit_log.record(
+        "user.bulk_create", current_user, "user", None,
+        {"created": result.created, "skipped": len(result.skipped)}
+    )
+    return result
+
+@router.get("/stats")
+async def get_moderation_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    门店（按类型）和商家的审核状态计数（仅管理员）
+
+    计数随业务写入增量维护，只读取计数表，不扫描门店、商家表
+
+    Args:
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        dict: 门店合计与按类型的待审核/通过/驳回数量，商家各状态数量，以及本进程最近一次对账结果
+    """
+    return {**await get_counts(db), "reconcile": last_reconcile or None}
+
+@router.post("/stats/reconcile")
+async def reconcile_moderation_stats(
+    repair: bool = True,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    立即对账审核计数（仅管理员），重新统计门店和商家数量并与计数表比较
+
+    Args:
+        repair: 为 True 时修正计数表
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        dict: 有偏差的计数项及差值（实际数量 - 计数表）
+    """
+    drift = await reconcile(db, repair)
+    return {
+        "repaired": repair and bool(drift),
+        "drift": [
+            {"entity": entity, "category": category, "status": status, "delta": delta}
+            for (entity, category, status), delta in sorted(drift.items())
+        ],
+    }
+
+@router.get("/jobs", response_model=JobList)
+async def get_jobs(
+    status: Optional[str] = Query("dead", regex="^(pending|running|dead)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    查看后台任务（仅管理员），默认列出重试耗尽的死信任务
+
+    Args:
+        status: 任务状态：pending、running 或 dead
+        limit: 最多返回的条数
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        JobList: 任务列表，按ID倒序
+    """
+    return JobList(items=await list_jobs(db, status, limit))
+
+@router.post("/jobs/{job_id}/retry", response_model=JobResponse)
+async def retry_dead_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    将死信任务重新排队（仅管理员）
+
+    Args:
+        job_id: 任务ID
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        JobResponse: 重新排队的任务
+    """
+    return await retry_job(db, job_id)
+
+@router.get("/audit", response_model=AuditPage)
+async def get_audit_log(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[str] = None,
+    actor_id: Optional[int] = None,
+    target_type: Optional[str] = Query(None, regex="^(store|merchant|user)$"),
+    target_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    查询审计日志（仅管理员），按发生时间倒序
+
+    必须限定时间窗口，默认最近一天；审计事件批量写入，最近几秒内的操作可能尚未出现
+
+    Args:
+        since: 窗口开始时间（含）
+        until: 窗口结束时间（不含），默认为当前时间
+        action: 按操作筛选，例如 merchant.approve
+        actor_id: 按操作人用户ID筛选
+        target_type: 按对象类型筛选
+        target_id: 按对象ID筛选，需同时指定 target_type
+        cursor: 上一页返回的游标
+        limit: 每页条数
+        db: 数据库会话
+        current_user: 当前管理员
+
+    Returns:
+        AuditPage: 审计日志和下一页游标
+    """
+    entries, next_cursor = await list_audit(
+        db, limit, since, until, cursor,
+        action=action, actor_id=actor_id, target_type=target_type, target_id=target_id
+    )
+    return AuditPage(items=entries, next_cursor=next_cursor)
@@ -1,76 +1,65 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.audit import audit_log
 from core.database import get_db
+from core.principal_cache import Principal
+from core.rate_limit import client_ip, login_guard, rate_limit
 from schemas.auth import LoginRequest, LoginResponse, RegisterRequest, UserRole, SocialPreference
 from services.auth import (
     authenticate_user,
     create_access_token,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
-    get_password_hash
+    ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from models.user import User
+from services.user import create_user
 
-# 创建路由器
-router = APIRouter()
+# 创建路由器，按客户端地址限流
+router = APIRouter(dependencies=[Depends(rate_limit("auth"))])
 
 @router.post("/register", response_model=dict)
 async def register(
     request: RegisterRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     用户注册接口
+    用户名和账号是否重复由唯一约束判断，插入即完成注册
     :param request: 注册请求数据
+    :param http_request: 请求对象，用于取客户端地址
     :param db: 数据库会话
     :return: 注册结果
     """
-    # 检查用户名是否已存在
-    if db.query(User).filter(User.username == request.username).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # 检查账号是否已存在
-    if db.query(User).filter(User.account == request.account).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Account already registered"
-        )
-    
-    # 创建新用户
-    hashed_password = get_password_hash(request.password)
-    db_user = User(
-        username=request.username,
-        account=request.account,
-        password=hashed_password,
-        phone_number=request.phone_number,
-        social_preference=request.social_preference,
-        role=UserRole.NORMAL
+    user = await create_user(db, request)
+    audit_log.record(
+        "user.register", None, "user", user.id, {"account": user.account}, ip=client_ip(http_request)
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
     return {"message": "User created successfully"}
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     用户登录接口
+    :param request: 请求对象，用于取客户端地址
     :param form_data: 登录表单数据
     :param db: 数据库会话
     :return: 登录成功返回用户信息和访问令牌
     """
+    # 处于失败锁定期或账号尝试过于频繁时直接拒绝，不查询用户也不验证密码
+    ip = client_ip(request)
+    await login_guard.check(form_data.username, ip)
+
     # 验证用户
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
+        await login_guard.failed(form_data.username, ip)
+        audit_log.record("user.login_failed", None, "user", None, {"account": form_data.username}, ip=ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect account or password",
@@ -78,11 +67,18 @@ async def login(
         )
     # 检查用户是否被禁用
     if user.is_disabled:
+        audit_log.record(
+            "user.login_failed", None, "user", user.id,
+            {"account": user.account, "reason": "disabled"}, ip=ip
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is disabled"
         )
     
+    await login_guard.succeeded(form_data.username, ip)
+    audit_log.record("user.login", Principal.from_user(user), "user", user.id, ip=ip)
+
     # 创建访问令牌
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -0,0 +1,152 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth import create_stream_ticket, get_current_user, get_ticket_user
+from core.config import settings
+from core.database import get_db
+from core.events import OVERFLOW, event_broker
+from core.principal_cache import Principal
+from core.rate_limit import rate_limit
+from core.serialization import dumps
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    dependencies=[Depends(rate_limit("events"))],
+)
+
+# EventSource 无法设置请求头：先用访问令牌换取一次性票据，再通过 ticket 查询参数订阅；
+# 访问令牌不放在 URL 中，不会出现在访问日志和代理日志里
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+
+async def get_event_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    获取订阅事件的当前用户，取 Authorization 请求头中的令牌或 ticket 查询参数中的一次性票据
+    :param token: 请求头中的JWT令牌
+    :param ticket: POST /events/ticket 签发的订阅票据
+    :param db: 数据库会话
+    :return: 用户快照
+    """
+    if token is None and ticket is not None:
+        return await get_ticket_user(ticket, db)
+    return await get_current_user(token or "", db)
+
+
+@router.post("/ticket")
+async def create_ticket(current_user: Principal = Depends(get_current_user)):
+    """
+    签发事件订阅票据（需在 Authorization 请求头中携带访问令牌）
+
+    票据只能使用一次，SSE_TICKET_TTL 秒后过期；EventSource 断线后需重新申请票据，
+    并通过 last_event_id 查询参数续传
+
+    Args:
+        current_user: 当前登录用户
+
+    Returns:
+        dict: 票据和有效期（秒）
+    """
+    return {"ticket": create_stream_ticket(current_user), "expires_in": settings.SSE_TICKET_TTL}
+
+
+def format_event(sequence: int, event: str, data: dict) -> bytes:
+    return (
+        f"id: {event_broker.event_id(sequence)}\nevent: {event}\ndata: ".encode()
+        + dumps(data) + b"\n\n"
+    )
+
+
+def format_reset(sequence: int) -> bytes:
+    # 无法续传：客户端应重新拉取一次完整状态，下次重连从当前位置续传
+    return f"id: {event_broker.event_id(sequence)}\nevent: reset\ndata: {{}}\n\n".encode()
+
+
+@router.get("/status")
+async def status_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id"),
+    current_user: Principal = Depends(get_event_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    订阅当前用户的门店、商家审核状态变更（Server-Sent Events）
+
+    事件：
+    - store_status：{"store_id", "is_pass"}
+    - merchant_status：{"merchant_id", "status", "rejection_reason"}
+    - reset：Last-Event-ID 无法续传，客户端应重新拉取一次完整状态
+
+    无事件时每 SSE_HEARTBEAT_SECONDS 秒发送一条注释行作为心跳；
+    重连时携带 Last-Event-ID 请求头，补发断开期间的事件；使用票据订阅时，
+    EventSource 无法沿用原 URL 自动重连，需重新申请票据并以 last_event_id 查询参数续传。
+    推送积压超过 SSE_QUEUE_SIZE 条时服务端断开连接，客户端重连后续传。
+
+    Args:
+        request: 当前请求，用于检测客户端断开
+        last_event_id: 客户端收到的最后一个事件ID
+        last_event_id_param: 同 last_event_id，以查询参数传入，请求头优先
+        current_user: 当前登录用户
+        db: 数据库会话
+
+    Returns:
+        StreamingResponse: text/event-stream 事件流
+    """
+    last_event_id = last_event_id or last_event_id_param
+    try:
+        subscription = event_broker.subscribe(current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    # 先订阅再取补发事件，两者之间发布的事件按序号去重，不会遗漏
+    replay = event_broker.replay(current_user.id, last_event_id)
+    position = event_broker.last_sequence
+    # 长连接期间不再访问数据库，提前归还连接
+    await db.close()
+
+    async def stream():
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n".encode()
+            sent = 0
+            if replay is not None:
+                for sequence, _, event, data in replay:
+                    sent = sequence
+                    yield format_event(sequence, event, data)
+            elif last_event_id:
+                sent = position
+                yield format_reset(position)
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        subscription.queue.get(), settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": ping\n\n"
+                    continue
+                if item is OVERFLOW:
+                    # 积压过多被断开，客户端按 retry 重连后从最后收到的事件续传
+                    break
+                sequence, _, event, data = item
+                if sequence <= sent:
+                    continue
+                sent = sequence
+                yield format_event(sequence, event, data)
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
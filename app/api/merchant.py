@@ -1,24 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from core.database import get_db
-from core.auth import get_current_user
+from core.database import get_db, get_read_db
+from core.auth import get_current_user, get_current_admin
+from core.principal_cache import Principal
+from core.rate_limit import rate_limit
+from core.serialization import RowSerializer, dumps
 from schemas.merchant import MerchantCreate, MerchantUpdate, MerchantResponse, MerchantApproval
-from services.merchant import MerchantService
-from models.user import User, UserRole
+from schemas.moderation import MerchantReviewRequest, BatchReviewResult
+from services.merchant import MerchantService, merchant_cache
+from services.export import export_response
+from models.merchant import Merchant
+from models.user import UserRole
 
 router = APIRouter(
     prefix="/merchants",
     tags=["merchants"],
+    dependencies=[Depends(rate_limit("merchant"))],
     responses={404: {"description": "Not found"}},
 )
 
+# 商家行直接序列化为响应字典，不再经过 MerchantResponse 校验
+merchant_serializer = RowSerializer(MerchantResponse)
+
 @router.post("/apply", response_model=MerchantResponse)
 async def apply_merchant(
     merchant_data: MerchantCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     申请成为商家
@@ -33,29 +43,73 @@ async def apply_merchant(
     """
     return await MerchantService.create_merchant(db, current_user.id, merchant_data)
 
+@router.get("/export")
+async def export_merchants(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    流式导出全部商家数据
+    
+    Args:
+        format: ndjson 或 csv
+        current_user: 当前登录用户（必须是管理员）
+        
+    Returns:
+        StreamingResponse: 逐批输出的商家数据
+    """
+    return export_response(Merchant.__table__, format, "merchants")
+
+@router.post("/review", response_model=BatchReviewResult)
+async def review_merchants(
+    review: MerchantReviewRequest,
+    current_user: Principal = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    批量审批商家申请
+    
+    Args:
+        review: 批量审批请求
+        current_user: 当前登录用户（必须是管理员）
+        db: 数据库会话
+        
+    Returns:
+        BatchReviewResult: 更新条数和每个商家的处理结果
+    """
+    return await MerchantService.review_merchants(db, review, actor=current_user)
+
 @router.get("/{merchant_id}", response_model=MerchantResponse)
 async def get_merchant(
     merchant_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     获取商家信息
     
+    响应经读缓存返回并带有 ETag，If-None-Match 匹配时返回 304
+    
     Args:
         merchant_id: 商家ID
+        request: 当前请求
         db: 数据库会话
         
     Returns:
         MerchantResponse: 商家信息
     """
-    return await MerchantService.get_merchant(db, merchant_id)
+    async def load() -> bytes:
+        merchant = await MerchantService.get_merchant(db, merchant_id)
+        return dumps(merchant_serializer.one(merchant))
+    
+    return await merchant_cache.respond(request, merchant_id, load)
 
 @router.put("/{merchant_id}", response_model=MerchantResponse)
 async def update_merchant(
     merchant_id: int,
     merchant_data: MerchantUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     更新商家信息
@@ -83,8 +137,8 @@ async def update_merchant(
 async def approve_merchant(
     merchant_id: int,
     approval_data: MerchantApproval,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     审批商家申请
@@ -105,4 +159,4 @@ async def approve_merchant(
             detail="只有管理员可以审批商家申请"
         )
     
-    return await MerchantService.approve_merchant(db, merchant_id, approval_data) 
\ No newline at end of file
+    return await MerchantService.approve_merchant(db, merchant_id, approval_data, actor=current_user) 
\ No newline at end of file
@@ -1,24 +1,121 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from core.database import get_db
-from core.auth import get_current_user
-from schemas.store import StoreCreate, StoreUpdate, StoreResponse
-from services.store import StoreService
-from models.user import User
+from core.database import get_db, get_read_db
+from core.auth import get_current_user, get_current_admin
+from core.metrics import timed
+from core.pagination import MAX_PAGE_SIZE
+from core.principal_cache import Principal
+from core.rate_limit import rate_limit
+from core.serialization import FastJSONResponse, RowSerializer, dumps
+from schemas.store import StoreCreate, StoreUpdate, StoreResponse, StorePage, StoreImportReport, StoreSearchPage, NearbyStoreList, StorePhoto
+from schemas.moderation import StoreReviewRequest, BatchReviewResult
+from services.store import StoreService, store_cache
+from services.export import export_response
+from services.store_import import import_stores, iter_lines
+from services.search import search_stores
+from services.geo import nearby_stores
+from services.photo import MEDIA_TYPES, photo_path, save_photo
+from models.store import Store
 
 router = APIRouter(
     prefix="/stores",
     tags=["stores"],
+    dependencies=[Depends(rate_limit("store"))],
     responses={404: {"description": "Not found"}},
 )
 
+# 门店行直接序列化为响应字典，不再逐条经过 StoreResponse 校验
+store_serializer = RowSerializer(StoreResponse)
+
+@router.get("", response_model=StorePage)
+async def list_stores(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    owner: Optional[str] = None,
+    is_pass: Optional[int] = Query(None, ge=0, le=2),
+    store_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    分页获取门店列表，按创建时间倒序
+    
+    Args:
+        cursor: 上一页返回的游标
+        limit: 每页条数
+        owner: 门店归属人
+        is_pass: 审核状态：0-待审核，1-通过，2-驳回
+        store_type: 门店类型
+        db: 数据库会话
+        
+    Returns:
+        StorePage: 门店列表和下一页游标
+    """
+    stores, next_cursor = await StoreService.list_stores(
+        db, limit, cursor, owner_account=owner, is_pass=is_pass, store_type=store_type
+    )
+    return FastJSONResponse({"items": store_serializer.many(stores), "next_cursor": next_cursor})
+
+@router.get("/search", response_model=StoreSearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=1000),
+    is_pass: Optional[int] = Query(None, ge=0, le=2),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    按地址片段、门店类型或所属商家名称/描述搜索门店，结果按相关度排序
+    
+    Args:
+        q: 搜索关键词，多个关键词以空格分隔，需同时匹配
+        limit: 每页条数
+        offset: 偏移量
+        is_pass: 审核状态：0-待审核，1-通过，2-驳回
+        db: 数据库会话
+        
+    Returns:
+        StoreSearchPage: 门店列表和下一页偏移量
+    """
+    stores, next_offset = await search_stores(db, q, limit, offset, is_pass)
+    return FastJSONResponse({"items": store_serializer.many(stores), "next_offset": next_offset})
+
+@router.get("/nearby", response_model=NearbyStoreList)
+async def nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    is_pass: Optional[int] = Query(None, ge=0, le=2),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    查询附近门店，按距离由近到远排序
+    
+    Args:
+        lat: 纬度
+        lng: 经度
+        radius: 半径（米）
+        limit: 最多返回的门店数
+        is_pass: 审核状态：0-待审核，1-通过，2-驳回
+        db: 数据库会话
+        
+    Returns:
+        NearbyStoreList: 门店列表及距离
+    """
+    results = await nearby_stores(db, lat, lng, radius, limit, is_pass)
+    return FastJSONResponse({"items": [
+        {**store_serializer.one(store), "distance": round(distance, 1)}
+        for store, distance in results
+    ]})
+
 @router.post("/apply", response_model=StoreResponse)
 async def apply_store(
     store_data: StoreCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     申请门店入驻
@@ -31,31 +128,109 @@ async def apply_store(
     Returns:
         StoreResponse: 创建的门店信息
     """
-    return await StoreService.create_store(db, current_user.username, store_data)
+    return await StoreService.create_store(db, current_user.id, current_user.username, store_data)
+
+@router.post("/import", response_model=StoreImportReport)
+async def import_my_stores(
+    request: Request,
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    批量导入当前用户的门店
+    
+    请求体为 NDJSON（每行一个门店对象）或带表头的 CSV，边接收边校验写入，
+    不会把整个文件读入内存。
+    
+    Args:
+        request: 原始请求，用于流式读取请求体
+        format: ndjson 或 csv
+        batch_size: 单次批量插入的行数
+        current_user: 当前登录用户
+        db: 数据库会话
+        
+    Returns:
+        StoreImportReport: 导入条数和失败行
+    """
+    return await import_stores(
+        db,
+        current_user.id,
+        current_user.username,
+        iter_lines(request.stream()),
+        fmt=format,
+        batch_size=batch_size,
+    )
+
+@router.post("/review", response_model=BatchReviewResult)
+async def review_stores(
+    review: StoreReviewRequest,
+    current_user: Principal = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    批量审核门店
+    
+    Args:
+        review: 批量审核请求
+        current_user: 当前登录用户（必须是管理员）
+        db: 数据库会话
+        
+    Returns:
+        BatchReviewResult: 更新条数和每个门店的处理结果
+    """
+    return await StoreService.review_stores(db, review, actor=current_user)
+
+@router.get("/export")
+async def export_stores(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    流式导出全部门店数据
+    
+    Args:
+        format: ndjson 或 csv
+        current_user: 当前登录用户（必须是管理员）
+        
+    Returns:
+        StreamingResponse: 逐批输出的门店数据
+    """
+    return export_response(Store.__table__, format, "stores")
 
 @router.get("/{store_id}", response_model=StoreResponse)
 async def get_store(
     store_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     获取门店信息
     
+    响应经读缓存返回并带有 ETag，If-None-Match 匹配时返回 304
+    
     Args:
         store_id: 门店ID
+        request: 当前请求
         db: 数据库会话
         
     Returns:
         StoreResponse: 门店信息
     """
-    return await StoreService.get_store(db, store_id)
+    async def load() -> bytes:
+        with timed("store_read"):
+            store = await StoreService.get_store(db, store_id)
+            return dumps(store_serializer.one(store))
+    
+    return await store_cache.respond(request, store_id, load)
 
 @router.put("/{store_id}", response_model=StoreResponse)
 async def update_store(
     store_id: int,
     store_data: StoreUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     更新门店信息
@@ -69,29 +244,86 @@ async def update_store(
     Returns:
         StoreResponse: 更新后的门店信息
     """
-    # 检查是否是门店所有者
+    return await StoreService.update_store(db, store_id, store_data, owner_id=current_user.id)
+
+@router.post("/{store_id}/photo", response_model=StorePhoto)
+async def upload_store_photo(
+    store_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    上传门店照片
+    
+    请求体为 multipart/form-data，文件字段名为 file，边接收边写入磁盘；
+    照片按内容寻址保存并生成缩略图，门店的 store_photo 更新为原图地址。
+    
+    Args:
+        store_id: 门店ID
+        request: 原始请求，用于流式读取请求体
+        current_user: 当前登录用户
+        db: 数据库会话
+        
+    Returns:
+        StorePhoto: 照片摘要和各版本地址
+    """
+    # 先检查归属再接收文件
     store = await StoreService.get_store(db, store_id)
-    if store.owner_account != current_user.username:
+    if store.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="无权修改其他门店的信息"
         )
+    # 接收文件期间不访问数据库，先归还连接，接收完成后更新门店时再取连接
+    await db.close()
+    
+    photo = await save_photo(request.stream(), request.headers.get("content-type"))
+    await StoreService.update_store(
+        db, store_id, StoreUpdate(store_photo=photo["url"]), owner_id=current_user.id
+    )
+    return StorePhoto(**photo)
+
+@router.get("/photos/{digest}/{name}")
+async def get_store_photo(digest: str, name: str):
+    """
+    获取门店照片文件
+    
+    文件按内容寻址、写入后不再变化，响应允许客户端和 CDN 长期缓存
     
-    return await StoreService.update_store(db, store_id, store_data)
+    Args:
+        digest: 照片摘要
+        name: 原图或缩略图文件名，例如 original.jpg、320.webp
+        
+    Returns:
+        FileResponse: 照片文件
+    """
+    return FileResponse(
+        photo_path(digest, name),
+        media_type=MEDIA_TYPES[name.rsplit(".", 1)[1]],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
 
-@router.get("/my/stores", response_model=List[StoreResponse])
+@router.get("/my/stores", response_model=StorePage)
 async def get_my_stores(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    获取当前用户的所有门店
+    分页获取当前用户的门店
     
     Args:
+        cursor: 上一页返回的游标
+        limit: 每页条数
         current_user: 当前登录用户
         db: 数据库会话
         
     Returns:
-        List[StoreResponse]: 门店列表
+        StorePage: 门店列表和下一页游标
     """
-    return await StoreService.get_stores_by_owner(db, current_user.username) 
\ No newline at end of file
+    stores, next_cursor = await StoreService.get_stores_by_owner(
+        db, current_user.id, limit, cursor
+    )
+    return FastJSONResponse({"items": store_serializer.many(stores), "next_cursor": next_cursor})
\ No newline at end of file
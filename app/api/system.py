@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends
+
+from core.audit import audit_log
+from core.auth import get_current_admin
+from core.database import get_pool_stats, primary_pins, replicas
+from core.events import event_broker
+from core.hash_pool import hash_pool
+from core.jobs import job_queue
+from core.principal_cache import principal_cache
+from core.rate_limit import rate_limit, rate_limit_store
+from core.startup import startup_timer
+from services.merchant import merchant_cache
+from services.photo import image_pool
+from services.store import store_cache
+
+# 运行统计暴露连接池、缓存、限流、副本、任务和审计的内部状态，仅管理员可访问
+router = APIRouter(
+    prefix="/system",
+    tags=["system"],
+    dependencies=[Depends(rate_limit("system")), Depends(get_current_admin)],
+)
+
+@router.get("/stats/hash-pool")
+async def get_hash_pool_stats():
+    """
+    获取密码哈希工作池的运行统计
+
+    Returns:
+        dict: 排队深度、拒绝次数、等待时间等
+    """
+    return hash_pool.stats()
+
+@router.get("/stats/image-pool")
+async def get_image_pool_stats():
+    """
+    获取缩略图工作池的运行统计
+
+    Returns:
+        dict: 排队深度、拒绝次数、等待时间等
+    """
+    return image_pool.stats()
+
+@router.get("/stats/principal-cache")
+async def get_principal_cache_stats():
+    """
+    获取已认证用户缓存的命中统计
+
+    Returns:
+        dict: 命中/未命中次数、淘汰与失效次数
+    """
+    return principal_cache.stats()
+
+@router.get("/stats/db-pool")
+async def get_db_pool_stats():
+    """
+    获取数据库连接池的运行统计
+
+    Returns:
+        dict: 借出连接数、溢出连接数、取连接等待时间
+    """
+    return get_pool_stats()
+
+@router.get("/stats/read-cache")
+async def get_read_cache_stats():
+    """
+    获取门店/商家详情读缓存的运行统计
+
+    Returns:
+        dict: 命中率、304 次数、淘汰与失效次数
+    """
+    return {
+        "store": store_cache.stats(),
+        "merchant": merchant_cache.stats(),
+    }
+
+@router.get("/stats/startup")
+async def get_startup_stats():
+    """
+    获取本进程的启动耗时
+
+    Returns:
+        dict: 导入、创建应用、启动钩子各阶段耗时与已加载模块数
+    """
+    return startup_timer.report()
+
+@router.get("/stats/rate-limit")
+async def get_rate_limit_stats():
+    """
+    获取限流计数存储的运行统计
+
+    Returns:
+        dict: 计数键数量、放行与拒绝次数、淘汰次数
+    """
+    return rate_limit_store.stats()
+
+@router.get("/stats/events")
+async def get_event_stats():
+    """
+    获取审核状态事件推送的运行统计
+
+    Returns:
+        dict: 订阅数、订阅用户数、保留的事件数
+    """
+    return event_broker.stats()
+
+@router.get("/stats/jobs")
+async def get_job_stats():
+    """
+    获取后台任务队列的运行统计
+
+    Returns:
+        dict: 各状态任务数、执行中任务数、成功/重试/死信次数
+    """
+    return job_queue.stats()
+
+@router.get("/stats/replicas")
+async def get_replica_stats():
+    """
+    获取只读副本的健康状态与读己之写记录数
+
+    Returns:
+        dict: 各副本是否可用、剩余摘除时间、失败次数，以及处于主库窗口内的客户端数
+    """
+    return {"replicas": replicas.stats(), "pinned_clients": len(primary_pins)}
+
+@router.get("/stats/audit")
+async def get_audit_stats():
+    """
+    获取审计日志写入的运行统计
+
+    Returns:
+        dict: 缓冲中的事件数、已记录/已写入/已丢弃的事件数、批量写入次数
+    """
+    return audit_log.stats()
@@ -0,0 +1,156 @@
+"""
+并发基准：同步 Session 与 AsyncSession 在混合负载下的延迟对比
+
+模拟旧实现（async def 路由中直接调用阻塞的 Session）和新实现（AsyncSession）。
+负载由大量快速的主键查询和少量慢查询混合组成，按固定速率发起，
+统计快速查询的 p50/p99 延迟。
+
+运行方式（在 app 目录下）：
+    python -m benchmarks.async_db --fast 1500 --slow 10 --rate 300
+
+速率应低于单个 worker 的吞吐上限，否则两种实现都会因排队而失真。
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.store import Store
+from models.user import Base
+
+# 使用递归 CTE 在 SQLite 中制造一个耗时的查询
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) "
+    "SELECT count(*) FROM c"
+)
+
+
+def percentile(samples, pct):
+    """计算百分位数（毫秒）"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def seed(path: str, rows: int):
+    """创建测试库并写入门店数据"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Store.__table__.insert(),
+            [
+                {"store_type": "餐厅", "store_address": f"地址{i}", "owner_account": f"user{i % 100}"}
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+async def run_mixed(fast_call, slow_call, args):
+    """
+    按固定速率开环发起混合请求，返回快速查询的延迟样本
+
+    延迟从计划到达时间开始计算，因此事件循环被阻塞期间积压的请求也会计入
+    """
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / args.rate
+    total = args.fast + args.slow
+    # 将慢查询均匀穿插在快速查询之间
+    slow_every = max(1, total // max(args.slow, 1))
+    latencies = []
+
+    async def fast_task(scheduled, store_id):
+        await fast_call(store_id)
+        latencies.append(loop.time() - scheduled)
+
+    tasks = []
+    started = loop.time()
+    for i in range(total):
+        scheduled = started + i * interval
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if args.slow and i % slow_every == slow_every - 1:
+            tasks.append(asyncio.create_task(slow_call()))
+        else:
+            tasks.append(asyncio.create_task(fast_task(scheduled, i % args.rows + 1)))
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+async def bench_sync(path, args):
+    """旧实现：在协程中直接使用阻塞 Session"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(bind=engine)
+
+    async def fast_call(store_id):
+        with SessionLocal() as db:
+            db.execute(select(Store).where(Store.id == store_id)).scalars().first()
+
+    async def slow_call():
+        with SessionLocal() as db:
+            db.execute(SLOW_QUERY, {"n": args.slow_rows}).scalar()
+
+    try:
+        return await run_mixed(fast_call, slow_call, args)
+    finally:
+        engine.dispose()
+
+
+async def bench_async(path, args):
+    """新实现：AsyncSession + aiosqlite"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=args.pool_size, max_overflow=0)
+    AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def fast_call(store_id):
+        async with AsyncSessionLocal() as db:
+            (await db.execute(select(Store).where(Store.id == store_id))).scalars().first()
+
+    async def slow_call():
+        async with AsyncSessionLocal() as db:
+            (await db.execute(SLOW_QUERY, {"n": args.slow_rows})).scalar()
+
+    try:
+        return await run_mixed(fast_call, slow_call, args)
+    finally:
+        await engine.dispose()
+
+
+def report(name, latencies, elapsed):
+    print(
+        f"{name:<6} fast={len(latencies):>6} "
+        f"p50={percentile(latencies, 50):8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms "
+        f"mean={statistics.mean(latencies) * 1000:8.2f}ms "
+        f"total={elapsed:6.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="同步/异步数据库会话并发基准")
+    parser.add_argument("--rows", type=int, default=10000, help="预置门店数量")
+    parser.add_argument("--fast", type=int, default=1500, help="快速查询数量")
+    parser.add_argument("--slow", type=int, default=10, help="慢查询数量")
+    parser.add_argument("--slow-rows", type=int, default=300000, help="慢查询递归深度")
+    parser.add_argument("--rate", type=float, default=300, help="每秒发起的请求数")
+    parser.add_argument("--pool-size", type=int, default=20, help="异步连接池大小")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed(path, args.rows)
+        for name, bench in (("sync", bench_sync), ("async", bench_async)):
+            started = time.perf_counter()
+            latencies = asyncio.run(bench(path, args))
+            report(name, latencies, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
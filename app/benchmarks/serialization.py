@@ -0,0 +1,123 @@
+"""
+响应序列化基准：门店列表在不同序列化路径下的吞吐
+
+对同一组门店（ORM 对象和 Row 两种形式）比较：
+- pydantic：逐条 StoreResponse 校验 + jsonable_encoder + json.dumps（FastAPI 默认路径）
+- pydantic+orjson：同上，最后一步换成 core.serialization.dumps
+- row+orjson：RowSerializer 直接取值 + dumps（列表、详情接口使用的路径）
+- row+json：RowSerializer + 标准库 json（未安装 orjson 时的退路）
+
+运行方式（在 app 目录下）：
+    python -m benchmarks.serialization --rows 1000,10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import core.serialization as serialization
+from core.serialization import RowSerializer, dumps
+from models.user import Base
+from models.store import Store
+from models import merchant  # noqa: F401
+from schemas.store import StorePage, StoreResponse
+
+
+def make_stores(count: int):
+    """生成门店的 ORM 对象和 Row 两种形式"""
+    created = datetime(2024, 1, 1)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Store.__table__.insert(), [
+            {
+                "store_type": "餐厅", "store_phone": "13800000000",
+                "store_address": f"北京市朝阳区建国路{i}号", "store_hours": "09:00-21:00",
+                "owner_account": f"owner{i % 100}", "is_pass": i % 3,
+                "latitude": 39.9 + i * 1e-5, "longitude": 116.4 + i * 1e-5,
+                "created_at": created + timedelta(seconds=i),
+            }
+            for i in range(count)
+        ])
+    columns = [getattr(Store, name) for name in RowSerializer(StoreResponse).fields]
+    with engine.connect() as conn:
+        rows = conn.execute(select(*columns)).all()
+    with Session(bind=engine) as session:
+        stores = session.execute(select(Store)).scalars().all()
+        session.expunge_all()
+    engine.dispose()
+    return stores, rows
+
+
+def via_pydantic(items):
+    page = StorePage(items=[StoreResponse.model_validate(item) for item in items], next_cursor=None)
+    return json.dumps(jsonable_encoder(page), ensure_ascii=False).encode()
+
+
+def via_pydantic_orjson(items):
+    page = StorePage(items=[StoreResponse.model_validate(item) for item in items], next_cursor=None)
+    return dumps(jsonable_encoder(page))
+
+
+serializer = RowSerializer(StoreResponse)
+
+
+def via_rows(items):
+    return dumps({"items": serializer.many(items), "next_cursor": None})
+
+
+def via_rows_json(items):
+    orjson = serialization.orjson
+    serialization.orjson = None
+    try:
+        return dumps({"items": serializer.many(items), "next_cursor": None})
+    finally:
+        serialization.orjson = orjson
+
+
+PATHS = {
+    "pydantic": via_pydantic,
+    "pydantic+orjson": via_pydantic_orjson,
+    "row+orjson": via_rows,
+    "row+json": via_rows_json,
+}
+
+
+def measure(fn, items, repeat: int) -> float:
+    """返回 repeat 次中最快一次的耗时（秒）"""
+    fn(items)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应序列化基准")
+    parser.add_argument("--rows", default="1000,10000", help="逗号分隔的每个响应的行数")
+    parser.add_argument("--repeat", type=int, default=5, help="每种路径重复次数，取最快一次")
+    args = parser.parse_args()
+
+    if serialization.orjson is None:
+        print("未安装 orjson，*+orjson 路径实际使用标准库 json")
+    for count in (int(n) for n in args.rows.split(",")):
+        stores, rows = make_stores(count)
+        baseline = None
+        for source, items in (("orm", stores), ("row", rows)):
+            for name, fn in PATHS.items():
+                elapsed = measure(fn, items, args.repeat)
+                baseline = baseline or elapsed
+                print(
+                    f"rows={count:<6} {source:<4} {name:<16} {elapsed * 1000:>9.2f}ms "
+                    f"{count / elapsed:>12,.0f} rows/s  x{baseline / elapsed:.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+附近门店查询基准
+
+在临时 SQLite 库中写入指定数量、随机分布在一个城市范围内的门店，
+随机选取查询点调用 services.geo.nearby_stores，统计 p50/p99 延迟和平均返回条数。
+
+运行方式（在 app 目录下）：
+    python -m benchmarks.store_nearby --rows 1000000 --radius 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from models.user import Base
+from models.store import Store
+from services.geo import cell_of, nearby_stores
+
+# 北京市区大致范围
+LAT_RANGE = (39.75, 40.10)
+LNG_RANGE = (116.15, 116.65)
+
+
+def percentile(samples, pct):
+    """计算百分位数（毫秒）"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def random_point(rng: random.Random):
+    return rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+
+
+def seed(url: str, rows: int, rng: random.Random):
+    """建表并写入带坐标的门店"""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    batch = 20000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            values = []
+            for i in range(start, min(start + batch, rows)):
+                lat, lng = random_point(rng)
+                values.append({
+                    "store_type": "餐厅",
+                    "store_address": f"北京市{i}号",
+                    "owner_account": f"user{i % 1000}",
+                    "latitude": lat,
+                    "longitude": lng,
+                    "geo_cell": cell_of(lat, lng),
+                })
+            conn.execute(Store.__table__.insert(), values)
+    engine.dispose()
+
+
+async def run(url: str, points, radius: float, limit: int):
+    engine = create_async_engine(url)
+    latencies = []
+    returned = []
+    async with AsyncSession(engine) as db:
+        # 预热：建立连接并把索引页读入缓存
+        for lat, lng in points[:10]:
+            await nearby_stores(db, lat, lng, radius, limit)
+        db.expunge_all()
+        for lat, lng in points:
+            started = time.perf_counter()
+            results = await nearby_stores(db, lat, lng, radius, limit)
+            latencies.append(time.perf_counter() - started)
+            returned.append(len(results))
+            # 释放已加载的对象，避免身份映射随查询次数增长
+            db.expunge_all()
+    await engine.dispose()
+    return latencies, returned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="附近门店查询基准")
+    parser.add_argument("--rows", type=int, default=200000, help="预置门店数量")
+    parser.add_argument("--queries", type=int, default=200, help="查询次数")
+    parser.add_argument("--radius", type=float, default=1000, help="查询半径（米）")
+    parser.add_argument("--limit", type=int, default=20, help="每次返回的门店数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        started = time.perf_counter()
+        seed(f"sqlite:///{path}", args.rows, rng)
+        print(f"写入 {args.rows} 条门店，耗时 {time.perf_counter() - started:.2f}s")
+
+        points = [random_point(rng) for _ in range(args.queries)]
+        latencies, returned = asyncio.run(
+            run(f"sqlite+aiosqlite:///{path}", points, args.radius, args.limit)
+        )
+
+    print(
+        f"radius={args.radius:.0f}m p50={percentile(latencies, 50):.2f}ms "
+        f"p99={percentile(latencies, 99):.2f}ms "
+        f"avg_results={sum(returned) / len(returned):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
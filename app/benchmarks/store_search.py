@@ -0,0 +1,106 @@
+"""
+门店搜索基准：FTS5 全文索引与 LIKE '%...%' 扫描的对比
+
+在临时 SQLite 库中写入指定数量的门店，对同一组地址片段分别执行
+LIKE 查询和 store_fts MATCH 查询，统计每种方式的 p50/p99 延迟。
+
+运行方式（在 app 目录下）：
+    python -m benchmarks.store_search --rows 200000 --queries 200
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from models.user import Base
+from models import merchant, store, store_search  # noqa: F401
+
+CITIES = ["北京市", "上海市", "广州市", "深圳市", "杭州市", "成都市", "武汉市", "南京市"]
+DISTRICTS = ["朝阳区", "海淀区", "浦东新区", "天河区", "南山区", "西湖区", "武侯区", "鼓楼区"]
+ROADS = ["建国路", "中关村大街", "世纪大道", "天河路", "科技园路", "文三路", "人民南路", "中山路"]
+TYPES = ["餐厅", "咖啡馆", "便利店", "书店", "健身房"]
+
+LIKE_QUERY = text(
+    "SELECT id FROM store WHERE store_address LIKE :pattern ORDER BY id DESC LIMIT 20"
+)
+FTS_QUERY = text(
+    "SELECT store.id FROM store_fts JOIN store ON store.id = store_fts.rowid "
+    "WHERE store_fts MATCH :match ORDER BY bm25(store_fts) LIMIT 20"
+)
+
+
+def percentile(samples, pct):
+    """计算百分位数（毫秒）"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def random_address(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(CITIES)}{rng.choice(DISTRICTS)}{rng.choice(ROADS)}"
+        f"{rng.randint(1, 999)}号{rng.randint(1, 30)}栋"
+    )
+
+
+def seed(engine, rows: int, rng: random.Random):
+    """建表（包括 FTS 表和触发器）并写入门店数据"""
+    Base.metadata.create_all(bind=engine)
+    batch = 10000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            conn.execute(
+                store.Store.__table__.insert(),
+                [
+                    {
+                        "store_type": rng.choice(TYPES),
+                        "store_address": random_address(rng),
+                        "owner_account": f"user{i % 1000}",
+                    }
+                    for i in range(start, min(start + batch, rows))
+                ],
+            )
+
+
+def run(engine, statement, params_list):
+    latencies = []
+    with engine.connect() as conn:
+        for params in params_list:
+            started = time.perf_counter()
+            conn.execute(statement, params).fetchall()
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="门店搜索 FTS 与 LIKE 对比基准")
+    parser.add_argument("--rows", type=int, default=200000, help="预置门店数量")
+    parser.add_argument("--queries", type=int, default=200, help="查询次数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        started = time.perf_counter()
+        seed(engine, args.rows, rng)
+        print(f"写入 {args.rows} 条门店，耗时 {time.perf_counter() - started:.2f}s")
+
+        # 取 "门牌号+号+楼栋" 这类选择性较高的片段作为查询词
+        fragments = [f"{rng.randint(1, 999)}号{rng.randint(1, 30)}栋" for _ in range(args.queries)]
+        like = run(engine, LIKE_QUERY, [{"pattern": f"%{f}%"} for f in fragments])
+        fts = run(engine, FTS_QUERY, [{"match": f'"{f}"'} for f in fragments])
+        engine.dispose()
+
+    for name, latencies in (("like", like), ("fts5", fts)):
+        print(
+            f"{name:<5} p50={percentile(latencies, 50):8.2f}ms "
+            f"p99={percentile(latencies, 99):8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+审计日志（只追加、批量写入）
+
+业务代码在事务提交后调用 audit_log.record(操作, 操作人, 对象类型, 对象ID, 详情)，
+只把事件追加到内存缓冲区，不访问数据库，不增加请求耗时；
+写入协程在缓冲区达到 AUDIT_BATCH_SIZE 条或每隔 AUDIT_FLUSH_INTERVAL 秒时，
+用一条多行 INSERT 把缓冲区批量写入 audit_log 表。
+
+- 写入失败时事件放回缓冲区，退避后重试；缓冲区超过 AUDIT_MAX_BUFFER 条时丢弃新事件并计数，
+  数据库长时间不可用不会耗尽内存
+- 应用关闭时写入剩余事件；进程异常退出时最多丢失最近一个写入周期内的事件
+- 发生时间取记录时的应用时间，批量写入不改变事件的先后顺序
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.metrics import Counter, Gauge, Histogram, registry
+from core.principal_cache import Principal
+from core.serialization import dumps
+from models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+events_total = registry.register(Counter(
+    "audit_events_total", "记录的审计事件数", ("action",),
+))
+buffer_gauge = registry.register(Gauge(
+    "audit_buffer", "等待写入的审计事件数",
+))
+dropped_total = registry.register(Counter(
+    "audit_dropped_total", "因缓冲区已满被丢弃的审计事件数",
+))
+flush_duration = registry.register(Histogram(
+    "audit_flush_seconds", "单次批量写入审计日志的耗时",
+))
+
+# 写入失败后的最长退避时间（秒）
+MAX_RETRY_DELAY = 30
+
+
+class AuditLogger:
+    def __init__(self, batch_size: int = 500, flush_interval: float = 1, max_buffer: int = 100000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: Deque[dict] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._failures = 0
+        self._counts = {"recorded": 0, "written": 0, "dropped": 0, "flushes": 0, "failed_flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None
+
+    def record(
+        self,
+        action: str,
+        actor: Optional[Principal] = None,
+        target_type: Optional[str] = None,
+        target_id: Optional[int] = None,
+        detail: Optional[dict] = None,
+        ip: Optional[str] = None
+    ):
+        """
+        记录一条审计事件，在业务事务提交后调用
+
+        Args:
+            action: 操作，例如 merchant.approve
+            actor: 操作人；未登录的操作为空
+            target_type: 对象类型：store、merchant 或 user
+            target_id: 对象ID
+            detail: 操作详情，需可序列化为 JSON
+            ip: 客户端地址
+        """
+        if len(self._buffer) >= self.max_buffer:
+            self._counts["dropped"] += 1
+            dropped_total.inc()
+            return
+        self._buffer.append({
+            "occurred_at": datetime.utcnow(),
+            "action": action,
+            "actor_id": actor.id if actor is not None else None,
+            "actor": actor.username if actor is not None else None,
+            "target_type": target_type,
+            "target_id": target_id,
+            "ip": ip,
+            "detail": dumps(detail).decode() if detail else None,
+        })
+        self._counts["recorded"] += 1
+        events_total.inc((action,))
+        buffer_gauge.set((), len(self._buffer))
+        # 攒够一批立即写入，不必等到下一个周期
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        """在应用启动时启动写入协程"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止写入协程并写入剩余事件"""
+        if not self.running:
+            return
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        self._wakeup = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("关闭时写入审计日志失败，%d 条事件丢失", len(self._buffer))
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                self._failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._failures += 1
+                delay = min(self.flush_interval * 2 ** self._failures, MAX_RETRY_DELAY)
+                logger.exception("写入审计日志失败，%d 条事件等待重试，%.1f 秒后重试", len(self._buffer), delay)
+                await asyncio.sleep(delay)
+
+    async def flush(self):
+        """
+        把缓冲区中的事件分批写入数据库
+
+        Raises:
+            Exception: 写入失败时抛出，未写入的事件已放回缓冲区
+        """
+        while self._buffer:
+            batch: List[dict] = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(AuditLog.__table__.insert(), batch)
+                    await db.commit()
+            except BaseException:
+                # 放回缓冲区头部，保持先后顺序
+                self._buffer.extendleft(reversed(batch))
+                self._counts["failed_flushes"] += 1
+                raise
+            finally:
+                buffer_gauge.set((), len(self._buffer))
+            flush_duration.observe((), time.perf_counter() - started)
+            self._counts["written"] += len(batch)
+            self._counts["flushes"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "buffered": len(self._buffer),
+            "max_buffer": self.max_buffer,
+            "batch_size": self.batch_size,
+            **self._counts,
+        }
+
+
+audit_log = AuditLogger(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_buffer=settings.AUDIT_MAX_BUFFER,
+)
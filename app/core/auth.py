@@ -1,48 +1,137 @@
+import os
+import time
+from datetime import timedelta
+from typing import Dict
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
 from core.database import get_db
-from models.user import User
-from services.auth import SECRET_KEY, ALGORITHM
+from core.metrics import timed
+from models.user import User, UserRole
+from core.principal_cache import Principal, principal_cache
+from services.auth import SECRET_KEY, ALGORITHM, create_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# 事件订阅票据的 aud 声明：访问令牌没有 aud，不能当作票据使用；
+# 票据带有 aud，get_current_user 解码时会拒绝，也不能当作访问令牌使用
+STREAM_TICKET_AUDIENCE = "events"
+
+# 已使用的票据 jti -> 过期时间，过期后清理；只在当前进程内保证票据只能使用一次
+_used_tickets: Dict[str, float] = {}
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
     获取当前登录用户
+    优先从已认证用户缓存中读取，未命中时才查询数据库
     :param token: JWT令牌
     :param db: 数据库会话
-    :return: 用户对象
+    :return: 用户快照
+    """
+    with timed("get_current_user"):
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            # 解码JWT令牌
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            account: str = payload.get("sub")
+            if account is None:
+                raise credentials_exception
+        except JWTError:
+            raise credentials_exception
+    
+        user = principal_cache.get(token)
+        if user is None:
+            # 从数据库获取用户
+            result = await db.execute(select(User).where(User.account == account))
+            db_user = result.scalars().first()
+            if db_user is None:
+                raise credentials_exception
+            user = Principal.from_user(db_user)
+            principal_cache.set(token, user, payload.get("exp"))
+    
+        # 检查用户是否被禁用
+        if user.is_disabled:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User is disabled"
+            )
+    
+    return user
+
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    """
+    获取当前登录的管理员
+    :param current_user: 当前登录用户
+    :return: 用户快照
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="只有管理员可以执行该操作"
+        )
+    return current_user
+
+def create_stream_ticket(user: Principal) -> str:
+    """
+    签发事件订阅票据
+    浏览器 EventSource 无法设置请求头，票据通过查询参数传入；
+    票据只能用于订阅事件、只能使用一次、SSE_TICKET_TTL 秒后过期，出现在访问日志中也无法再利用
+    :param user: 当前登录用户
+    :return: 票据
+    """
+    return create_access_token(
+        data={"sub": user.account, "aud": STREAM_TICKET_AUDIENCE, "jti": os.urandom(16).hex()},
+        expires_delta=timedelta(seconds=settings.SSE_TICKET_TTL)
+    )
+
+async def get_ticket_user(ticket: str, db: AsyncSession) -> Principal:
+    """
+    校验事件订阅票据并取得用户，票据使用后作废
+    :param ticket: 订阅票据
+    :param db: 数据库会话
+    :return: 用户快照
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+        detail="Invalid or expired ticket",
     )
     try:
-        # 解码JWT令牌
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        account: str = payload.get("sub")
-        if account is None:
-            raise credentials_exception
+        payload = jwt.decode(
+            ticket, SECRET_KEY, algorithms=[ALGORITHM], audience=STREAM_TICKET_AUDIENCE,
+            options={"require_aud": True, "require_exp": True, "require_jti": True}
+        )
     except JWTError:
         raise credentials_exception
-    
-    # 从数据库获取用户
-    user = db.query(User).filter(User.account == account).first()
-    if user is None:
+
+    now = time.time()
+    for jti, expires in list(_used_tickets.items()):
+        if expires < now:
+            del _used_tickets[jti]
+    if payload["jti"] in _used_tickets:
         raise credentials_exception
-    
-    # 检查用户是否被禁用
-    if user.is_disabled:
+    _used_tickets[payload["jti"]] = payload["exp"]
+
+    result = await db.execute(select(User).where(User.account == payload.get("sub")))
+    db_user = result.scalars().first()
+    if db_user is None:
+        raise credentials_exception
+    if db_user.is_disabled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is disabled"
         )
-    
-    return user 
\ No newline at end of file
+    return Principal.from_user(db_user)
@@ -0,0 +1,231 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+from core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    缓存后端接口
+    默认实现为进程内 LRU；多 worker 部署可替换为共享后端
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """返回缓存值，不存在或已过期返回 None"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any):
+        """写入缓存值"""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """删除缓存值，返回是否存在"""
+
+    @abstractmethod
+    def clear(self):
+        """清空缓存"""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """按条目数限制大小的 LRU + TTL 内存缓存"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+CACHE_BACKENDS: Dict[str, Callable[[], CacheBackend]] = {
+    "memory": lambda: MemoryCacheBackend(settings.READ_CACHE_SIZE, settings.READ_CACHE_TTL),
+}
+
+
+def create_cache_backend(name: Optional[str] = None) -> CacheBackend:
+    """按名称创建缓存后端，默认取 Settings.READ_CACHE_BACKEND"""
+    name = name or settings.READ_CACHE_BACKEND
+    if name not in CACHE_BACKENDS:
+        raise ValueError(f"不支持的缓存后端: {name}")
+    return CACHE_BACKENDS[name]()
+
+
+class CachedBody:
+    """缓存的响应体及其强 ETag"""
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 是否与 ETag 匹配（If-None-Match 使用弱比较）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ReadThroughCache:
+    """
+    详情接口的读穿透缓存，缓存序列化后的响应体
+
+    命中时直接返回缓存的字节；客户端携带匹配的 If-None-Match 时返回 304，
+    既不查询数据库也不做序列化。写操作提交后调用 invalidate 使缓存失效；
+    加载中的键维护一个版本号，加载期间发生失效时结果不会写回缓存。
+    配置了只读副本时，失效后 settle_seconds 秒内加载的结果也不写回缓存，
+    避免尚未同步的副本把旧数据重新填入缓存并保留到 TTL 结束。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: Optional[CacheBackend] = None,
+        settle_seconds: Optional[float] = None
+    ):
+        self.name = name
+        self.backend = backend or create_cache_backend()
+        if settle_seconds is None:
+            settle_seconds = settings.REPLICA_STICKY_SECONDS if settings.DATABASE_REPLICA_URLS else 0
+        self.settle_seconds = settle_seconds
+        # 正在加载中的键：键 -> [进行中的加载数, 版本号]
+        self._loading: Dict[Hashable, list] = {}
+        # 最近失效的键：键 -> 可以再次写回缓存的时间
+        self._settling: Dict[Hashable, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def invalidate(self, key: Hashable):
+        loading = self._loading.get(key)
+        if loading is not None:
+            loading[1] += 1
+        if self.settle_seconds:
+            now = time.monotonic()
+            if len(self._settling) >= settings.READ_CACHE_SIZE:
+                self._settling = {k: v for k, v in self._settling.items() if v > now}
+            self._settling[key] = now + self.settle_seconds
+        self.backend.delete(key)
+        self.invalidations += 1
+
+    def _settled(self, key: Hashable) -> bool:
+        until = self._settling.get(key)
+        if until is None:
+            return True
+        if until <= time.monotonic():
+            self._settling.pop(key, None)
+            return True
+        return False
+
+    def clear(self):
+        for loading in self._loading.values():
+            loading[1] += 1
+        self.backend.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[bytes]]) -> CachedBody:
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        loading = self._loading.setdefault(key, [0, 0])
+        loading[0] += 1
+        version = loading[1]
+        try:
+            cached = CachedBody(await loader())
+            # 加载期间发生过失效，或刚失效不久（副本可能尚未同步），结果可能已过期，不写回缓存
+            if loading[1] == version and self._settled(key):
+                self.backend.set(key, cached)
+        finally:
+            loading[0] -= 1
+            if loading[0] == 0:
+                del self._loading[key]
+        return cached
+
+    async def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        loader: Callable[[], Awaitable[bytes]]
+    ) -> Response:
+        """
+        返回带 ETag 的 JSON 响应，If-None-Match 匹配时返回 304
+        :param request: 当前请求
+        :param key: 缓存键
+        :param loader: 缓存未命中时加载并序列化数据
+        """
+        cached = await self.get_or_load(key, loader)
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
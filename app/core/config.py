@@ -1,13 +1,160 @@
-from pydantic import BaseSettings
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:  # pydantic v1
+    from pydantic import BaseSettings
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class Settings(BaseSettings):
-    DATABASE_URL: str = os.getenv("DATABASE_URL")
-    SECRET_KEY: str = os.getenv("SECRET_KEY")
-    ALGORITHM: str = os.getenv("ALGORITHM")
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+    # 异步驱动的连接串，未设置时由 DATABASE_URL 推导（aiosqlite / aiomysql）
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+    # 只读副本的连接串，逗号分隔；配置后 GET 接口的查询轮询发往各副本
+    DATABASE_REPLICA_URLS: Optional[str] = os.getenv("DATABASE_REPLICA_URLS")
+    # 客户端发出写请求后，该客户端的读请求在多少秒内仍走主库（读己之写）
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # 副本连接或查询失败后摘除的秒数，到期后重新尝试
+    REPLICA_EJECT_SECONDS: float = float(os.getenv("REPLICA_EJECT_SECONDS", "30"))
+    # 读己之写记录的最大客户端数
+    REPLICA_STICKY_MAX_CLIENTS: int = int(os.getenv("REPLICA_STICKY_MAX_CLIENTS", "100000"))
+
+    SECRET_KEY: Optional[str] = os.getenv("SECRET_KEY")
+    ALGORITHM: Optional[str] = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-settings = Settings() 
\ No newline at end of file
+    # 连接池配置
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # 获取连接的最长等待秒数
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # 连接回收秒数，应小于 MySQL 的 wait_timeout（仅 MySQL）
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # 取出连接前先探活（仅 MySQL）
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # SQLite 连接参数，通过 PRAGMA 在每个新连接上设置
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    # 锁等待毫秒数
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+    # 内存映射 I/O 字节数，0 表示关闭
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    # 批量审核单次最多处理的记录数
+    MODERATION_BATCH_MAX: int = int(os.getenv("MODERATION_BATCH_MAX", "1000"))
+
+    # 门店批量导入：单次 executemany 的行数、单个事务提交的行数、错误报告最多保留的条数
+    STORE_IMPORT_BATCH_SIZE: int = int(os.getenv("STORE_IMPORT_BATCH_SIZE", "1000"))
+    STORE_IMPORT_CHUNK_ROWS: int = int(os.getenv("STORE_IMPORT_CHUNK_ROWS", "20000"))
+    STORE_IMPORT_MAX_ERRORS: int = int(os.getenv("STORE_IMPORT_MAX_ERRORS", "1000"))
+
+    # 门店/商家详情读缓存：后端、最大条目数与存活时间（秒）
+    READ_CACHE_BACKEND: str = os.getenv("READ_CACHE_BACKEND", "memory")
+    READ_CACHE_SIZE: int = int(os.getenv("READ_CACHE_SIZE", "10000"))
+    READ_CACHE_TTL: int = int(os.getenv("READ_CACHE_TTL", "300"))
+
+    # 门店地理编码后端，以及本地地名表（CSV：名称,纬度,经度），为空时使用内置的城市中心点
+    GEOCODER_BACKEND: str = os.getenv("GEOCODER_BACKEND", "local")
+    GEOCODER_GAZETTEER: Optional[str] = os.getenv("GEOCODER_GAZETTEER")
+    # 附近门店：网格单元边长（度），修改后需用 scripts.geocode_stores --recompute-cells 重算
+    STORE_GEO_CELL_DEG: float = float(os.getenv("STORE_GEO_CELL_DEG", "0.0025"))
+    # 附近门店查询的最大半径（米）
+    STORE_NEARBY_MAX_RADIUS: int = int(os.getenv("STORE_NEARBY_MAX_RADIUS", "20000"))
+
+    # 门店照片：存储根目录、单个文件最大字节数、缩略图边长（逗号分隔）
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "./media")
+    PHOTO_MAX_BYTES: int = int(os.getenv("PHOTO_MAX_BYTES", str(10 * 1024 * 1024)))
+    PHOTO_THUMB_SIZES: str = os.getenv("PHOTO_THUMB_SIZES", "320,960")
+    # 生成缩略图的工作池：thread 或 process、工作数量、最大排队任务数
+    IMAGE_POOL_KIND: str = os.getenv("IMAGE_POOL_KIND", "process")
+    IMAGE_POOL_WORKERS: int = int(os.getenv("IMAGE_POOL_WORKERS", "2"))
+    IMAGE_POOL_MAX_PENDING: int = int(os.getenv("IMAGE_POOL_MAX_PENDING", "16"))
+
+    # /metrics：每个指标最多保留的标签组合数，超出部分归入 <other>
+    METRICS_MAX_SERIES: int = int(os.getenv("METRICS_MAX_SERIES", "2000"))
+    # 慢查询日志阈值（毫秒）
+    SLOW_QUERY_MS: int = int(os.getenv("SLOW_QUERY_MS", "200"))
+    # 同一请求内相同语句执行达到该次数时记录疑似 N+1 的警告，0 表示关闭
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "2"))
+
+    # 启动耗时预算（毫秒）：从导入 main 到启动钩子完成，超出时输出警告，0 表示不检查
+    STARTUP_BUDGET_MS: int = int(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+    # 限流：总开关、计数后端、内存后端的分片数和最大键数
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SHARDS: int = int(os.getenv("RATE_LIMIT_SHARDS", "16"))
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    # 各路由器的限流规则（范围:次数/秒数，逗号分隔），未设置的路由器使用 RATE_LIMIT_DEFAULT
+    RATE_LIMIT_DEFAULT: str = os.getenv("RATE_LIMIT_DEFAULT", "ip:1200/60,token:600/60")
+    RATE_LIMIT_AUTH: str = os.getenv("RATE_LIMIT_AUTH", "ip:30/60")
+    RATE_LIMIT_MERCHANT: Optional[str] = os.getenv("RATE_LIMIT_MERCHANT")
+    RATE_LIMIT_STORE: Optional[str] = os.getenv("RATE_LIMIT_STORE")
+    RATE_LIMIT_SYSTEM: Optional[str] = os.getenv("RATE_LIMIT_SYSTEM")
+    RATE_LIMIT_ADMIN: Optional[str] = os.getenv("RATE_LIMIT_ADMIN")
+    RATE_LIMIT_EVENTS: Optional[str] = os.getenv("RATE_LIMIT_EVENTS")
+    # 登录：每个账号的尝试次数限制
+    RATE_LIMIT_LOGIN: str = os.getenv("RATE_LIMIT_LOGIN", "account:10/60")
+    # 登录失败锁定：连续失败达到阈值后锁定 BASE 秒，此后每次失败翻倍，最长 MAX 秒；
+    # 距最近一次失败超过 TTL 秒后失败次数清零
+    LOGIN_LOCKOUT_THRESHOLD: int = int(os.getenv("LOGIN_LOCKOUT_THRESHOLD", "5"))
+    LOGIN_LOCKOUT_BASE: int = int(os.getenv("LOGIN_LOCKOUT_BASE", "30"))
+    LOGIN_LOCKOUT_MAX: int = int(os.getenv("LOGIN_LOCKOUT_MAX", "900"))
+    LOGIN_FAILURE_TTL: int = int(os.getenv("LOGIN_FAILURE_TTL", "900"))
+
+    # 批量创建用户：单次请求的最大用户数、每批写入的用户数、同时提交到哈希工作池的任务数
+    USER_PROVISION_MAX: int = int(os.getenv("USER_PROVISION_MAX", "10000"))
+    USER_PROVISION_BATCH_SIZE: int = int(os.getenv("USER_PROVISION_BATCH_SIZE", "500"))
+    USER_PROVISION_CONCURRENCY: int = int(os.getenv("USER_PROVISION_CONCURRENCY", "4"))
+
+    # 审核状态 SSE 推送：心跳间隔（秒）、每个连接的队列长度、用于断线续传的事件保留条数、每个用户的最大连接数
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    SSE_HISTORY_SIZE: int = int(os.getenv("SSE_HISTORY_SIZE", "10000"))
+    SSE_MAX_PER_USER: int = int(os.getenv("SSE_MAX_PER_USER", "5"))
+    # 重连等待时间（毫秒），通过 retry 字段告知客户端
+    SSE_RETRY_MS: int = int(os.getenv("SSE_RETRY_MS", "3000"))
+    # 订阅票据有效期（秒）：票据放在 URL 中，只能使用一次，过期时间应尽量短
+    SSE_TICKET_TTL: int = int(os.getenv("SSE_TICKET_TTL", "30"))
+
+    # 后台任务队列：总开关、并发执行数、无新任务时的轮询间隔（秒）
+    JOB_QUEUE_ENABLED: bool = os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    # 单次执行的超时（也是租约时长，秒），超时或进程退出后任务重新排队
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    # 失败重试：最大执行次数，退避时间从 BASE 秒开始每次翻倍，最长 MAX 秒；重试耗尽后进入死信
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_BACKOFF_BASE: float = float(os.getenv("JOB_BACKOFF_BASE", "2"))
+    JOB_BACKOFF_MAX: float = float(os.getenv("JOB_BACKOFF_MAX", "600"))
+    # 关闭时等待执行中任务完成的秒数，未完成的任务在租约到期后重新执行
+    JOB_SHUTDOWN_TIMEOUT: float = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "10"))
+
+    # 审核计数对账间隔（秒），0 表示不定期对账
+    MODERATION_RECONCILE_INTERVAL: int = int(os.getenv("MODERATION_RECONCILE_INTERVAL", "3600"))
+
+    # 审计日志：攒够 BATCH_SIZE 条或距上次写入超过 FLUSH_INTERVAL 秒时批量写入；
+    # 内存中最多缓冲 MAX_BUFFER 条，数据库长时间不可用时超出部分丢弃并计数
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+    AUDIT_MAX_BUFFER: int = int(os.getenv("AUDIT_MAX_BUFFER", "100000"))
+    # 查询审计日志时一次允许的最大时间跨度（天）
+    AUDIT_QUERY_MAX_DAYS: int = int(os.getenv("AUDIT_QUERY_MAX_DAYS", "31"))
+
+    # 密码哈希工作池：thread 或 process
+    HASH_POOL_KIND: str = os.getenv("HASH_POOL_KIND", "thread")
+    # 工作线程/进程数量
+    HASH_POOL_WORKERS: int = int(os.getenv("HASH_POOL_WORKERS", "4"))
+    # 允许排队（含执行中）的最大任务数，超出后直接拒绝
+    HASH_POOL_MAX_PENDING: int = int(os.getenv("HASH_POOL_MAX_PENDING", "64"))
+    # 拒绝时建议客户端重试的秒数
+    HASH_POOL_RETRY_AFTER: int = int(os.getenv("HASH_POOL_RETRY_AFTER", "1"))
+
+    # 已认证用户缓存：最大条目数与存活时间（秒）
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+settings = Settings()
@@ -1,20 +1,345 @@
-from sqlalchemy import create_engine
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.config import settings
+from core.metrics import Counter, registry
+from core.query_stats import instrument
+
+logger = logging.getLogger(__name__)
+
+# 同步驱动到异步驱动的映射：本地使用 aiosqlite，生产环境 MySQL 使用 aiomysql
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    由同步连接串推导异步连接串
+    例如 mysql+pymysql://... -> mysql+aiomysql://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"不支持的数据库类型: {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+
+class PoolStats:
+    """
+    连接池等待时间统计
+    按连接池的 logging_name 区分，dispose() 重建连接池后统计仍然保留
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.waits,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": (self.wait_total / self.waits * 1000) if self.waits else 0.0,
+            "wait_ms_max": self.wait_max * 1000,
+        }
+
+
+_pool_stats = {}
+
+
+class _TimedPoolMixin:
+    """记录从连接池取连接的等待时间"""
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+    def _do_get(self):
+        stats = _pool_stats.setdefault(self.logging_name, PoolStats())
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - started)
+        return connection
 
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(url: str, poolclass, name: str) -> dict:
+    """根据 Settings 生成引擎参数"""
+    options = {
+        "poolclass": poolclass,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """在每个新的 SQLite 连接上设置 WAL、同步级别、锁等待和内存映射"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+# 同步引擎，保留给脚本和建表使用
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    **_engine_options(SQLALCHEMY_DATABASE_URL, TimedQueuePool, "sync")
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步引擎，供 API 请求使用，查询不会阻塞事件循环
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    **_engine_options(ASYNC_SQLALCHEMY_DATABASE_URL, TimedAsyncAdaptedQueuePool, "async")
+)
+# expire_on_commit=False：提交后不再隐式刷新属性，避免在异步会话中触发懒加载
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# SQL 语句计时，归属到当前请求
+instrument(engine)
+instrument(async_engine.sync_engine)
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+read_routes = registry.register(Counter(
+    "db_read_route_total", "GET 接口的数据库会话路由次数", ("target", "reason"),
+))
+
+
+class Replica:
+    __slots__ = ("name", "engine", "session_factory", "ejected_until", "failures")
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        async_url = to_async_url(url)
+        self.engine = create_async_engine(
+            async_url, **_engine_options(async_url, TimedAsyncAdaptedQueuePool, name)
+        )
+        instrument(self.engine.sync_engine)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
+        self.session_factory = sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self.ejected_until = 0.0
+        self.failures = 0
+
+
+class ReplicaSet:
+    """
+    只读副本：轮询选择，连接或查询失败的副本摘除 REPLICA_EJECT_SECONDS 秒，到期后重新参与轮询；
+    全部被摘除时读请求回到主库
+    """
+
+    def __init__(self, urls: List[str], eject_seconds: float):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self.eject_seconds = eject_seconds
+        self._next = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next) % len(self.replicas)]
+            if replica.ejected_until <= now:
+                return replica
+        return None
+
+    def eject(self, replica: Replica, error: Exception):
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+        replica.failures += 1
+        logger.warning("只读副本 %s 查询失败，摘除 %.0f 秒: %s", replica.name, self.eject_seconds, error)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            replica.name: {
+                "healthy": replica.ejected_until <= now,
+                "ejected_for": max(0.0, replica.ejected_until - now),
+                "failures": replica.failures,
+            }
+            for replica in self.replicas
+        }
+
+
+class PrimaryPins:
+    """
+    读己之写：记录客户端最近一次写请求的时间，窗口内该客户端的读请求走主库
+    记录数超过上限时先清理过期记录，仍然超出则清空（最坏情况是部分客户端短暂读到副本的旧数据）
+    """
+
+    def __init__(self, seconds: float, max_clients: int):
+        self.seconds = seconds
+        self.max_clients = max_clients
+        self._until: Dict[str, float] = {}
+
+    def pin(self, client: str):
+        now = time.monotonic()
+        if len(self._until) >= self.max_clients:
+            self._until = {k: v for k, v in self._until.items() if v > now}
+            if len(self._until) >= self.max_clients:
+                self._until.clear()
+        self._until[client] = now + self.seconds
+
+    def pinned(self, client: str) -> bool:
+        until = self._until.get(client)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._until.pop(client, None)
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+
+replicas = ReplicaSet(
+    [url.strip() for url in (settings.DATABASE_REPLICA_URLS or "").split(",") if url.strip()],
+    settings.REPLICA_EJECT_SECONDS,
+)
+primary_pins = PrimaryPins(settings.REPLICA_STICKY_SECONDS, settings.REPLICA_STICKY_MAX_CLIENTS)
+
+# 不修改数据的请求方法
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def client_key(request: Request) -> str:
+    """读己之写按客户端区分：已登录时取令牌摘要（与限流计数键相同，不在内存中保存令牌原文），否则取客户端地址"""
+    authorization = request.headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        return hashlib.sha256(authorization[7:].encode()).hexdigest()[:32]
+    return request.client.host if request.client else "unknown"
+
+
+def get_pool_stats() -> dict:
+    """
+    获取同步/异步连接池（含只读副本）的状态
+    checked_out：已借出连接数；overflow：超出 pool_size 的连接数
+    """
+    result = {}
+    pools = [("sync", engine.pool), ("async", async_engine.sync_engine.pool)]
+    pools += [(replica.name, replica.engine.sync_engine.pool) for replica in replicas.replicas]
+    for name, pool in pools:
+        result[name] = {
+            "pool_size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            **_pool_stats.setdefault(name, PoolStats()).snapshot(),
+        }
+    return result
+
+
 Base = declarative_base()
 
 # 依赖项
-def get_db():
+async def get_db(request: Request):
+    # 写请求之后的一小段时间内，该客户端的读请求也走主库
+    if replicas and request.method not in SAFE_METHODS:
+        primary_pins.pin(client_key(request))
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    """
+    只读接口使用的会话：未配置副本、客户端处于读己之写窗口或副本全部被摘除时走主库，否则轮询选择副本
+    副本上的查询因连接或库文件问题失败时摘除该副本，本次请求仍返回错误，后续请求改走其他副本或主库
+    """
+    replica = None
+    if not replicas:
+        reason = "no_replica"
+    elif request.method not in SAFE_METHODS:
+        reason = "write"
+    elif primary_pins.pinned(client_key(request)):
+        reason = "sticky"
+    else:
+        replica = replicas.choose()
+        reason = "round_robin" if replica is not None else "all_ejected"
+
+    if replica is None:
+        read_routes.inc(("primary", reason))
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    read_routes.inc((replica.name, reason))
+    try:
+        async with replica.session_factory() as db:
+            yield db
+    except (OperationalError, InterfaceError) as e:
+        replicas.eject(replica, e)
+        raise
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
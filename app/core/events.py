@@ -0,0 +1,143 @@
+"""
+审核状态变更事件的进程内发布订阅
+
+业务代码在事务提交后调用 event_broker.publish(user_id, 事件名, 数据)，
+事件按用户扇出给该用户的所有订阅（SSE 连接），并保留最近 SSE_HISTORY_SIZE 条用于断线续传。
+
+- 事件ID形如 "<进程标识>-<序号>"，客户端重连时通过 Last-Event-ID 续传；
+  ID 不属于当前进程（重启或连到其他 worker）或已超出保留范围时，发送 reset 事件，
+  客户端应重新拉取一次完整状态
+- 每个订阅的队列长度不超过 SSE_QUEUE_SIZE，消费过慢时断开该订阅，由客户端重连后续传，
+  不会阻塞发布方，也不会无限占用内存
+
+事件只在当前进程内分发，多 worker 部署时需保证发布与订阅在同一进程，或替换为共享的消息通道。
+"""
+import asyncio
+import itertools
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from core.config import settings
+from core.metrics import Counter, Gauge, registry
+
+subscribers_gauge = registry.register(Gauge(
+    "sse_subscribers", "当前的 SSE 订阅数",
+))
+events_published = registry.register(Counter(
+    "sse_events_published_total", "发布的状态变更事件数", ("event",),
+))
+subscribers_dropped = registry.register(Counter(
+    "sse_subscribers_dropped_total", "因队列已满被断开的订阅数",
+))
+
+# (序号, 用户ID, 事件名, 数据)
+Event = Tuple[int, int, str, dict]
+
+# 队列中的结束标记：订阅因消费过慢被断开
+OVERFLOW = None
+
+
+class Subscription:
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(maxsize=maxsize)
+
+
+class EventBroker:
+    def __init__(self, history: int = 10000, queue_size: int = 100, max_per_user: int = 5):
+        # 进程标识，区分不同进程（或重启前后）生成的事件ID
+        self.boot_id = os.urandom(4).hex()
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self._sequence = itertools.count(1)
+        # 最近一条事件的序号
+        self.last_sequence = 0
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+
+    def event_id(self, sequence: int) -> str:
+        return f"{self.boot_id}-{sequence}"
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """解析 Last-Event-ID，不属于当前进程时返回 None"""
+        if not event_id:
+            return None
+        boot_id, _, sequence = event_id.partition("-")
+        if boot_id != self.boot_id or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def publish(self, user_id: Optional[int], event: str, data: dict):
+        """向用户的所有订阅发送事件，在事务提交后调用"""
+        if user_id is None:
+            return
+        item = (next(self._sequence), user_id, event, data)
+        self.last_sequence = item[0]
+        self._history.append(item)
+        events_published.inc((event,))
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            try:
+                subscription.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # 消费过慢：清空队列并放入结束标记，由客户端重连后续传或重新拉取
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(OVERFLOW)
+                self.unsubscribe(subscription)
+                subscribers_dropped.inc()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """
+        建立订阅
+
+        Raises:
+            ValueError: 该用户的订阅数已达上限
+        """
+        subscriptions = self._subscriptions.setdefault(user_id, set())
+        if len(subscriptions) >= self.max_per_user:
+            raise ValueError(f"每个用户最多同时建立 {self.max_per_user} 个订阅")
+        subscription = Subscription(user_id, self.queue_size)
+        subscriptions.add(subscription)
+        subscribers_gauge.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+        subscribers_gauge.dec()
+
+    def replay(self, user_id: int, last_event_id: Optional[str]) -> Optional[List[Event]]:
+        """
+        取 Last-Event-ID 之后该用户的事件
+
+        Returns:
+            Optional[List[Event]]: 需要补发的事件；无法续传（ID 无效或已超出保留范围）时返回 None
+        """
+        after = self.parse_event_id(last_event_id)
+        if after is None or after > self.last_sequence:
+            return None
+        if self._history and self._history[0][0] > after + 1:
+            return None
+        return [item for item in self._history if item[0] > after and item[1] == user_id]
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": sum(len(s) for s in self._subscriptions.values()),
+            "users": len(self._subscriptions),
+            "history": len(self._history),
+            "history_max": self._history.maxlen,
+        }
+
+
+event_broker = EventBroker(
+    history=settings.SSE_HISTORY_SIZE,
+    queue_size=settings.SSE_QUEUE_SIZE,
+    max_per_user=settings.SSE_MAX_PER_USER,
+)
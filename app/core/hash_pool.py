@@ -0,0 +1,115 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import settings
+
+
+class HashPoolBusy(Exception):
+    """工作池排队已满，拒绝新的任务"""
+
+
+def _timed_call(submitted_at: float, fn: Callable, *args) -> tuple:
+    """
+    在工作线程/进程中执行任务，并返回开始执行的时间
+    使用 time.time() 以便在进程池中也能与提交时间比较
+    """
+    return time.time() - submitted_at, fn(*args)
+
+
+class HashPool:
+    """
+    有界的密码哈希工作池
+
+    bcrypt 计算会占用 100~300ms 的 CPU，放在事件循环线程中执行会阻塞整个 worker。
+    该工作池把计算转移到线程池或进程池，并限制排队任务数：
+    超过 max_pending 时立即抛出 HashPoolBusy，而不是继续堆积请求。
+    其他 CPU 密集的任务（如生成缩略图）也可以各自创建一个实例。
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 4,
+        max_pending: int = 64,
+        name: str = "hash-pool"
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"不支持的工作池类型: {kind}")
+        self.name = name
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        # 已提交但尚未完成的任务数（含执行中）
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        # 延迟创建，避免导入模块时就启动线程/进程
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=self.name
+                )
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        在工作池中执行 fn(*args)
+
+        Raises:
+            HashPoolBusy: 排队任务数已达上限
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HashPoolBusy()
+
+        self._pending += 1
+        self.submitted += 1
+        loop = asyncio.get_running_loop()
+        try:
+            wait, result = await loop.run_in_executor(
+                self._get_executor(), _timed_call, time.time(), fn, *args
+            )
+        finally:
+            self._pending -= 1
+
+        self.completed += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        return result
+
+    def stats(self) -> dict:
+        """工作池运行统计"""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "queue_depth": max(0, self._pending - self.workers),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_ms_avg": (self._wait_total / self.completed * 1000) if self.completed else 0.0,
+            "wait_ms_max": self._wait_max * 1000,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashPool(
+    kind=settings.HASH_POOL_KIND,
+    workers=settings.HASH_POOL_WORKERS,
+    max_pending=settings.HASH_POOL_MAX_PENDING,
+)
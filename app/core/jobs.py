@@ -0,0 +1,308 @@
+"""
+后台任务队列（事务发件箱）
+
+业务代码在写入业务数据的同一会话中调用 enqueue(db, 任务类型, 参数)，任务行随业务数据一起提交，
+回滚时一起撤销；提交后唤醒本进程的调度协程，由工作协程在请求之外执行。
+
+- 处理函数通过 @job_handler("类型") 注册，签名为 async def handler(payload: dict)，
+  需自行打开数据库会话；任务至少执行一次，处理函数应保证重复执行无副作用
+- 执行成功后删除任务行；失败后按指数退避重新排队，执行次数达到上限后标记为 dead（死信），
+  可由管理员查看并重新排队
+- 执行中的任务带有租约，进程退出或执行超时后租约到期，任务重新排队，重启不会丢失任务
+- 多个进程可以同时运行调度协程，认领任务时以 UPDATE ... WHERE status = 'pending' 保证每个任务只被一个进程认领
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.metrics import Counter, Gauge, Histogram, registry
+from core.serialization import dumps
+from models.job import Job
+
+logger = logging.getLogger(__name__)
+
+queue_depth = registry.register(Gauge(
+    "job_queue_depth", "任务表中各状态的任务数（调度协程每次轮询时更新）", ("status",),
+))
+jobs_total = registry.register(Counter(
+    "jobs_total", "任务执行次数", ("kind", "outcome"),
+))
+job_duration = registry.register(Histogram(
+    "job_duration_seconds", "任务执行耗时", ("kind",),
+))
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+# 任务类型 -> 处理函数
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+# 调度协程每隔多少次轮询检查一次租约到期的任务
+RECOVER_EVERY = 30
+
+
+def job_handler(kind: str):
+    """注册任务处理函数"""
+    def decorator(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    delay: float = 0,
+    max_attempts: Optional[int] = None
+) -> Job:
+    """
+    在当前事务中写入任务，随业务数据一起提交
+
+    Args:
+        db: 业务数据所在的数据库会话
+        kind: 任务类型
+        payload: 任务参数，需可序列化为 JSON
+        delay: 延迟执行的秒数
+        max_attempts: 最大执行次数，默认取 JOB_MAX_ATTEMPTS
+
+    Returns:
+        Job: 待提交的任务
+    """
+    job = Job(
+        kind=kind,
+        payload=dumps(payload).decode(),
+        status="pending",
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    db.info["jobs_enqueued"] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    # 只有写入过任务的事务提交后才唤醒调度协程
+    if session.info.pop("jobs_enqueued", False):
+        job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("jobs_enqueued", None)
+
+
+def backoff(attempts: int) -> float:
+    """第 attempts 次执行失败后的等待秒数，带随机抖动以错开同时失败的任务"""
+    delay = min(settings.JOB_BACKOFF_BASE * 2 ** (attempts - 1), settings.JOB_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    def __init__(self, concurrency: int = 4, poll_interval: float = 1, lease_seconds: int = 300):
+        # 进程标识，认领任务时写入 locked_by
+        self.worker_id = f"{os.getpid()}-{os.urandom(4).hex()}"
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._polls = 0
+        self._depth: Dict[str, int] = {}
+        self._counts = {"claimed": 0, "succeeded": 0, "retried": 0, "dead": 0, "recovered": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None
+
+    def wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        """在应用启动时启动调度协程"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self, timeout: float = 10):
+        """停止认领新任务，等待执行中的任务完成；超时未完成的任务在租约到期后由其他进程或重启后重新执行"""
+        if not self.running:
+            return
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._dispatcher = None
+        if self._inflight:
+            tasks = list(self._inflight.values())
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._wakeup = None
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("任务调度失败")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self):
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            if self._polls % RECOVER_EVERY == 0:
+                await self._recover(db, now)
+            self._polls += 1
+
+            free = self.concurrency - len(self._inflight)
+            jobs: List[Job] = []
+            if free > 0:
+                jobs = await self._claim(db, now, free)
+
+            result = await db.execute(select(Job.status, func.count()).group_by(Job.status))
+            self._depth = {"pending": 0, "running": 0, "dead": 0, **dict(result.all())}
+            for job_status, count in self._depth.items():
+                queue_depth.set((job_status,), count)
+
+        for job in jobs:
+            task = asyncio.create_task(self._run(job))
+            self._inflight[job.id] = task
+            task.add_done_callback(lambda done, job_id=job.id: self._finished(job_id, done))
+
+    def _finished(self, job_id: int, task: asyncio.Task):
+        self._inflight.pop(job_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            # 写回结果失败，任务保持执行中，租约到期后重新执行
+            logger.error("任务 %d 结果写回失败", job_id, exc_info=task.exception())
+        # 空出执行位后立即认领下一批
+        self.wake()
+
+    async def _recover(self, db: AsyncSession, now: datetime):
+        """租约到期的执行中任务（进程退出或执行超时）重新排队"""
+        result = await db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.locked_until < now)
+            .values(status="pending", locked_by=None, locked_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount:
+            self._counts["recovered"] += result.rowcount
+            logger.warning("%d 个任务租约到期，已重新排队", result.rowcount)
+
+    async def _claim(self, db: AsyncSession, now: datetime, limit: int) -> List[Job]:
+        """认领最多 limit 个到期任务"""
+        result = await db.execute(
+            select(Job.id)
+            .where(Job.status == "pending", Job.run_at <= now)
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return []
+        # 带状态条件的更新保证多个进程不会认领同一任务，再按 locked_by 取回本进程认领到的任务
+        await db.execute(
+            update(Job)
+            .where(Job.id.in_(ids), Job.status == "pending")
+            .values(
+                status="running",
+                locked_by=self.worker_id,
+                locked_until=now + timedelta(seconds=self.lease_seconds),
+                attempts=Job.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        result = await db.execute(
+            select(Job).where(Job.id.in_(ids), Job.status == "running", Job.locked_by == self.worker_id)
+        )
+        jobs = result.scalars().all()
+        self._counts["claimed"] += len(jobs)
+        return jobs
+
+    async def _run(self, job: Job):
+        started = time.perf_counter()
+        try:
+            handler = JOB_HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"未注册的任务类型: {job.kind}")
+            await asyncio.wait_for(handler(json.loads(job.payload)), self.lease_seconds)
+        except asyncio.CancelledError:
+            # 关闭时被取消，租约到期后重新执行
+            raise
+        except Exception as e:
+            logger.warning("任务 %s(%d) 第 %d 次执行失败: %r", job.kind, job.id, job.attempts, e)
+            await self._fail(job, f"{type(e).__name__}: {e}")
+        else:
+            await self._complete(job)
+        finally:
+            job_duration.observe((job.kind,), time.perf_counter() - started)
+
+    async def _complete(self, job: Job):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Job).where(Job.id == job.id, Job.locked_by == self.worker_id))
+            await db.commit()
+        self._counts["succeeded"] += 1
+        jobs_total.inc((job.kind, "succeeded"))
+
+    async def _fail(self, job: Job, error: str):
+        if job.attempts >= job.max_attempts:
+            values = {"status": "dead"}
+            outcome = "dead"
+        else:
+            values = {
+                "status": "pending",
+                "run_at": datetime.utcnow() + timedelta(seconds=backoff(job.attempts)),
+            }
+            outcome = "retried"
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.locked_by == self.worker_id)
+                .values(locked_by=None, locked_until=None, last_error=error[:2000], **values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if outcome == "dead":
+            logger.error("任务 %s(%d) 重试耗尽，已移入死信: %s", job.kind, job.id, error)
+        self._counts[outcome] += 1
+        jobs_total.inc((job.kind, outcome))
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "inflight": len(self._inflight),
+            "depth": self._depth,
+            **self._counts,
+        }
+
+
+job_queue = JobQueue(
+    concurrency=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+)
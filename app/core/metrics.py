@@ -0,0 +1,227 @@
+"""
+请求指标与 Prometheus 文本格式输出
+
+MetricsMiddleware 是纯 ASGI 中间件：按 (路由模板, 方法, 状态码) 记录延迟直方图、
+请求/响应字节数，并维护进行中的请求数。每个请求只做几次字典查找和计数，
+不加锁（所有更新都在事件循环线程中完成）。
+
+标签只取路由模板（如 /stores/{store_id}），未匹配到路由的请求归为 <unmatched>；
+每个指标的序列数不超过 METRICS_MAX_SERIES，超出后新的标签组合归入 <other>。
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 延迟分桶（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 字节数分桶
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+OTHER = "<other>"
+UNMATCHED = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), max_series: int = 0):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.max_series = max_series or settings.METRICS_MAX_SERIES
+        self._series: Dict[tuple, object] = {}
+
+    def _key(self, labels: tuple) -> tuple:
+        # 序列数达到上限后，新的标签组合合并到 <other>，避免标签基数无限增长
+        if labels in self._series or len(self._series) < self.max_series:
+            return labels
+        return (OTHER,) * len(self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Histogram(_Metric):
+    """累积分桶直方图"""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, max_series=0):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: tuple, value: float):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # [各分桶计数..., +Inf 计数, 总和]
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                label_text = _format_labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-1]}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """可增减的计量值"""
+    kind = "gauge"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple = (), value: float = 0):
+        self._series[self._key(labels)] = value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Counter(Gauge):
+    """只增不减的计数"""
+    kind = "counter"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        raise ValueError("计数器不能减少")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 请求处理耗时", ("route", "method", "status"),
+))
+request_size = registry.register(Histogram(
+    "http_request_size_bytes", "HTTP 请求体字节数", ("route", "method"), SIZE_BUCKETS,
+))
+response_size = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP 响应体字节数", ("route", "method", "status"), SIZE_BUCKETS,
+))
+requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "正在处理的 HTTP 请求数", ("method",),
+))
+component_duration = registry.register(Histogram(
+    "app_component_duration_seconds", "请求内各环节耗时（认证、密码哈希、门店读取等）", ("component",),
+))
+
+
+@contextmanager
+def timed(component: str):
+    """记录一段代码的耗时到 app_component_duration_seconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        component_duration.observe((component,), time.perf_counter() - started)
+
+
+# 旧版本 Starlette 不在 scope 中写入 route，按 endpoint 反查路由模板：应用 -> {endpoint: 路由模板}
+_endpoint_paths: Dict[object, Dict[object, str]] = {}
+
+
+def route_template(scope) -> str:
+    """取请求匹配到的路由模板，路由处理之后调用"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED
+    app = scope["app"]
+    paths = _endpoint_paths.get(app)
+    if paths is None:
+        paths = _endpoint_paths[app] = {
+            getattr(r, "endpoint", None): r.path for r in app.router.routes if hasattr(r, "path")
+        }
+    return paths.get(endpoint, UNMATCHED)
+
+
+class MetricsMiddleware:
+    """
+    记录 HTTP 请求指标的 ASGI 中间件
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        received = 0
+        sent = 0
+
+        async def receive_wrapper():
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, sent
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        requests_in_flight.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec((method,))
+            route = route_template(scope)
+            status = str(status_code)
+            request_duration.observe((route, method, status), elapsed)
+            request_size.observe((route, method), received)
+            response_size.observe((route, method, status), sent)
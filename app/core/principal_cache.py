@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from core.config import settings
+from models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    已认证用户的精简快照
+    与数据库会话无关，可以安全地跨请求缓存
+    """
+    id: int
+    username: str
+    account: str
+    role: UserRole
+    is_disabled: bool
+    social_preference: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            account=user.account,
+            role=user.role,
+            is_disabled=bool(user.is_disabled),
+            social_preference=user.social_preference,
+        )
+
+
+class PrincipalCache:
+    """
+    以令牌为键的 TTL + LRU 用户缓存
+
+    缓存项的过期时间取 TTL 与令牌过期时间中较早的一个；
+    用户被禁用或角色变更时按账号立即失效。
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # 账号 -> 令牌集合，用于按账号失效
+        self._tokens_by_account: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: Principal, token_exp: Optional[float] = None):
+        """
+        写入缓存
+        :param token: JWT令牌
+        :param principal: 用户快照
+        :param token_exp: 令牌过期时间（unix 时间戳）
+        """
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, principal)
+            self._tokens_by_account.setdefault(principal.account, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_account(self, account: str):
+        """使某个账号的所有缓存项失效"""
+        with self._lock:
+            tokens = self._tokens_by_account.pop(account, None)
+            if not tokens:
+                return
+            for token in tokens:
+                self._entries.pop(token, None)
+            self.invalidations += len(tokens)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_account.clear()
+
+    def _remove(self, token: str):
+        _, principal = self._entries.pop(token)
+        tokens = self._tokens_by_account.get(principal.account)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_account[principal.account]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+# 影响认证结果的字段，变更后需要使缓存失效
+_PRINCIPAL_FIELDS = ("username", "account", "role", "is_disabled")
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target):
+    """
+    通过 ORM 修改用户的禁用状态、角色等字段时，立即使其缓存失效
+    注意：绕过 ORM 的批量 UPDATE 不会触发该事件，需要手动调用 invalidate_account
+    """
+    state = inspect(target)
+    accounts = set()
+    for field in _PRINCIPAL_FIELDS:
+        history = state.attrs[field].history
+        if history.has_changes():
+            accounts.add(target.account)
+            # 账号本身被修改时，旧账号下的缓存也要清除
+            if field == "account":
+                accounts.update(history.deleted or ())
+    _invalidate_now_and_after_commit(target, accounts)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target):
+    _invalidate_now_and_after_commit(target, {target.account})
+
+
+def _invalidate_now_and_after_commit(target, accounts):
+    """
+    刷新时立即失效；事务提交后再失效一次，
+    防止并发请求在提交前读到旧数据并重新写入缓存
+    """
+    if not accounts:
+        return
+    for account in accounts:
+        principal_cache.invalidate_account(account)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("principal_invalidations", set()).update(accounts)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for account in session.info.pop("principal_invalidations", ()):
+        principal_cache.invalidate_account(account)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("principal_invalidations", None)
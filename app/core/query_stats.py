@@ -0,0 +1,133 @@
+"""
+SQL 语句统计
+
+在引擎的 before/after_cursor_execute 事件中计时，把每条语句归属到当前请求
+（通过 ContextVar 传递，AsyncSession 的 greenlet 和线程池中同样可见）：
+
+- 响应头 X-DB-Query-Count 与 Server-Timing: db;dur=... 给出本次请求的语句数和数据库耗时
+- 超过 SLOW_QUERY_MS 的语句记录日志，只输出参数的结构（键名、类型、行数），不输出参数值
+- 同一请求内相同的 SQL 执行次数达到 QUERY_REPEAT_THRESHOLD 时记录疑似 N+1 的警告
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from core.config import settings
+from core.metrics import Counter, Histogram, registry, route_template
+
+logger = logging.getLogger(__name__)
+
+# 记录日志时语句的最大长度
+STATEMENT_LOG_LENGTH = 500
+
+queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "单个请求执行的 SQL 语句数", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+))
+db_time_per_request = registry.register(Histogram(
+    "db_time_per_request_seconds", "单个请求的 SQL 执行总耗时", ("route",),
+))
+slow_queries = registry.register(Counter(
+    "db_slow_queries_total", "超过慢查询阈值的 SQL 语句数",
+))
+repeated_statements = registry.register(Counter(
+    "db_repeated_statements_total", "同一请求内重复执行的 SQL 语句（疑似 N+1）", ("route",),
+))
+
+
+class RequestQueries:
+    """一个请求内的 SQL 统计"""
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # SQL 文本 -> 执行次数
+        self.statements: Dict[str, int] = {}
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def param_shape(parameters) -> str:
+    """描述参数的结构而不包含参数值，例如 {id: int, name: str}、3x(int, str)"""
+    if parameters is None:
+        return "()"
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (dict, tuple, list)):
+        return f"{len(parameters)}x{param_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    current = _current.get()
+    if current is not None:
+        current.count += 1
+        current.duration += elapsed
+        current.statements[statement] = current.statements.get(statement, 0) + 1
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_queries.inc()
+        logger.warning(
+            "慢查询 %.1fms: %s 参数: %s",
+            elapsed * 1000, statement[:STATEMENT_LOG_LENGTH], param_shape(parameters),
+        )
+
+
+def instrument(engine):
+    """在引擎（异步引擎传入 sync_engine）上注册语句计时事件"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    为每个请求建立 SQL 统计，在响应头中输出并在请求结束时记录指标
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # 响应头发出时统计到此为止的语句，流式响应后续的语句只计入指标
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(queries.count).encode()))
+                headers.append((b"server-timing", f"db;dur={queries.duration * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = route_template(scope)
+            queries_per_request.observe((route,), queries.count)
+            db_time_per_request.observe((route,), queries.duration)
+            threshold = settings.QUERY_REPEAT_THRESHOLD
+            if threshold:
+                for statement, count in queries.statements.items():
+                    if count >= threshold:
+                        repeated_statements.inc((route,))
+                        logger.warning(
+                            "疑似 N+1：%s %s 中同一语句执行了 %d 次: %s",
+                            scope["method"], route, count, statement[:STATEMENT_LOG_LENGTH],
+                        )
@@ -0,0 +1,330 @@
+"""
+进程内限流与登录失败锁定
+
+- 限流规则写作 "范围:次数/秒数"，逗号分隔，例如 "ip:300/60,token:600/60"；
+  范围为 ip（客户端地址）、token（Bearer 令牌）、account（账号，由接口自行传入）
+- 每个路由器通过 rate_limit("<名称>") 依赖取 RATE_LIMIT_<名称> 的规则，未配置时用 RATE_LIMIT_DEFAULT
+- 登录按 账号+IP 记录连续失败次数，达到阈值后锁定，锁定时间按次数指数增长；
+  锁定检查在查询用户和验证密码之前进行，被锁定的请求不消耗 bcrypt 计算
+
+计数保存在 RateLimitStore 中。默认的 MemoryRateLimitStore 按键分片加锁，
+只在当前进程内有效，多 worker 部署时每个进程各自计数；
+需要跨进程共享时实现 RateLimitStore 并注册到 RATE_LIMIT_BACKENDS。
+"""
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Request, status
+
+from core.config import settings
+from core.metrics import Counter, registry
+
+rate_limited = registry.register(Counter(
+    "rate_limited_total", "被限流或登录锁定拒绝的请求数", ("rule",),
+))
+
+SCOPES = ("ip", "token", "account")
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    scope: str
+    limit: int
+    window: int
+
+    def __str__(self):
+        return f"{self.scope}:{self.limit}/{self.window}"
+
+
+def parse_rules(text: str) -> List[RateLimitRule]:
+    """
+    解析限流规则
+
+    Raises:
+        ValueError: 规则格式错误
+    """
+    rules = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        try:
+            scope, spec = item.split(":")
+            limit, window = spec.split("/")
+            rule = RateLimitRule(scope.strip(), int(limit), int(window))
+        except ValueError:
+            raise ValueError(f"限流规则格式错误: {item}（应为 范围:次数/秒数）")
+        if rule.scope not in SCOPES or rule.limit <= 0 or rule.window <= 0:
+            raise ValueError(f"限流规则无效: {item}")
+        rules.append(rule)
+    return rules
+
+
+class RateLimitStore(ABC):
+    """
+    限流计数存储接口
+
+    所有方法都是协程，便于接入 Redis 等共享存储；返回的时间均为秒。
+    未实现全部抽象方法的后端在创建时即报错，而不是等到第一次请求。
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: int) -> float:
+        """记录一次请求，未超限返回 0，超限时不计数并返回建议的重试等待时间"""
+
+    @abstractmethod
+    async def locked_for(self, key: str) -> float:
+        """返回剩余锁定时间，未锁定返回 0"""
+
+    @abstractmethod
+    async def record_failure(self, key: str) -> float:
+        """记录一次登录失败，返回因此开始的锁定时间，未锁定返回 0"""
+
+    @abstractmethod
+    async def reset_failures(self, key: str):
+        """登录成功后清除失败记录"""
+
+    def stats(self) -> dict:
+        return {}
+
+
+def lockout_seconds(failures: int) -> float:
+    """连续失败 failures 次后的锁定时间：达到阈值后从 LOGIN_LOCKOUT_BASE 起每次翻倍"""
+    excess = failures - settings.LOGIN_LOCKOUT_THRESHOLD
+    if excess < 0:
+        return 0
+    return min(settings.LOGIN_LOCKOUT_BASE * 2 ** min(excess, 32), settings.LOGIN_LOCKOUT_MAX)
+
+
+class _Shard:
+    __slots__ = ("lock", "windows", "failures", "ops")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # 键 -> [当前窗口起点, 窗口秒数, 上一窗口计数, 当前窗口计数]
+        self.windows: Dict[str, list] = {}
+        # 键 -> [连续失败次数, 最近失败时间, 锁定截止时间]
+        self.failures: Dict[str, list] = {}
+        self.ops = 0
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    进程内的滑动窗口计数
+
+    用前后两个固定窗口按时间加权近似滑动窗口，每个键只保存两个计数；
+    键按哈希分到多个分片，各分片独立加锁。过期的键定期清理，
+    每个分片的键数超过上限时淘汰最早写入的键，内存占用有界。
+    """
+
+    # 每个分片每执行多少次操作清理一次过期的键
+    SWEEP_EVERY = 1024
+
+    def __init__(self, shards: int = 16, max_keys: int = 100000):
+        self._shards = [_Shard() for _ in range(shards)]
+        self.max_keys_per_shard = max(max_keys // shards, 1)
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _maintain(self, shard: _Shard, now: float):
+        shard.ops += 1
+        if shard.ops % self.SWEEP_EVERY and len(shard.windows) + len(shard.failures) <= self.max_keys_per_shard:
+            return
+        for key in [k for k, (start, window, _, _) in shard.windows.items() if start + 2 * window <= now]:
+            del shard.windows[key]
+        ttl = settings.LOGIN_FAILURE_TTL
+        for key in [k for k, (_, last, until) in shard.failures.items() if last + ttl <= now and until <= now]:
+            del shard.failures[key]
+        for table in (shard.windows, shard.failures):
+            while len(shard.windows) + len(shard.failures) > self.max_keys_per_shard and table:
+                del table[next(iter(table))]
+                self.evictions += 1
+
+    async def hit(self, key: str, limit: int, window: int) -> float:
+        now = time.time()
+        start = now - now % window
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.windows.get(key)
+            if entry is None or entry[0] < start - window:
+                previous = current = 0
+            elif entry[0] < start:
+                previous, current = entry[3], 0
+            else:
+                previous, current = entry[2], entry[3]
+
+            elapsed = (now - start) / window
+            if previous * (1 - elapsed) + current + 1 <= limit:
+                shard.windows[key] = [start, window, previous, current + 1]
+                self.allowed += 1
+                self._maintain(shard, now)
+                return 0
+
+            shard.windows[key] = [start, window, previous, current]
+            self.limited += 1
+        # 估算计数降到 limit - 1 以下所需的时间
+        if current + 1 > limit:
+            # 需要等到下一个窗口，且本窗口的计数衰减到足够小
+            return start + window - now + window * (1 - (limit - 1) / current)
+        return max(start + window * (1 - (limit - current - 1) / previous) - now, 0.001)
+
+    async def locked_for(self, key: str) -> float:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.failures.get(key)
+        if entry is None:
+            return 0
+        return max(entry[2] - time.time(), 0)
+
+    async def record_failure(self, key: str) -> float:
+        now = time.time()
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.failures.get(key)
+            if entry is None or entry[1] + settings.LOGIN_FAILURE_TTL <= now:
+                entry = shard.failures[key] = [0, now, 0.0]
+            entry[0] += 1
+            entry[1] = now
+            lockout = lockout_seconds(entry[0])
+            if lockout:
+                entry[2] = now + lockout
+            self._maintain(shard, now)
+        return lockout
+
+    async def reset_failures(self, key: str):
+        shard = self._shard(key)
+        with shard.lock:
+            shard.failures.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "shards": len(self._shards),
+            "keys": sum(len(shard.windows) for shard in self._shards),
+            "failure_keys": sum(len(shard.failures) for shard in self._shards),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+
+def _memory_store() -> RateLimitStore:
+    return MemoryRateLimitStore(shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+# 后端名称 -> 工厂函数
+RATE_LIMIT_BACKENDS: Dict[str, Callable[[], RateLimitStore]] = {
+    "memory": _memory_store,
+}
+
+
+def create_rate_limit_store(name: Optional[str] = None) -> RateLimitStore:
+    """按名称创建限流存储，默认取 Settings.RATE_LIMIT_BACKEND"""
+    name = name or settings.RATE_LIMIT_BACKEND
+    if name not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"不支持的限流后端: {name}")
+    return RATE_LIMIT_BACKENDS[name]()
+
+
+rate_limit_store = create_rate_limit_store()
+
+
+def client_ip(request: Request) -> str:
+    """客户端地址；部署在反向代理后时由 uvicorn --proxy-headers 按 X-Forwarded-For 改写"""
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many(rule: str, retry_after: float, detail: str = "Too many requests, please retry later"):
+    rate_limited.inc((rule,))
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(int(retry_after + 0.999), 1))},
+    )
+
+
+async def check_limits(name: str, rules: List[RateLimitRule], keys: Dict[str, Optional[str]]):
+    """
+    按规则逐条计数
+
+    Args:
+        name: 规则组名称，用于区分计数键和指标标签
+        rules: 限流规则
+        keys: 范围 -> 计数键，值为 None 的范围跳过
+
+    Raises:
+        HTTPException: 超出限制时抛出429，并带 Retry-After
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    for rule in rules:
+        key = keys.get(rule.scope)
+        if key is None:
+            continue
+        retry_after = await rate_limit_store.hit(f"{name}:{rule}:{key}", rule.limit, rule.window)
+        if retry_after:
+            raise _too_many(f"{name}:{rule}", retry_after)
+
+
+def rate_limit(name: str):
+    """
+    路由器级限流依赖：APIRouter(dependencies=[Depends(rate_limit("store"))])
+
+    规则取 Settings.RATE_LIMIT_<NAME>，未配置时取 RATE_LIMIT_DEFAULT；
+    account 范围需要在接口中调用 check_limits 传入账号。
+    """
+    rules = parse_rules(getattr(settings, f"RATE_LIMIT_{name.upper()}", None) or settings.RATE_LIMIT_DEFAULT)
+
+    async def dependency(request: Request):
+        token = None
+        authorization = request.headers.get("authorization", "")
+        if authorization[:7].lower() == "bearer ":
+            # 令牌较长，只用摘要作为计数键
+            token = hashlib.sha256(authorization[7:].encode()).hexdigest()[:32]
+        await check_limits(name, rules, {"ip": client_ip(request), "token": token})
+
+    return dependency
+
+
+class LoginGuard:
+    """
+    登录防暴力破解：账号维度限流和 账号+IP 维度的失败锁定
+    """
+
+    def __init__(self, store: RateLimitStore):
+        self.store = store
+        self.rules = parse_rules(settings.RATE_LIMIT_LOGIN)
+
+    @staticmethod
+    def _key(account: str, ip: str) -> str:
+        return f"login:{account}|{ip}"
+
+    async def check(self, account: str, ip: str):
+        """
+        在验证密码之前调用
+
+        Raises:
+            HTTPException: 处于锁定期或账号登录过于频繁时抛出429
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        locked_for = await self.store.locked_for(self._key(account, ip))
+        if locked_for:
+            raise _too_many("login:lockout", locked_for, "Too many failed login attempts, please retry later")
+        await check_limits("login", self.rules, {"ip": ip, "account": account})
+
+    async def failed(self, account: str, ip: str):
+        if settings.RATE_LIMIT_ENABLED:
+            await self.store.record_failure(self._key(account, ip))
+
+    async def succeeded(self, account: str, ip: str):
+        if settings.RATE_LIMIT_ENABLED:
+            await self.store.reset_failures(self._key(account, ip))
+
+
+login_guard = LoginGuard(rate_limit_store)
@@ -0,0 +1,83 @@
+"""
+JSON 序列化快速路径
+
+- FastJSONResponse：安装了 orjson 时用 orjson 输出，否则退回标准库 json；作为应用的默认响应类
+- RowSerializer：按响应模型的字段名直接从 ORM 对象或 Row 取值生成字典，
+  跳过 pydantic 校验和 jsonable_encoder。只用于数据库中读出的可信数据，
+  这些数据写入时已经过校验，响应时不再重复校验
+
+接口返回 FastJSONResponse 时 FastAPI 不再按 response_model 处理返回值，
+response_model 仍保留用于生成接口文档。
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Iterable, List, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 dumps 输出的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_field_names(model: Type[BaseModel]) -> List[str]:
+    """响应模型的字段名，兼容 pydantic v1 / v2"""
+    fields = getattr(model, "model_fields", None)
+    if fields is None:
+        fields = model.__fields__
+    return list(fields)
+
+
+class RowSerializer:
+    """
+    按响应模型的字段从 ORM 对象或 Row 生成字典
+
+    字段名在创建时取一次，之后每行只做一次 attrgetter 调用，
+    datetime、Enum 等值原样保留，由 dumps 输出。
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.fields = tuple(model_field_names(model))
+        self._get = attrgetter(*self.fields)
+
+    def one(self, obj) -> dict:
+        values = self._get(obj)
+        if len(self.fields) == 1:
+            values = (values,)
+        return dict(zip(self.fields, values))
+
+    def many(self, objs: Iterable) -> List[dict]:
+        fields = self.fields
+        get = self._get
+        if len(fields) == 1:
+            return [{fields[0]: get(obj)} for obj in objs]
+        return [dict(zip(fields, get(obj))) for obj in objs]
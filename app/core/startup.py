@@ -0,0 +1,55 @@
+"""
+启动耗时记录
+
+main 模块在最开始记下时间点，之后依次标记导入完成、应用创建完成、启动钩子完成，
+汇总为启动报告：日志输出一次，并可通过 /system/stats/startup 查看。
+超过 STARTUP_BUDGET_MS 时输出警告，便于控制 worker 冷启动时间。
+"""
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    def __init__(self):
+        self._started: Optional[float] = None
+        self._last: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+
+    def start(self, at: Optional[float] = None):
+        self._started = self._last = at if at is not None else time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase: str):
+        """记录从上一个标记到现在的耗时"""
+        now = time.perf_counter()
+        if self._last is None:
+            self._started = self._last = now
+        self.phases[phase] = (now - self._last) * 1000
+        self._last = now
+
+    def report(self) -> dict:
+        total = sum(self.phases.values())
+        return {
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "total_ms": round(total, 1),
+            # 进程到目前为止消耗的 CPU 时间，包括解释器和服务器自身的启动
+            "process_cpu_ms": round(time.process_time() * 1000, 1),
+            "modules_loaded": len(sys.modules),
+            "budget_ms": settings.STARTUP_BUDGET_MS,
+        }
+
+    def log(self):
+        report = self.report()
+        phases = ", ".join(f"{name} {ms}ms" for name, ms in report["phases_ms"].items())
+        logger.info("启动耗时 %sms（%s），已加载模块 %d 个", report["total_ms"], phases, report["modules_loaded"])
+        if settings.STARTUP_BUDGET_MS and report["total_ms"] > settings.STARTUP_BUDGET_MS:
+            logger.warning("启动耗时 %sms 超过预算 %dms", report["total_ms"], settings.STARTUP_BUDGET_MS)
+
+
+startup_timer = StartupTimer()
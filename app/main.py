@@ -1,39 +1,98 @@
-import sys
-import os
+import time
 
-# 将当前目录添加到 Python 路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_import_started = time.perf_counter()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from api import auth, merchant, store
-from core.database import engine
-from models import user, store as store_model
-
-# 创建数据库表
-user.Base.metadata.create_all(bind=engine)
-store_model.Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="IIT API",
-    description="IIT项目API文档",
-    version="1.0.0"
-)
-
-# 配置CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# 包含认证路由
-app.include_router(auth.router, prefix="/api", tags=["auth"])
-app.include_router(merchant.router)
-app.include_router(store.router)
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to IIT API"} 
\ No newline at end of file
+from core.audit import audit_log
+from core.config import settings
+from core.database import AsyncSessionLocal, async_engine, engine, replicas
+from core.hash_pool import hash_pool
+from core.jobs import job_queue
+from core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from core.query_stats import QueryStatsMiddleware
+from core.serialization import FastJSONResponse
+from core.startup import startup_timer
+from services.moderation_stats import schedule_reconcile
+from services.photo import image_pool
+
+# 表结构由 Alembic 迁移管理，启动前先执行 alembic upgrade head；导入本模块不访问数据库
+startup_timer.start(_import_started)
+
+
+async def on_startup():
+    await audit_log.start()
+    if settings.JOB_QUEUE_ENABLED:
+        await job_queue.start()
+        # 安排审核计数的定期对账
+        async with AsyncSessionLocal() as db:
+            await schedule_reconcile(db)
+    startup_timer.mark("startup")
+    startup_timer.log()
+
+
+async def on_shutdown():
+    # 等待执行中的后台任务，关闭密码哈希和缩略图工作池，释放数据库连接
+    await job_queue.stop(settings.JOB_SHUTDOWN_TIMEOUT)
+    # 写入缓冲中的审计事件，需在释放数据库连接之前
+    await audit_log.stop()
+    hash_pool.shutdown()
+    image_pool.shutdown()
+    await async_engine.dispose()
+    await replicas.dispose()
+    engine.dispose()
+
+
+def create_app() -> FastAPI:
+    """
+    创建应用：注册中间件、路由和生命周期钩子
+    """
+    from api import admin, auth, events, merchant, store, system
+
+    app = FastAPI(
+        title="IIT API",
+        description="IIT项目API文档",
+        version="1.0.0",
+        default_response_class=FastJSONResponse
+    )
+    # 使用 startup/shutdown 事件而不是 lifespan 上下文管理器，兼容 requirements 允许的 FastAPI 0.68
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
+
+    # 配置CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # SQL 语句统计：响应头中的语句数与数据库耗时，慢查询与疑似 N+1 日志
+    app.add_middleware(QueryStatsMiddleware)
+    # 请求指标，放在最外层以便计入其他中间件的耗时
+    app.add_middleware(MetricsMiddleware)
+
+    # 包含认证路由
+    app.include_router(auth.router, prefix="/api", tags=["auth"])
+    app.include_router(merchant.router)
+    app.include_router(store.router)
+    app.include_router(system.router)
+    app.include_router(admin.router)
+    app.include_router(events.router)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Prometheus 文本格式的请求指标
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to IIT API"}
+
+    return app
+
+
+startup_timer.mark("import")
+app = create_app()
+startup_timer.mark("create_app")
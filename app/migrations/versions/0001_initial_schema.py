@@ -0,0 +1,69 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('store',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='自增主键，用于唯一标识每个门店'),
+    sa.Column('store_type', sa.String(length=50), nullable=False, comment='门店类型，例如餐厅、零售店'),
+    sa.Column('store_phone', sa.String(length=20), nullable=True, comment='门店联系电话'),
+    sa.Column('store_address', sa.String(length=255), nullable=False, comment='门店详细地址'),
+    sa.Column('store_hours', sa.String(length=100), nullable=True, comment='门店营业时间'),
+    sa.Column('store_photo', sa.String(length=255), nullable=True, comment='门店照片的存储路径或URL'),
+    sa.Column('owner_account', sa.String(length=100), nullable=False, comment='门店归属人账户标识'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间，自动记录'),
+    sa.Column('is_pass', sa.Integer(), nullable=True, comment='初始值0 通过1 驳回2'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('account', sa.String(length=100), nullable=False),
+    sa.Column('password', sa.String(length=255), nullable=False),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('social_preference', sa.Enum('Lively', 'Quiet', 'Balanced', 'None'), nullable=True),
+    sa.Column('role', sa.Enum('NORMAL', 'ADMIN', 'MERCHANT', name='userrole'), nullable=False),
+    sa.Column('is_disabled', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('merchant',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('address', sa.String(length=200), nullable=False),
+    sa.Column('business_hours', sa.String(length=100), nullable=True),
+    sa.Column('contact_phone', sa.String(length=20), nullable=True),
+    sa.Column('license_number', sa.String(length=50), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('is_open', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('merchant')
+    op.drop_table('user')
+    op.drop_table('store')
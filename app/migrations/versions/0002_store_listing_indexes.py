@@ -0,0 +1,40 @@
+"""store listing indexes
+
+门店列表按 (created_at, id) 做游标分页，为各筛选条件建立组合索引，
+使深分页时的查询代价保持不变。
+
+SQLite 中由 CURRENT_TIMESTAMP 写入的 created_at 不含微秒，
+与应用绑定的参数格式（含微秒）按字符串比较时顺序不一致，这里统一补齐。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "UPDATE store SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+    op.create_index('ix_store_created_at_id', 'store', ['created_at', 'id'])
+    op.create_index('ix_store_owner_created_at_id', 'store', ['owner_account', 'created_at', 'id'])
+    op.create_index('ix_store_is_pass_created_at_id', 'store', ['is_pass', 'created_at', 'id'])
+    op.create_index('ix_store_type_created_at_id', 'store', ['store_type', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_store_type_created_at_id', table_name='store')
+    op.drop_index('ix_store_is_pass_created_at_id', table_name='store')
+    op.drop_index('ix_store_owner_created_at_id', table_name='store')
+    op.drop_index('ix_store_created_at_id', table_name='store')
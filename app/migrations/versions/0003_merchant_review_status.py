@@ -0,0 +1,34 @@
+"""merchant review status
+
+商家审批依赖的状态、驳回原因和社交偏好字段，以及审核队列索引。
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('merchant', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('social_preference', sa.Enum('Lively', 'Quiet', 'Balanced', 'None'), nullable=True))
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='pending', nullable=False))
+        batch_op.add_column(sa.Column('rejection_reason', sa.String(length=255), nullable=True))
+        batch_op.create_index('ix_merchant_status_id', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('merchant', schema=None) as batch_op:
+        batch_op.drop_index('ix_merchant_status_id')
+        batch_op.drop_column('rejection_reason')
+        batch_op.drop_column('status')
+        batch_op.drop_column('social_preference')
@@ -0,0 +1,122 @@
+"""store full-text search
+
+SQLite：创建 FTS5 虚拟表 store_fts（trigram 分词）及同步触发器，并回填已有门店。
+MySQL：为 store(store_address, store_type) 与 merchant(name, description) 建立 ngram FULLTEXT 索引。
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS store_fts USING fts5(
+        store_address, store_type, merchant_name, merchant_description,
+        tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ai AFTER INSERT ON store BEGIN
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN user u ON u.username = new.owner_account
+        LEFT JOIN merchant m ON m.user_id = u.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_au
+    AFTER UPDATE OF store_address, store_type, owner_account ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN user u ON u.username = new.owner_account
+        LEFT JOIN merchant m ON m.user_id = u.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ad AFTER DELETE ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+    END
+    """,
+    # 商家名称/描述变化时，刷新该商家所有门店的索引行
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ai AFTER INSERT ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_au
+    AFTER UPDATE OF name, description, user_id ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = old.user_id
+        );
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ad AFTER DELETE ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = old.user_id
+        );
+    END
+    """,
+]
+
+MYSQL_DDL = [
+    "ALTER TABLE store ADD FULLTEXT INDEX ft_store_address_type (store_address, store_type) WITH PARSER ngram",
+    "ALTER TABLE merchant ADD FULLTEXT INDEX ft_merchant_name_description (name, description) WITH PARSER ngram",
+]
+
+SQLITE_BACKFILL = """
+INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+SELECT s.id, s.store_address, s.store_type, m.name, m.description
+FROM store s
+LEFT JOIN user u ON u.username = s.owner_account
+LEFT JOIN merchant m ON m.user_id = u.id
+"""
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        op.execute(SQLITE_BACKFILL)
+    elif dialect == 'mysql':
+        for statement in MYSQL_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in (
+            'store_fts_ai', 'store_fts_au', 'store_fts_ad',
+            'merchant_fts_ai', 'merchant_fts_au', 'merchant_fts_ad',
+        ):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS store_fts')
+    elif dialect == 'mysql':
+        op.drop_index('ft_merchant_name_description', table_name='merchant')
+        op.drop_index('ft_store_address_type', table_name='store')
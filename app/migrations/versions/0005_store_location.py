@@ -0,0 +1,47 @@
+"""store location
+
+门店经纬度及网格单元编号，用于附近门店查询；由 scripts.geocode_stores 离线填写。
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True, comment='纬度'))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True, comment='经度'))
+        batch_op.add_column(sa.Column('geo_cell', sa.BigInteger(), nullable=True, comment='网格单元编号'))
+        batch_op.create_index('ix_store_geo_cell', ['geo_cell', 'latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    triggers = []
+    if bind.dialect.name == 'sqlite':
+        # SQLite 删除列需要重建 store 表，引用 store 的全文检索触发器需先删除、重建后恢复
+        triggers = bind.execute(sa.text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND sql LIKE '%store%'"
+        )).all()
+        for name, _ in triggers:
+            op.execute(f'DROP TRIGGER "{name}"')
+
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.drop_index('ix_store_geo_cell')
+        batch_op.drop_column('geo_cell')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    for _, sql in triggers:
+        op.execute(sql)
@@ -0,0 +1,189 @@
+"""store owner_id
+
+为门店增加指向 user.id 的 owner_id 外键，按 owner_account = user.username 回填已有门店，
+按归属人查询的索引改为 (owner_id, created_at, id)。
+用户名找不到对应用户的历史门店 owner_id 保持为空。
+SQLite 的全文检索触发器改为按 owner_id 关联商家。
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# 全文检索触发器（迁移 0004 创建）
+TRIGGERS = (
+    'store_fts_ai', 'store_fts_au', 'store_fts_ad',
+    'merchant_fts_ai', 'merchant_fts_au', 'merchant_fts_ad',
+)
+
+# 按 owner_id 关联商家的触发器
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ai AFTER INSERT ON store BEGIN
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN merchant m ON m.user_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_au
+    AFTER UPDATE OF store_address, store_type, owner_id ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN merchant m ON m.user_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ad AFTER DELETE ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+    END
+    """,
+    # 商家名称/描述变化时，刷新该商家所有门店的索引行
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ai AFTER INSERT ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_au
+    AFTER UPDATE OF name, description, user_id ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = old.user_id
+        );
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ad AFTER DELETE ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = old.user_id
+        );
+    END
+    """,
+]
+
+# 迁移前按用户名关联的触发器，降级时恢复
+SQLITE_LEGACY_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ai AFTER INSERT ON store BEGIN
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN user u ON u.username = new.owner_account
+        LEFT JOIN merchant m ON m.user_id = u.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_au
+    AFTER UPDATE OF store_address, store_type, owner_account ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN user u ON u.username = new.owner_account
+        LEFT JOIN merchant m ON m.user_id = u.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ad AFTER DELETE ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+    END
+    """,
+    # 商家名称/描述变化时，刷新该商家所有门店的索引行
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ai AFTER INSERT ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_au
+    AFTER UPDATE OF name, description, user_id ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = old.user_id
+        );
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ad AFTER DELETE ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT s.id FROM store s JOIN user u ON u.username = s.owner_account
+            WHERE u.id = old.user_id
+        );
+    END
+    """,
+]
+
+BACKFILL = """
+UPDATE store SET owner_id = (SELECT user.id FROM user WHERE user.username = store.owner_account)
+WHERE owner_id IS NULL
+"""
+
+
+def _drop_triggers(bind):
+    # SQLite 增删外键需要重建 store 表，引用 store 的触发器需先删除、完成后重建
+    if bind.dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def _create_triggers(bind, statements):
+    if bind.dialect.name != 'sqlite':
+        return
+    has_fts = bind.execute(sa.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'store_fts'"
+    )).first()
+    if has_fts:
+        for statement in statements:
+            op.execute(statement)
+
+
+def upgrade():
+    bind = op.get_bind()
+    _drop_triggers(bind)
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('owner_id', sa.Integer(), nullable=True, comment='门店归属人用户ID'))
+        batch_op.create_foreign_key('fk_store_owner_id_user', 'user', ['owner_id'], ['id'])
+        batch_op.drop_index('ix_store_owner_created_at_id')
+        batch_op.create_index('ix_store_owner_id_created_at_id', ['owner_id', 'created_at', 'id'], unique=False)
+    op.execute(BACKFILL)
+    _create_triggers(bind, SQLITE_TRIGGERS)
+
+
+def downgrade():
+    bind = op.get_bind()
+    _drop_triggers(bind)
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.drop_index('ix_store_owner_id_created_at_id')
+        batch_op.create_index('ix_store_owner_created_at_id', ['owner_account', 'created_at', 'id'], unique=False)
+        batch_op.drop_constraint('fk_store_owner_id_user', type_='foreignkey')
+        batch_op.drop_column('owner_id')
+    _create_triggers(bind, SQLITE_LEGACY_TRIGGERS)
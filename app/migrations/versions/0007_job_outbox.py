@@ -0,0 +1,41 @@
+"""job outbox
+
+后台任务表（事务发件箱）：任务与业务数据在同一事务中写入，由进程内工作协程执行。
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='自增主键'),
+    sa.Column('kind', sa.String(length=64), nullable=False, comment='任务类型'),
+    sa.Column('payload', sa.Text(), nullable=False, comment='任务参数JSON'),
+    sa.Column('status', sa.String(length=16), nullable=False, comment='pending/running/dead'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='已执行次数'),
+    sa.Column('max_attempts', sa.Integer(), nullable=False, comment='最大执行次数'),
+    sa.Column('run_at', sa.DateTime(), nullable=False, comment='下次可执行时间'),
+    sa.Column('locked_by', sa.String(length=32), nullable=True, comment='执行该任务的进程标识'),
+    sa.Column('locked_until', sa.DateTime(), nullable=True, comment='租约到期时间'),
+    sa.Column('last_error', sa.Text(), nullable=True, comment='最近一次失败的错误信息'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_status_run_at', 'job', ['status', 'run_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_status_run_at', table_name='job')
+    op.drop_table('job')
@@ -0,0 +1,44 @@
+"""moderation count
+
+门店（按类型）和商家按审核状态的计数表，由应用随业务写入增量维护；
+创建时按现有数据回填。
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('moderation_count',
+    sa.Column('entity', sa.String(length=16), nullable=False, comment='对象类型：store/merchant'),
+    sa.Column('category', sa.String(length=50), nullable=False, comment='门店类型，商家为空字符串'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='审核状态'),
+    sa.Column('count', sa.Integer(), nullable=False, comment='数量'),
+    sa.PrimaryKeyConstraint('entity', 'category', 'status')
+    )
+    op.execute(
+        "INSERT INTO moderation_count (entity, category, status, count) "
+        "SELECT 'store', store_type, "
+        "CASE is_pass WHEN 1 THEN 'approved' WHEN 2 THEN 'rejected' ELSE 'pending' END, COUNT(*) "
+        "FROM store GROUP BY store_type, "
+        "CASE is_pass WHEN 1 THEN 'approved' WHEN 2 THEN 'rejected' ELSE 'pending' END"
+    )
+    op.execute(
+        "INSERT INTO moderation_count (entity, category, status, count) "
+        "SELECT 'merchant', '', status, COUNT(*) FROM merchant GROUP BY status"
+    )
+
+
+def downgrade():
+    op.drop_table('moderation_count')
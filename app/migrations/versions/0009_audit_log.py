@@ -0,0 +1,46 @@
+"""audit log
+
+只追加的审计日志表，记录审核和账号相关操作；索引均以发生时间为前导或紧随等值条件之后，
+按时间窗口查询。
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('audit_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='自增主键'),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False, comment='发生时间'),
+    sa.Column('action', sa.String(length=50), nullable=False, comment='操作'),
+    sa.Column('actor_id', sa.Integer(), nullable=True, comment='操作人用户ID'),
+    sa.Column('actor', sa.String(length=100), nullable=True, comment='操作人用户名'),
+    sa.Column('target_type', sa.String(length=16), nullable=True, comment='对象类型：store/merchant/user'),
+    sa.Column('target_id', sa.Integer(), nullable=True, comment='对象ID'),
+    sa.Column('ip', sa.String(length=45), nullable=True, comment='客户端地址'),
+    sa.Column('detail', sa.Text(), nullable=True, comment='操作详情JSON'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_log_occurred_at_id', 'audit_log', ['occurred_at', 'id'], unique=False)
+    op.create_index('ix_audit_log_action_occurred_at_id', 'audit_log', ['action', 'occurred_at', 'id'], unique=False)
+    op.create_index('ix_audit_log_actor_id_occurred_at_id', 'audit_log', ['actor_id', 'occurred_at', 'id'], unique=False)
+    op.create_index('ix_audit_log_target_occurred_at_id', 'audit_log', ['target_type', 'target_id', 'occurred_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_audit_log_target_occurred_at_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_actor_id_occurred_at_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_action_occurred_at_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_occurred_at_id', table_name='audit_log')
+    op.drop_table('audit_log')
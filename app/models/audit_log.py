@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from .user import Base
+
+class AuditLog(Base):
+    """
+    审计日志模型类
+    对应数据库中的 audit_log 表
+    只追加、不修改；所有索引以发生时间为前导（或紧随等值条件之后），
+    查询必须限定时间窗口，只扫描窗口内的索引区间，与表的总行数无关
+    """
+    __tablename__ = "audit_log"  # 数据库表名
+    __table_args__ = (
+        Index("ix_audit_log_occurred_at_id", "occurred_at", "id"),
+        Index("ix_audit_log_action_occurred_at_id", "action", "occurred_at", "id"),
+        Index("ix_audit_log_actor_id_occurred_at_id", "actor_id", "occurred_at", "id"),
+        Index("ix_audit_log_target_occurred_at_id", "target_type", "target_id", "occurred_at", "id"),
+    )
+
+    # 主键ID，自动递增
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='自增主键')
+    
+    # 发生时间（UTC），由记录时的应用时间写入，不是写入数据库的时间
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment='发生时间')
+    
+    # 操作，例如 merchant.approve、store.review、user.login_failed
+    action = Column(String(50), nullable=False, comment='操作')
+    
+    # 操作人的用户ID和用户名；未登录的操作（注册、登录失败）为空
+    actor_id = Column(Integer, comment='操作人用户ID')
+    actor = Column(String(100), comment='操作人用户名')
+    
+    # 操作对象
+    target_type = Column(String(16), comment='对象类型：store/merchant/user')
+    target_id = Column(Integer, comment='对象ID')
+    
+    # 客户端地址
+    ip = Column(String(45), comment='客户端地址')
+    
+    # 操作详情（JSON），例如审核结果、驳回原因
+    detail = Column(Text, comment='操作详情JSON')
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from .user import Base
+
+class Job(Base):
+    """
+    后台任务模型类
+    对应数据库中的 job 表（事务发件箱）
+    任务与业务数据在同一事务中写入，提交后由进程内工作协程执行；执行成功后删除
+    """
+    __tablename__ = "job"  # 数据库表名
+    __table_args__ = (
+        # 工作协程按 (status, run_at) 取到期的待执行任务
+        Index("ix_job_status_run_at", "status", "run_at"),
+    )
+
+    # 主键ID，自动递增
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='自增主键')
+    
+    # 任务类型，对应 core.jobs.JOB_HANDLERS 中注册的处理函数
+    kind = Column(String(64), nullable=False, comment='任务类型')
+    
+    # 任务参数（JSON）
+    payload = Column(Text, nullable=False, comment='任务参数JSON')
+    
+    # 任务状态：pending-待执行，running-执行中，dead-重试耗尽
+    status = Column(String(16), nullable=False, default='pending', comment='pending/running/dead')
+    
+    # 已执行次数与最大执行次数
+    attempts = Column(Integer, nullable=False, default=0, comment='已执行次数')
+    max_attempts = Column(Integer, nullable=False, default=5, comment='最大执行次数')
+    
+    # 下次可执行的时间（UTC），失败后按退避时间推后
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment='下次可执行时间')
+    
+    # 执行中任务的所属进程与租约到期时间，进程退出后租约到期的任务重新排队
+    locked_by = Column(String(32), comment='执行该任务的进程标识')
+    locked_until = Column(DateTime, comment='租约到期时间')
+    
+    # 最近一次失败的错误信息
+    last_error = Column(Text, comment='最近一次失败的错误信息')
+    
+    # 创建时间
+    created_at = Column(DateTime, default=datetime.utcnow, comment='创建时间')
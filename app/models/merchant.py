@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey, Index, func
+from sqlalchemy.orm import relationship, synonym
 from .user import Base
 
 class Merchant(Base):
@@ -9,6 +9,10 @@ class Merchant(Base):
     包含商家的基本信息和经营信息
     """
     __tablename__ = "merchant"  # 数据库表名
+    __table_args__ = (
+        # 审核队列按状态筛选
+        Index("ix_merchant_status_id", "status", "id"),
+    )
 
     # 主键ID，自动递增
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -40,11 +44,24 @@ class Merchant(Base):
     # 是否营业中，布尔类型，默认值为True
     is_open = Column(Boolean, default=True)
     
+    # 社交偏好，枚举类型，默认值为'None'
+    social_preference = Column(Enum('Lively', 'Quiet', 'Balanced', 'None'), default='None')
+    
+    # 审核状态：pending 待审批，approved 通过，rejected 驳回
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    
+    # 驳回原因，可以为空，最大长度255
+    rejection_reason = Column(String(255))
+    
     # 创建时间，默认为当前时间戳
     created_at = Column(DateTime, default=func.current_timestamp())
     
     # 更新时间，默认为当前时间戳，在记录更新时自动更新
     updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
     
+    # 与接口字段名保持一致的别名
+    phone = synonym("contact_phone")
+    business_license = synonym("license_number")
+    
     # 建立与用户表的关系
     user = relationship("User", backref="merchant") 
\ No newline at end of file
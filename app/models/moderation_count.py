@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String
+from .user import Base
+
+class ModerationCount(Base):
+    """
+    审核状态计数模型类
+    对应数据库中的 moderation_count 表
+    按 (对象类型, 分类, 状态) 保存门店和商家的数量，随业务写入在同一事务中增量更新，
+    管理后台直接读取，不再对 store、merchant 表做 GROUP BY
+    """
+    __tablename__ = "moderation_count"  # 数据库表名
+
+    # 对象类型：store 或 merchant
+    entity = Column(String(16), primary_key=True, comment='对象类型：store/merchant')
+    
+    # 分类：门店为 store_type，商家为空字符串
+    category = Column(String(50), primary_key=True, comment='门店类型，商家为空字符串')
+    
+    # 审核状态：pending/approved/rejected
+    status = Column(String(20), primary_key=True, comment='审核状态')
+    
+    # 数量
+    count = Column(Integer, nullable=False, default=0, comment='数量')
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, Float, String, DateTime, ForeignKey, Index
+from datetime import datetime
 from .user import Base
 
 class Store(Base):
@@ -8,6 +9,15 @@ class Store(Base):
     包含门店的基本信息和经营信息
     """
     __tablename__ = "store"  # 数据库表名
+    __table_args__ = (
+        # 列表按 (created_at, id) 做游标分页，以下组合索引覆盖各筛选条件
+        Index("ix_store_created_at_id", "created_at", "id"),
+        Index("ix_store_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_store_is_pass_created_at_id", "is_pass", "created_at", "id"),
+        Index("ix_store_type_created_at_id", "store_type", "created_at", "id"),
+        # 附近门店按网格单元范围扫描，索引带上经纬度，候选点无需回表
+        Index("ix_store_geo_cell", "geo_cell", "latitude", "longitude"),
+    )
 
     # 主键ID，自动递增
     id = Column(Integer, primary_key=True, autoincrement=True, comment='自增主键，用于唯一标识每个门店')
@@ -27,11 +37,22 @@ class Store(Base):
     # 门店照片的存储路径或URL，可以为空，最大长度255
     store_photo = Column(String(255), comment='门店照片的存储路径或URL')
     
-    # 门店归属人账户标识，不能为空，最大长度100
+    # 门店归属人的用户ID，归属判断和按归属人查询都使用该列；
+    # 迁移前创建、用户名已找不到对应用户的历史门店为空
+    owner_id = Column(Integer, ForeignKey('user.id', name='fk_store_owner_id_user'), comment='门店归属人用户ID')
+    
+    # 门店归属人用户名，创建门店时写入，仅用于展示
     owner_account = Column(String(100), nullable=False, comment='门店归属人账户标识')
     
-    # 创建时间，默认为当前时间戳
-    created_at = Column(DateTime, default=func.current_timestamp(), comment='创建时间，自动记录')
+    # 创建时间，由应用写入 UTC 时间（含微秒），与游标分页的绑定参数格式一致
+    created_at = Column(DateTime, default=datetime.utcnow, comment='创建时间，自动记录')
     
     # 审核状态，初始值0，通过1，驳回2
-    is_pass = Column(Integer, default=0, comment='初始值0 通过1 驳回2') 
\ No newline at end of file
+    is_pass = Column(Integer, default=0, comment='初始值0 通过1 驳回2')
+    
+    # 纬度、经度（WGS84），由后台地理编码任务或离线脚本填写，未编码时为空
+    latitude = Column(Float, comment='纬度')
+    longitude = Column(Float, comment='经度')
+    
+    # 经纬度所在的网格单元编号，用于附近门店查询的候选裁剪
+    geo_cell = Column(BigInteger, comment='网格单元编号')
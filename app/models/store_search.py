@@ -0,0 +1,88 @@
+"""
+门店全文检索索引
+
+SQLite 使用 FTS5 虚拟表 store_fts（trigram 分词，支持中文地址片段），
+rowid 与 store.id 一致，由触发器在门店/商家写入时同步维护。
+MySQL 使用 store 与 merchant 上的 FULLTEXT 索引（ngram 分词），由数据库自动维护。
+
+门店与商家的关联：store.owner_id = merchant.user_id。
+以下 DDL 挂在建表事件上，create_all 建库时一并创建；已有数据库通过迁移 0004 创建，迁移 0006 改为按 owner_id 关联。
+"""
+from sqlalchemy import DDL, event
+
+from .merchant import Merchant
+from .store import Store
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS store_fts USING fts5(
+        store_address, store_type, merchant_name, merchant_description,
+        tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ai AFTER INSERT ON store BEGIN
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN merchant m ON m.user_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_au
+    AFTER UPDATE OF store_address, store_type, owner_id ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+        INSERT INTO store_fts (rowid, store_address, store_type, merchant_name, merchant_description)
+        SELECT new.id, new.store_address, new.store_type, m.name, m.description
+        FROM (SELECT 1) LEFT JOIN merchant m ON m.user_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS store_fts_ad AFTER DELETE ON store BEGIN
+        DELETE FROM store_fts WHERE rowid = old.id;
+    END
+    """,
+    # 商家名称/描述变化时，刷新该商家所有门店的索引行
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ai AFTER INSERT ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_au
+    AFTER UPDATE OF name, description, user_id ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = old.user_id
+        );
+        UPDATE store_fts SET merchant_name = new.name, merchant_description = new.description
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = new.user_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS merchant_fts_ad AFTER DELETE ON merchant BEGIN
+        UPDATE store_fts SET merchant_name = NULL, merchant_description = NULL
+        WHERE rowid IN (
+            SELECT id FROM store WHERE owner_id = old.user_id
+        );
+    END
+    """,
+]
+
+MYSQL_DDL = [
+    "ALTER TABLE store ADD FULLTEXT INDEX ft_store_address_type (store_address, store_type) WITH PARSER ngram",
+    "ALTER TABLE merchant ADD FULLTEXT INDEX ft_merchant_name_description (name, description) WITH PARSER ngram",
+]
+
+
+# FTS 表和门店触发器随 store 表创建，商家触发器随 merchant 表创建
+for _statement in SQLITE_DDL[:4]:
+    event.listen(Store.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in SQLITE_DDL[4:]:
+    event.listen(Merchant.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Store.__table__, "after_create", DDL(MYSQL_DDL[0]).execute_if(dialect="mysql"))
+event.listen(Merchant.__table__, "after_create", DDL(MYSQL_DDL[1]).execute_if(dialect="mysql"))
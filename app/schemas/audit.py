@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class AuditEntry(BaseModel):
+    """审计日志记录"""
+    id: int
+    occurred_at: datetime = Field(..., description="发生时间（UTC）")
+    action: str = Field(..., description="操作，例如 merchant.approve、store.review、user.login_failed")
+    actor_id: Optional[int] = Field(None, description="操作人用户ID，未登录的操作为空")
+    actor: Optional[str] = Field(None, description="操作人用户名")
+    target_type: Optional[str] = Field(None, description="对象类型：store、merchant 或 user")
+    target_id: Optional[int] = Field(None, description="对象ID")
+    ip: Optional[str] = Field(None, description="客户端地址")
+    detail: Optional[str] = Field(None, description="操作详情JSON")
+
+    class Config:
+        from_attributes = True
+
+class AuditPage(BaseModel):
+    """审计日志分页结果"""
+    items: List[AuditEntry]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from enum import Enum
 
 class SocialPreference(str, Enum):
@@ -50,4 +50,29 @@ class RegisterRequest(BaseModel):
     account: str          # 登录账号
     password: str         # 登录密码
     phone_number: Optional[str] = None           # 电话号码，可选
-    social_preference: Optional[SocialPreference] = None  # 社交偏好，可选 
\ No newline at end of file
+    social_preference: Optional[SocialPreference] = None  # 社交偏好，可选
+
+class UserProvisionRequest(BaseModel):
+    """
+    批量创建用户请求
+    用于从其他系统迁移已有用户，每个用户的字段与注册接口相同
+    """
+    users: List[RegisterRequest] = Field(..., description="待创建的用户")
+
+class UserProvisionSkipped(BaseModel):
+    """
+    未创建的用户及原因
+    duplicate_username / duplicate_account：与已有用户重复
+    duplicate_in_request：与本次请求中前面的用户重复
+    conflict：与并发写入冲突，可以重试
+    busy：密码哈希工作池繁忙，未处理，可以重试
+    """
+    account: str
+    reason: str
+
+class UserProvisionResult(BaseModel):
+    """
+    批量创建用户结果
+    """
+    created: int                         # 创建的用户数
+    skipped: List[UserProvisionSkipped]  # 未创建的用户
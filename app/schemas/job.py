@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    """后台任务信息"""
+    id: int
+    kind: str = Field(..., description="任务类型")
+    payload: str = Field(..., description="任务参数JSON")
+    status: str = Field(..., description="pending-待执行，running-执行中，dead-重试耗尽")
+    attempts: int = Field(..., description="已执行次数")
+    max_attempts: int = Field(..., description="最大执行次数")
+    run_at: datetime = Field(..., description="下次可执行时间（UTC）")
+    last_error: Optional[str] = Field(None, description="最近一次失败的错误信息")
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobList(BaseModel):
+    """后台任务列表"""
+    items: List[JobResponse]
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class StoreReviewFilter(BaseModel):
+    """门店批量审核筛选条件，仅作用于待审核门店"""
+    store_type: Optional[str] = Field(None, max_length=50, description="门店类型")
+    owner_account: Optional[str] = Field(None, max_length=100, description="门店归属人")
+
+class StoreReviewRequest(BaseModel):
+    """门店批量审核请求，未提供 ids 时按 filter 选取待审核门店（filter 为空表示全部）"""
+    ids: Optional[List[int]] = Field(None, description="门店ID列表")
+    filter: Optional[StoreReviewFilter] = Field(None, description="按条件选取待审核门店")
+    is_pass: int = Field(..., ge=1, le=2, description="审核结果：1-通过，2-驳回")
+    limit: int = Field(500, ge=1, description="按条件审核时单批最多处理的条数")
+
+class MerchantReviewFilter(BaseModel):
+    """商家批量审批筛选条件，仅作用于待审批商家"""
+    name: Optional[str] = Field(None, max_length=100, description="商家名称")
+
+class MerchantReviewRequest(BaseModel):
+    """商家批量审批请求，未提供 ids 时按 filter 选取待审批商家（filter 为空表示全部）"""
+    ids: Optional[List[int]] = Field(None, description="商家ID列表")
+    filter: Optional[MerchantReviewFilter] = Field(None, description="按条件选取待审批商家")
+    approved: bool = Field(..., description="是否通过")
+    reason: Optional[str] = Field(None, max_length=255, description="驳回原因")
+    limit: int = Field(500, ge=1, description="按条件审批时单批最多处理的条数")
+
+class ReviewOutcome(BaseModel):
+    """单条记录的处理结果：updated 已更新，not_found 不存在，already_reviewed 已被处理"""
+    id: int
+    outcome: str
+
+class BatchReviewResult(BaseModel):
+    """批量审核结果"""
+    updated: int
+    results: List[ReviewOutcome]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class StoreBase(BaseModel):
@@ -15,17 +15,63 @@ class StoreCreate(StoreBase):
     pass
 
 class StoreUpdate(StoreBase):
-    """更新门店信息请求模型"""
+    """
+    更新门店信息请求模型（门店归属人）
+    审核状态只能由管理员通过批量审核接口修改，请求中出现未定义的字段（如 is_pass）时返回422
+    """
     store_type: Optional[str] = Field(None, max_length=50, description="门店类型，例如餐厅、零售店")
     store_address: Optional[str] = Field(None, max_length=255, description="门店详细地址")
-    is_pass: Optional[int] = Field(None, description="审核状态：0-待审核，1-通过，2-驳回")
+
+    class Config:
+        extra = "forbid"
 
 class StoreResponse(StoreBase):
     """门店信息响应模型"""
     id: int
+    owner_id: Optional[int] = Field(None, description="门店归属人用户ID")
     owner_account: str
     created_at: datetime
     is_pass: int
+    latitude: Optional[float] = Field(None, description="纬度，未完成地理编码时为空")
+    longitude: Optional[float] = Field(None, description="经度，未完成地理编码时为空")
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class StorePage(BaseModel):
+    """门店分页响应模型"""
+    items: List[StoreResponse]
+    next_cursor: Optional[str] = Field(None, description="下一页游标，没有更多数据时为空")
+
+
+class ImportRowError(BaseModel):
+    """导入失败的行"""
+    line: int = Field(..., description="行号（从1开始，CSV 包含表头行）")
+    error: str
+
+class StoreImportReport(BaseModel):
+    """门店批量导入结果"""
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = Field(False, description="失败行过多时只保留前若干条")
+
+class StoreSearchPage(BaseModel):
+    """门店搜索结果，按相关度排序"""
+    items: List[StoreResponse]
+    next_offset: Optional[int] = Field(None, description="下一页偏移量，没有更多结果时为空")
+
+class NearbyStore(StoreResponse):
+    """附近门店"""
+    distance: float = Field(..., description="与查询点的距离（米）")
+
+class NearbyStoreList(BaseModel):
+    """附近门店列表，按距离由近到远排序"""
+    items: List[NearbyStore]
+
+class StorePhoto(BaseModel):
+    """上传后的门店照片"""
+    digest: str = Field(..., description="照片内容的 SHA-256 摘要")
+    size: int = Field(..., description="原图字节数")
+    url: str = Field(..., description="原图地址，同时写入门店的 store_photo")
+    variants: Dict[str, str] = Field(default_factory=dict, description="缩略图和 WebP 版本地址")
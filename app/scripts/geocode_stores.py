@@ -0,0 +1,47 @@
+"""
+离线地理编码：为门店填写经纬度和网格单元
+
+运行方式（在 app 目录下）：
+    python -m scripts.geocode_stores
+    python -m scripts.geocode_stores --all --geocoder local
+    python -m scripts.geocode_stores --recompute-cells
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from core.database import AsyncSessionLocal, async_engine
+from services.geocoding import GEOCODERS, create_geocoder, geocode_stores, recompute_cells
+
+
+async def run(args) -> int:
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            if args.recompute_cells:
+                updated = await recompute_cells(db, args.batch_size)
+                print(f"重算网格单元 {updated} 条，耗时 {time.perf_counter() - started:.2f}s")
+                return 0
+            geocoded, unresolved = await geocode_stores(
+                db, create_geocoder(args.geocoder), args.batch_size, regeocode=args.all
+            )
+    finally:
+        # aiosqlite 的连接在独立线程中运行，不释放连接池进程无法退出
+        await async_engine.dispose()
+    print(f"编码 {geocoded} 条，无法编码 {unresolved} 条，耗时 {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="门店离线地理编码")
+    parser.add_argument("--geocoder", choices=sorted(GEOCODERS), help="地理编码后端，默认取 GEOCODER_BACKEND")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批处理的门店数")
+    parser.add_argument("--all", action="store_true", help="重新编码全部门店，包括已有坐标的门店")
+    parser.add_argument("--recompute-cells", action="store_true", help="只按当前网格大小重算网格单元")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
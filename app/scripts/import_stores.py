@@ -0,0 +1,72 @@
+"""
+从 NDJSON 或 CSV 文件批量导入门店
+
+运行方式（在 app 目录下）：
+    python -m scripts.import_stores stores.ndjson --owner 用户名
+    python -m scripts.import_stores stores.csv --owner 用户名 --batch-size 2000
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+
+from core.database import AsyncSessionLocal, async_engine
+from models.user import User
+from services.store_import import IMPORT_FORMATS, import_stores
+
+
+async def read_lines(path: str):
+    """逐行读取文件"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+async def run(args) -> int:
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(User.id).where(User.username == args.owner))
+            user_id = result.scalar()
+            if user_id is None:
+                print(f"用户不存在: {args.owner}", file=sys.stderr)
+                return 1
+
+            started = time.perf_counter()
+            report = await import_stores(
+                db,
+                user_id,
+                args.owner,
+                read_lines(args.path),
+                fmt=fmt,
+                batch_size=args.batch_size,
+                chunk_rows=args.chunk_rows,
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        # aiosqlite 的连接在独立线程中运行，不释放连接池进程无法退出
+        await async_engine.dispose()
+
+    print(f"导入 {report.inserted} 条，失败 {report.failed} 条，耗时 {elapsed:.2f}s")
+    for error in report.errors:
+        print(f"  第 {error.line} 行: {error.error}")
+    if report.errors_truncated:
+        print(f"  （仅显示前 {len(report.errors)} 条错误）")
+    return 0 if report.failed == 0 else 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导入门店")
+    parser.add_argument("path", help="NDJSON 或 CSV 文件路径")
+    parser.add_argument("--owner", required=True, help="门店归属人用户名")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="文件格式，默认按扩展名判断")
+    parser.add_argument("--batch-size", type=int, help="单次批量插入的行数")
+    parser.add_argument("--chunk-rows", type=int, help="单个事务提交的行数")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
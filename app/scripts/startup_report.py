@@ -0,0 +1,95 @@
+"""
+启动耗时报告：在新进程中导入 main 并创建应用，统计各阶段耗时和最慢的导入模块
+
+用 python -X importtime 记录每个模块的导入耗时，按累计耗时列出最慢的模块；
+超过预算时以退出码 1 结束，可在 CI 中限制 worker 冷启动时间。
+
+运行方式（在 app 目录下）：
+    python -m scripts.startup_report
+    python -m scripts.startup_report --top 30 --runs 5 --budget-ms 800
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+from core.config import settings
+
+# 子进程中导入 main，并输出 core.startup 记录的各阶段耗时
+PROBE = (
+    "import json, main; from core.startup import startup_timer; "
+    "print(json.dumps(startup_timer.report()))"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        List[Tuple[str, int, int, int]]: (模块名, 嵌套层级, 自身耗时us, 累计耗时us)
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        level = (len(name) - len(stripped)) // 2
+        modules.append((stripped, level, int(parts[0]), int(parts[1])))
+    return modules
+
+
+def probe(python: str) -> Tuple[dict, List[Tuple[str, int, int, int]]]:
+    """在新进程中导入一次 main，返回阶段耗时和导入明细"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", PROBE],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError("导入 main 失败：\n" + result.stderr[-2000:])
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="应用启动耗时报告")
+    parser.add_argument("--runs", type=int, default=3, help="重复次数，取导入总耗时最短的一次")
+    parser.add_argument("--top", type=int, default=20, help="列出累计耗时最长的模块数")
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_BUDGET_MS,
+                        help="导入加创建应用的耗时预算，0 表示不检查，默认取 STARTUP_BUDGET_MS")
+    parser.add_argument("--python", default=sys.executable, help="运行应用的解释器")
+    args = parser.parse_args()
+
+    runs = [probe(args.python) for _ in range(max(args.runs, 1))]
+    report, modules = min(runs, key=lambda run: run[0]["total_ms"])
+
+    for name, ms in report["phases_ms"].items():
+        print(f"{name:<12} {ms:>9.1f}ms")
+    print(f"{'total':<12} {report['total_ms']:>9.1f}ms  已加载模块 {report['modules_loaded']} 个")
+
+    # 顶层导入的累计耗时之和即 import 阶段中模块导入的总耗时
+    top_level = sum(cumulative for _, level, _, cumulative in modules if level == 0)
+    print(f"\n模块导入合计 {top_level / 1000:.1f}ms，累计耗时最长的 {args.top} 个模块：")
+    print(f"{'累计ms':>9} {'自身ms':>9}  模块")
+    for name, _, self_us, cumulative in sorted(modules, key=lambda m: -m[3])[:args.top]:
+        print(f"{cumulative / 1000:>9.1f} {self_us / 1000:>9.1f}  {name}")
+
+    # import 与 create_app 阶段（startup 阶段在服务启动时才有）
+    measured = sum(ms for name, ms in report["phases_ms"].items() if name != "startup")
+    if args.budget_ms and measured > args.budget_ms:
+        print(f"\n启动耗时 {measured:.1f}ms 超过预算 {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+本地只读副本：定期把主库 SQLite 文件复制为副本文件，用于在本地验证只读副本路由
+
+使用 SQLite 在线备份接口复制，得到的是某一时刻的一致快照，复制期间主库可以继续写入；
+两次复制之间副本落后于主库，可以观察读己之写和副本延迟的效果。
+
+运行方式（在 app 目录下）：
+    python -m scripts.sync_replica --replica ./replica.db --interval 2
+    DATABASE_REPLICA_URLS=sqlite:///./replica.db uvicorn main:app
+
+    python -m scripts.sync_replica --replica ./replica.db --once
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+from sqlalchemy.engine import make_url
+
+from core.config import settings
+
+
+def sqlite_path(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or not parsed.database:
+        raise ValueError(f"只支持 SQLite 文件数据库: {url}")
+    return parsed.database
+
+
+def sync(primary: str, replica: str, pages: int) -> float:
+    """复制一次，返回耗时（秒）"""
+    started = time.perf_counter()
+    source = sqlite3.connect(primary)
+    target = sqlite3.connect(replica, timeout=settings.SQLITE_BUSY_TIMEOUT / 1000)
+    try:
+        # 分段复制，每段之间让出锁，副本上的读请求不会被长时间阻塞
+        source.backup(target, pages=pages)
+    finally:
+        target.close()
+        source.close()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="定期复制 SQLite 主库为只读副本")
+    parser.add_argument("--primary", default=settings.DATABASE_URL, help="主库连接串，默认取 DATABASE_URL")
+    parser.add_argument("--replica", required=True, help="副本文件路径")
+    parser.add_argument("--interval", type=float, default=2, help="复制间隔（秒）")
+    parser.add_argument("--pages", type=int, default=1024, help="每段复制的页数")
+    parser.add_argument("--once", action="store_true", help="只复制一次")
+    args = parser.parse_args()
+
+    primary = sqlite_path(args.primary)
+    while True:
+        elapsed = sync(primary, args.replica, args.pages)
+        print(f"{time.strftime('%H:%M:%S')} 已同步 {primary} -> {args.replica}，耗时 {elapsed * 1000:.1f}ms", flush=True)
+        if args.once:
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
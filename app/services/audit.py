@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.pagination import encode_cursor, keyset_before
+from models.audit_log import AuditLog
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """带时区的时间转为不带时区的 UTC 时间，与写入时的 utcnow 一致"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def list_audit(
+    db: AsyncSession,
+    limit: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    actor_id: Optional[int] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[int] = None
+) -> Tuple[List[AuditLog], Optional[str]]:
+    """
+    按发生时间倒序分页查询审计日志（游标分页）
+
+    查询必须限定在一个时间窗口内（默认最近一天，最长 AUDIT_QUERY_MAX_DAYS 天），
+    各筛选条件都有以发生时间为范围列的组合索引，只扫描窗口内的索引区间，
+    查询耗时取决于窗口内的记录数，与审计日志的总行数无关。
+
+    Args:
+        db: 数据库会话
+        limit: 每页条数
+        since: 窗口开始时间（含），默认为 until 前一天
+        until: 窗口结束时间（不含），默认为当前时间
+        cursor: 上一页返回的游标，为空时从第一页开始
+        action: 按操作筛选
+        actor_id: 按操作人用户ID筛选
+        target_type: 按对象类型筛选
+        target_id: 按对象ID筛选，需同时指定 target_type
+
+    Returns:
+        Tuple[List[AuditLog], Optional[str]]: 审计日志和下一页游标（没有更多数据时为None）
+
+    Raises:
+        HTTPException: 时间窗口无效、超过最大跨度或只指定了 target_id 时抛出400
+    """
+    since, until = _utc(since), _utc(until)
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(days=1)
+    if since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since 必须早于 until"
+        )
+    if until - since > timedelta(days=settings.AUDIT_QUERY_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"查询的时间跨度不能超过 {settings.AUDIT_QUERY_MAX_DAYS} 天"
+        )
+    if target_id is not None and target_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="按对象ID查询时需同时指定 target_type"
+        )
+
+    query = select(AuditLog).where(AuditLog.occurred_at >= since, AuditLog.occurred_at < until)
+    if action is not None:
+        query = query.where(AuditLog.action == action)
+    if actor_id is not None:
+        query = query.where(AuditLog.actor_id == actor_id)
+    if target_type is not None:
+        query = query.where(AuditLog.target_type == target_type)
+    if target_id is not None:
+        query = query.where(AuditLog.target_id == target_id)
+    before = keyset_before(AuditLog.occurred_at, AuditLog.id, cursor)
+    if before is not None:
+        query = query.where(before)
+
+    # 多取一行用于判断是否还有下一页
+    query = query.order_by(AuditLog.occurred_at.desc(), AuditLog.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    entries = result.scalars().all()
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        next_cursor = encode_cursor(last.occurred_at, last.id)
+    return entries, next_cursor
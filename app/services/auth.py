@@ -4,9 +4,13 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
 from core.database import get_db
+from core.hash_pool import hash_pool, HashPoolBusy
+from core.metrics import timed
 from models.user import User
 from schemas.auth import UserRole
 
@@ -38,7 +42,38 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
-def authenticate_user(db: Session, account: str, password: str) -> Optional[User]:
+async def _run_in_hash_pool(fn, *args):
+    """
+    在哈希工作池中执行计算，排队已满时快速返回503
+    """
+    try:
+        with timed("password_hash"):
+            return await hash_pool.run(fn, *args)
+    except HashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry later",
+            headers={"Retry-After": str(settings.HASH_POOL_RETRY_AFTER)},
+        )
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    在工作池中验证密码，不阻塞事件循环
+    :param plain_password: 明文密码
+    :param hashed_password: 加密后的密码
+    :return: 密码是否匹配
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    在工作池中计算密码哈希，不阻塞事件循环
+    :param password: 明文密码
+    :return: 加密后的密码
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def authenticate_user(db: AsyncSession, account: str, password: str) -> Optional[User]:
     """
     验证用户
     :param db: 数据库会话
@@ -47,11 +82,12 @@ def authenticate_user(db: Session, account: str, password: str) -> Optional[User
     :return: 验证成功返回用户对象，失败返回None
     """
     # 根据账号查找用户
-    user = db.query(User).filter(User.account == account).first()
+    result = await db.execute(select(User).where(User.account == account))
+    user = result.scalars().first()
     if not user:
         return None
     # 验证密码
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         return None
     # 检查用户是否被禁用
     if user.is_disabled:
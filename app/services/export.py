@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from core.database import AsyncSessionLocal
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# 每次从游标取出并序列化的行数
+EXPORT_BATCH_SIZE = 1000
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+async def iter_table(table, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    按主键顺序流式导出整张表
+
+    使用 stream_results（MySQL 为服务端游标）配合 yield_per 分批取行，
+    每批序列化后立即输出，内存占用与表大小无关。
+    导出在独立的会话中进行，不依赖请求结束时会被关闭的 get_db 会话。
+    """
+    columns: Sequence = list(table.columns)
+    names = [column.name for column in columns]
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        yield buffer.getvalue()
+
+    query = (
+        select(*columns)
+        .order_by(*table.primary_key.columns)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions(batch_size):
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(names, row)), ensure_ascii=False, default=_json_default) + "\n"
+                    for row in rows
+                )
+
+
+def export_response(table, fmt: str, filename: str) -> StreamingResponse:
+    """
+    构造导出响应
+
+    Raises:
+        HTTPException: 格式不支持时抛出400
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的导出格式: {fmt}"
+        )
+    return StreamingResponse(
+        iter_table(table, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
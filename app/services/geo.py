@@ -0,0 +1,197 @@
+import heapq
+import math
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.store import Store
+
+# 地球平均半径（米）
+EARTH_RADIUS = 6371008.8
+# 每度纬度对应的距离（米）
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """首次计算距离时再导入 numpy（约 80ms），不拖慢应用启动；未安装时返回 None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _grid(cell_deg: Optional[float]) -> Tuple[float, int]:
+    cell_deg = cell_deg or settings.STORE_GEO_CELL_DEG
+    return cell_deg, math.ceil(360 / cell_deg)
+
+
+def cell_of(lat: float, lng: float, cell_deg: Optional[float] = None) -> int:
+    """
+    计算经纬度所在的网格单元编号
+
+    网格按纬度行、经度列划分，编号 = 行号 * 每行列数 + 列号，
+    同一行内相邻单元的编号连续，便于按范围扫描索引。
+    """
+    cell_deg, cols = _grid(cell_deg)
+    row = int((min(lat, 90.0) + 90) // cell_deg)
+    col = int((lng + 180) // cell_deg) % cols
+    return row * cols + col
+
+
+def cell_ranges(
+    lat: float,
+    lng: float,
+    radius: float,
+    cell_deg: Optional[float] = None
+) -> List[Tuple[int, int]]:
+    """
+    计算覆盖以 (lat, lng) 为中心、radius 米为半径的圆的网格单元编号区间
+
+    Returns:
+        List[Tuple[int, int]]: 闭区间列表，相邻区间已合并
+    """
+    cell_deg, cols = _grid(cell_deg)
+    dlat = math.degrees(radius / EARTH_RADIUS)
+    lat_min = max(lat - dlat, -90.0)
+    lat_max = min(lat + dlat, 90.0)
+    # 经度跨度取圆内纬度绝对值最大处，接近极点时覆盖整行
+    max_abs_lat = max(abs(lat_min), abs(lat_max))
+    if max_abs_lat >= 90.0:
+        dlng = 180.0
+    else:
+        dlng = math.degrees(radius / (EARTH_RADIUS * math.cos(math.radians(max_abs_lat))))
+
+    if dlng >= 180.0:
+        col_spans = [(0, cols - 1)]
+    else:
+        first = int((lng - dlng + 180) // cell_deg)
+        last = int((lng + dlng + 180) // cell_deg)
+        if last - first + 1 >= cols:
+            col_spans = [(0, cols - 1)]
+        elif first < 0:
+            col_spans = [(0, last), (first % cols, cols - 1)]
+        elif last >= cols:
+            col_spans = [(0, last % cols), (first, cols - 1)]
+        else:
+            col_spans = [(first, last)]
+
+    ranges: List[Tuple[int, int]] = []
+    for row in range(int((lat_min + 90) // cell_deg), int((lat_max + 90) // cell_deg) + 1):
+        for col_first, col_last in col_spans:
+            start, end = row * cols + col_first, row * cols + col_last
+            if ranges and ranges[-1][1] + 1 >= start:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+    return ranges
+
+
+def haversine(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]):
+    """
+    计算中心点到一组坐标的球面距离（米）
+
+    安装了 numpy 时整批向量化计算，否则逐个计算
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        lat1 = math.radians(lat)
+        lat2 = numpy.radians(numpy.asarray(lats, dtype=float))
+        dlat = lat2 - lat1
+        dlng = numpy.radians(numpy.asarray(lngs, dtype=float) - lng)
+        a = numpy.sin(dlat / 2) ** 2 + math.cos(lat1) * numpy.cos(lat2) * numpy.sin(dlng / 2) ** 2
+        return 2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+
+    lat1 = math.radians(lat)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for other_lat, other_lng in zip(lats, lngs):
+        lat2 = math.radians(other_lat)
+        a = (
+            math.sin((lat2 - lat1) / 2) ** 2
+            + cos_lat1 * math.cos(lat2) * math.sin(math.radians(other_lng - lng) / 2) ** 2
+        )
+        distances.append(2 * EARTH_RADIUS * math.asin(math.sqrt(min(a, 1.0))))
+    return distances
+
+
+def _nearest(ids, distances, radius: float, limit: int) -> List[Tuple[int, float]]:
+    """从候选中选出半径内最近的 limit 个，按距离升序"""
+    numpy = _numpy()
+    if numpy is not None:
+        ids = numpy.asarray(ids)
+        inside = numpy.flatnonzero(distances <= radius)
+        if len(inside) > limit:
+            inside = inside[numpy.argpartition(distances[inside], limit - 1)[:limit]]
+        inside = inside[numpy.argsort(distances[inside], kind="stable")]
+        return [(int(ids[i]), float(distances[i])) for i in inside]
+
+    inside = [(d, i) for i, d in zip(ids, distances) if d <= radius]
+    return [(i, d) for d, i in heapq.nsmallest(limit, inside)]
+
+
+async def nearby_stores(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    radius: float,
+    limit: int,
+    is_pass: Optional[int] = None
+) -> List[Tuple[Store, float]]:
+    """
+    查询半径范围内的门店，按距离由近到远排序
+
+    先按网格单元区间从 ix_store_geo_cell 索引取出候选点（只读索引中的经纬度），
+    再整批计算精确距离并取最近的 limit 个，最后只加载这些门店的完整记录。
+    候选范围从半个网格边长开始，结果不足时按 4 倍扩大直到 radius，
+    门店密集时只需扫描中心附近的少数网格。未完成地理编码的门店不会出现在结果中。
+
+    Args:
+        db: 数据库会话
+        lat: 中心点纬度
+        lng: 中心点经度
+        radius: 半径（米）
+        limit: 最多返回的门店数
+        is_pass: 按审核状态筛选
+
+    Returns:
+        List[Tuple[Store, float]]: 门店及其距离（米）
+
+    Raises:
+        HTTPException: 半径超过上限时抛出400
+    """
+    if radius > settings.STORE_NEARBY_MAX_RADIUS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"查询半径不能超过 {settings.STORE_NEARBY_MAX_RADIUS} 米"
+        )
+
+    # 从半个网格边长的半径开始逐步扩大，半径内已有 limit 个门店时更远的门店不可能入选
+    search_radius = min(radius, settings.STORE_GEO_CELL_DEG * METERS_PER_DEGREE / 2)
+    while True:
+        query = select(Store.id, Store.latitude, Store.longitude).where(or_(*(
+            Store.geo_cell.between(start, end)
+            for start, end in cell_ranges(lat, lng, search_radius)
+        )))
+        if is_pass is not None:
+            query = query.where(Store.is_pass == is_pass)
+        result = await db.execute(query)
+        candidates = result.all()
+        nearest = []
+        if candidates:
+            ids, lats, lngs = zip(*candidates)
+            nearest = _nearest(ids, haversine(lat, lng, lats, lngs), search_radius, limit)
+        if len(nearest) >= limit or search_radius >= radius:
+            break
+        search_radius = min(radius, search_radius * 4)
+    if not nearest:
+        return []
+
+    result = await db.execute(select(Store).where(Store.id.in_([i for i, _ in nearest])))
+    stores = {store.id: store for store in result.scalars()}
+    return [(stores[i], distance) for i, distance in nearest if i in stores]
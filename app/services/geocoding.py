@@ -0,0 +1,218 @@
+import csv
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.jobs import job_handler
+from models.store import Store
+from services.geo import cell_of
+
+# 内置的城市中心点，未配置地名表时作为本地替代数据
+DEFAULT_GAZETTEER = {
+    "北京市": (39.9042, 116.4074),
+    "上海市": (31.2304, 121.4737),
+    "广州市": (23.1291, 113.2644),
+    "深圳市": (22.5431, 114.0579),
+    "杭州市": (30.2741, 120.1551),
+    "成都市": (30.5728, 104.0668),
+    "武汉市": (30.5928, 114.3055),
+    "南京市": (32.0603, 118.7969),
+    "天津市": (39.3434, 117.3616),
+    "重庆市": (29.5630, 106.5516),
+    "西安市": (34.3416, 108.9398),
+    "苏州市": (31.2990, 120.5853),
+}
+
+
+class Geocoder(ABC):
+    """
+    地理编码接口：地址 -> (纬度, 经度)
+    默认实现为本地地名表；接入在线服务时实现 geocode 并注册到 GEOCODERS
+    """
+
+    @abstractmethod
+    def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        """返回地址的 (纬度, 经度)，无法编码时返回 None"""
+
+
+class LocalGeocoder(Geocoder):
+    """按地名表匹配地址中出现的最长地名，不访问外部服务"""
+
+    def __init__(self, gazetteer: Dict[str, Tuple[float, float]]):
+        # 先尝试较长（更精确）的地名，例如"北京市朝阳区"优先于"北京市"
+        self._names = sorted(gazetteer, key=len, reverse=True)
+        self._gazetteer = gazetteer
+
+    @classmethod
+    def from_csv(cls, path: str) -> "LocalGeocoder":
+        """从 CSV 地名表加载，每行为：名称,纬度,经度"""
+        gazetteer = {}
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for row in csv.reader(f):
+                if len(row) < 3 or not row[0].strip():
+                    continue
+                try:
+                    gazetteer[row[0].strip()] = (float(row[1]), float(row[2]))
+                except ValueError:
+                    # 跳过表头或无法解析的行
+                    continue
+        return cls(gazetteer)
+
+    def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        for name in self._names:
+            if name in address:
+                return self._gazetteer[name]
+        return None
+
+
+def _local_geocoder() -> Geocoder:
+    if settings.GEOCODER_GAZETTEER:
+        return LocalGeocoder.from_csv(settings.GEOCODER_GAZETTEER)
+    return LocalGeocoder(DEFAULT_GAZETTEER)
+
+
+GEOCODERS: Dict[str, Callable[[], Geocoder]] = {
+    "local": _local_geocoder,
+}
+
+
+def create_geocoder(name: Optional[str] = None) -> Geocoder:
+    """按名称创建地理编码器，默认取 Settings.GEOCODER_BACKEND"""
+    name = name or settings.GEOCODER_BACKEND
+    if name not in GEOCODERS:
+        raise ValueError(f"不支持的地理编码后端: {name}")
+    return GEOCODERS[name]()
+
+
+# 按主键批量更新经纬度和网格单元
+_UPDATE_LOCATION = (
+    update(Store.__table__)
+    .where(Store.__table__.c.id == bindparam("store_id"))
+    .values(
+        latitude=bindparam("lat"),
+        longitude=bindparam("lng"),
+        geo_cell=bindparam("cell"),
+    )
+)
+
+
+async def _apply(db: AsyncSession, rows: List[dict]):
+    if rows:
+        await db.execute(_UPDATE_LOCATION, rows)
+
+
+async def geocode_stores(
+    db: AsyncSession,
+    geocoder: Geocoder,
+    batch_size: int = 1000,
+    regeocode: bool = False
+) -> Tuple[int, int]:
+    """
+    为未编码的门店填写经纬度和网格单元，按主键分批处理，每批提交一次
+
+    Args:
+        db: 数据库会话
+        geocoder: 地理编码器
+        batch_size: 每批处理的门店数
+        regeocode: 为 True 时重新编码全部门店
+
+    Returns:
+        Tuple[int, int]: 编码成功数和无法编码数
+    """
+    geocoded = 0
+    unresolved = 0
+    last_id = 0
+    while True:
+        query = select(Store.id, Store.store_address).where(Store.id > last_id)
+        if not regeocode:
+            query = query.where(Store.latitude.is_(None))
+        result = await db.execute(query.order_by(Store.id).limit(batch_size))
+        batch = result.all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        rows = []
+        for store_id, address in batch:
+            location = geocoder.geocode(address)
+            if location is None:
+                unresolved += 1
+                continue
+            lat, lng = location
+            rows.append({"store_id": store_id, "lat": lat, "lng": lng, "cell": cell_of(lat, lng)})
+        await _apply(db, rows)
+        await db.commit()
+        geocoded += len(rows)
+    return geocoded, unresolved
+
+
+async def recompute_cells(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    按当前 STORE_GEO_CELL_DEG 重算已编码门店的网格单元（修改网格大小后执行）
+
+    Returns:
+        int: 更新的门店数
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Store.id, Store.latitude, Store.longitude)
+            .where(Store.id > last_id, Store.latitude.is_not(None))
+            .order_by(Store.id)
+            .limit(batch_size)
+        )
+        batch = result.all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        await _apply(db, [
+            {"store_id": store_id, "lat": lat, "lng": lng, "cell": cell_of(lat, lng)}
+            for store_id, lat, lng in batch
+        ])
+        await db.commit()
+        updated += len(batch)
+    return updated
+
+
+# 门店创建或地址变更后写入的后台任务类型
+GEOCODE_STORE_JOB = "geocode_store"
+
+
+@lru_cache(maxsize=None)
+def _job_geocoder() -> Geocoder:
+    return create_geocoder()
+
+
+@job_handler(GEOCODE_STORE_JOB)
+async def geocode_store_job(payload: dict):
+    """
+    为单个门店填写经纬度和网格单元
+
+    只在门店地址仍为任务写入时的地址时更新，地址再次变更后由新的任务处理；重复执行结果相同。
+
+    Args:
+        payload: {"store_id": 门店ID, "address": 写入任务时的地址}
+    """
+    location = _job_geocoder().geocode(payload["address"])
+    if location is None:
+        return
+    lat, lng = location
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Store.__table__)
+            .where(
+                Store.__table__.c.id == payload["store_id"],
+                Store.__table__.c.store_address == payload["address"],
+            )
+            .values(latitude=lat, longitude=lng, geo_cell=cell_of(lat, lng))
+        )
+        await db.commit()
+    # services.store 引用本模块的任务类型，在此处导入以避免循环导入
+    from services.store import store_cache
+    store_cache.invalidate(payload["store_id"])
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.jobs import job_queue
+from models.job import Job
+
+
+async def list_jobs(db: AsyncSession, job_status: Optional[str] = "dead", limit: int = 100) -> List[Job]:
+    """
+    按状态列出后台任务，默认列出死信
+
+    Args:
+        db: 数据库会话
+        job_status: 任务状态，为空时不筛选
+        limit: 最多返回的条数
+
+    Returns:
+        List[Job]: 任务列表，按ID倒序
+    """
+    query = select(Job)
+    if job_status is not None:
+        query = query.where(Job.status == job_status)
+    result = await db.execute(query.order_by(Job.id.desc()).limit(limit))
+    return result.scalars().all()
+
+
+async def retry_job(db: AsyncSession, job_id: int) -> Job:
+    """
+    将死信任务重新排队，执行次数清零
+
+    Args:
+        db: 数据库会话
+        job_id: 任务ID
+
+    Returns:
+        Job: 重新排队的任务
+
+    Raises:
+        HTTPException: 任务不存在时抛出404，不是死信时抛出400
+    """
+    job = await db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="任务不存在"
+        )
+    if job.status != "dead":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="只能重新执行死信任务"
+        )
+    job.status = "pending"
+    job.attempts = 0
+    job.run_at = datetime.utcnow()
+    await db.commit()
+    job_queue.wake()
+    return job
@@ -1,12 +1,25 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from fastapi import HTTPException, status
+from core.config import settings
 from models.merchant import Merchant
 from models.user import User
 from schemas.merchant import MerchantCreate, MerchantUpdate, MerchantApproval
+from schemas.moderation import MerchantReviewRequest, BatchReviewResult
+from services.moderation import apply_review, check_batch_ids
+from core.audit import audit_log
+from core.cache import ReadThroughCache
+from core.events import event_broker
+from core.principal_cache import Principal
+from services.moderation_stats import adjust, merchant_key, transition
+
+# 商家详情读缓存，键为商家ID
+merchant_cache = ReadThroughCache("merchant")
 
 class MerchantService:
     @staticmethod
-    async def create_merchant(db: Session, user_id: int, merchant_data: MerchantCreate) -> Merchant:
+    async def create_merchant(db: AsyncSession, user_id: int, merchant_data: MerchantCreate) -> Merchant:
         """
         创建商家信息
         
@@ -22,7 +35,7 @@ class MerchantService:
             HTTPException: 当用户不存在或已经是商家时抛出异常
         """
         # 检查用户是否存在
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -30,7 +43,8 @@ class MerchantService:
             )
             
         # 检查用户是否已经是商家
-        existing_merchant = db.query(Merchant).filter(Merchant.user_id == user_id).first()
+        result = await db.execute(select(Merchant).where(Merchant.user_id == user_id))
+        existing_merchant = result.scalars().first()
         if existing_merchant:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,13 +59,14 @@ class MerchantService:
         )
         
         db.add(merchant)
-        db.commit()
-        db.refresh(merchant)
+        await adjust(db, {merchant_key(merchant.status): 1})
+        await db.commit()
+        await db.refresh(merchant)
         
         return merchant
         
     @staticmethod
-    async def get_merchant(db: Session, merchant_id: int) -> Merchant:
+    async def get_merchant(db: AsyncSession, merchant_id: int) -> Merchant:
         """
         获取商家信息
         
@@ -65,7 +80,7 @@ class MerchantService:
         Raises:
             HTTPException: 当商家不存在时抛出异常
         """
-        merchant = db.query(Merchant).filter(Merchant.id == merchant_id).first()
+        merchant = await db.get(Merchant, merchant_id)
         if not merchant:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -75,7 +90,7 @@ class MerchantService:
         
     @staticmethod
     async def update_merchant(
-        db: Session,
+        db: AsyncSession,
         merchant_id: int,
         merchant_data: MerchantUpdate
     ) -> Merchant:
@@ -99,16 +114,18 @@ class MerchantService:
         for field, value in merchant_data.model_dump(exclude_unset=True).items():
             setattr(merchant, field, value)
             
-        db.commit()
-        db.refresh(merchant)
+        await db.commit()
+        await db.refresh(merchant)
+        merchant_cache.invalidate(merchant_id)
         
         return merchant
 
     @staticmethod
     async def approve_merchant(
-        db: Session,
+        db: AsyncSession,
         merchant_id: int,
-        approval_data: MerchantApproval
+        approval_data: MerchantApproval,
+        actor: Optional[Principal] = None
     ) -> Merchant:
         """
         审批商家申请
@@ -117,6 +134,7 @@ class MerchantService:
             db: 数据库会话
             merchant_id: 商家ID
             approval_data: 审批信息
+            actor: 审批人，记入审计日志
             
         Returns:
             Merchant: 更新后的商家信息
@@ -126,19 +144,99 @@ class MerchantService:
         """
         merchant = await MerchantService.get_merchant(db, merchant_id)
         
-        # 检查商家状态是否为待审批
-        if merchant.status != "pending":
+        # 带状态条件的更新：并发审批同一商家时只有一方能更新成功，计数、推送和审计只执行一次
+        values = {"status": "approved" if approval_data.approved else "rejected"}
+        if approval_data.reason:
+            values["rejection_reason"] = approval_data.reason
+        result = await db.execute(
+            update(Merchant)
+            .where(Merchant.id == merchant_id, Merchant.status == "pending")
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="该商家申请已经被处理"
             )
+        await adjust(db, transition(merchant_key("pending"), merchant_key(values["status"])))
+            
+        await db.commit()
+        await db.refresh(merchant)
+        merchant_cache.invalidate(merchant_id)
+        event_broker.publish(merchant.user_id, "merchant_status", {
+            "merchant_id": merchant_id,
+            "status": merchant.status,
+            "rejection_reason": merchant.rejection_reason,
+        })
+        audit_log.record(
+            "merchant.approve" if approval_data.approved else "merchant.reject",
+            actor, "merchant", merchant_id, {"reason": approval_data.reason}
+        )
         
-        # 更新商家状态
-        merchant.status = "approved" if approval_data.approved else "rejected"
-        if approval_data.reason:
-            merchant.rejection_reason = approval_data.reason
+        return merchant
+
+    @staticmethod
+    async def review_merchants(
+        db: AsyncSession,
+        review: MerchantReviewRequest,
+        actor: Optional[Principal] = None
+    ) -> BatchReviewResult:
+        """
+        批量审批商家申请（pending -> approved/rejected）
+        
+        Args:
+            db: 数据库会话
+            review: 批量审批请求，指定ID列表或筛选条件
+            actor: 审批人，记入审计日志
             
-        db.commit()
-        db.refresh(merchant)
+        Returns:
+            BatchReviewResult: 更新条数和每个商家的处理结果
+        """
+        if review.ids is not None:
+            ids = review.ids
+        else:
+            # 按条件选取待审批商家，先到先审
+            query = select(Merchant.id).where(Merchant.status == "pending")
+            if review.filter is not None and review.filter.name is not None:
+                query = query.where(Merchant.name == review.filter.name)
+            query = query.order_by(Merchant.id).limit(min(review.limit, settings.MODERATION_BATCH_MAX))
+            result = await db.execute(query)
+            ids = result.scalars().all()
+            if not ids:
+                return BatchReviewResult(updated=0, results=[])
+        
+        values = {"status": "approved" if review.approved else "rejected"}
+        if review.reason:
+            values["rejection_reason"] = review.reason
+        async def count_reviewed(updated_ids):
+            # updated_ids 是本次实际更新的商家，并发审批时不会重复计数
+            await adjust(db, transition(
+                merchant_key("pending"), merchant_key(values["status"]), len(updated_ids)
+            ))
         
-        return merchant 
\ No newline at end of file
+        result = await apply_review(
+            db, Merchant, Merchant.status, "pending", check_batch_ids(ids), values,
+            before_commit=count_reviewed
+        )
+        updated_ids = [item.id for item in result.results if item.outcome == "updated"]
+        for merchant_id in updated_ids:
+            merchant_cache.invalidate(merchant_id)
+        if updated_ids:
+            # 按申请人推送审批结果
+            owners = await db.execute(
+                select(Merchant.id, Merchant.user_id, Merchant.rejection_reason)
+                .where(Merchant.id.in_(updated_ids))
+            )
+            for merchant_id, user_id, reason in owners.all():
+                event_broker.publish(user_id, "merchant_status", {
+                    "merchant_id": merchant_id,
+                    "status": values["status"],
+                    "rejection_reason": reason,
+                })
+        # 每个被审批的商家一条审计记录，按对象查询时可以查到批量操作
+        action = "merchant.approve" if review.approved else "merchant.reject"
+        for merchant_id in updated_ids:
+            audit_log.record(action, actor, "merchant", merchant_id, {"reason": review.reason, "batch": True})
+        return result
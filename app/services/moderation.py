@@ -0,0 +1,111 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import false, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from schemas.moderation import BatchReviewResult, ReviewOutcome
+
+
+def check_batch_ids(ids: List[int]) -> List[int]:
+    """
+    去重并校验批量审核的ID数量
+
+    Raises:
+        HTTPException: ID列表为空或超出单批上限时抛出400
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请提供需要审核的ID列表或筛选条件"
+        )
+    if len(ids) > settings.MODERATION_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"单批最多审核 {settings.MODERATION_BATCH_MAX} 条"
+        )
+    return ids
+
+
+async def _select_for_review(db: AsyncSession, model, status_column, ids: List[int]) -> Dict[int, object]:
+    """
+    在当前事务中锁定目标行并读取审核状态
+
+    SQLite 不支持 SELECT ... FOR UPDATE，且 SELECT 不会开启事务；
+    先执行一条不修改数据的 UPDATE 取得数据库写锁，之后的读取和更新之间不会有其他写入。
+    """
+    query = select(model.id, status_column).where(model.id.in_(ids))
+    if db.bind.dialect.name == "sqlite":
+        await db.execute(
+            update(model)
+            .where(false())
+            .values({status_column: status_column})
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        query = query.with_for_update()
+    result = await db.execute(query)
+    return dict(result.all())
+
+
+async def apply_review(
+    db: AsyncSession,
+    model,
+    status_column,
+    pending_value,
+    ids: List[int],
+    values: Dict,
+    before_commit: Optional[Callable[[List[int]], Awaitable[None]]] = None
+) -> BatchReviewResult:
+    """
+    以一条 UPDATE ... WHERE status = pending 批量更新审核状态
+
+    先锁定并读取目标行的当前状态以区分不存在和已处理的记录，
+    再对仍处于待审核状态的行执行一次集合更新，并在同一事务中重新读取实际被更新的行。
+    处理结果、before_commit 以及调用方的缓存失效、事件推送和审计记录都只依据实际被更新的行，
+    并发审核同一批记录时，后提交的一方不会重复处理。
+
+    Args:
+        db: 数据库会话
+        model: 模型类
+        status_column: 审核状态列
+        pending_value: 待审核状态的取值
+        ids: 目标记录ID
+        values: 需要写入的字段，必须包含审核状态列
+        before_commit: 有记录被更新时，在同一事务提交前以实际更新的ID列表调用，用于维护计数等派生数据
+
+    Returns:
+        BatchReviewResult: 更新条数和每条记录的处理结果
+    """
+    current = await _select_for_review(db, model, status_column, ids)
+    pending_ids = [i for i in ids if i in current and current[i] == pending_value]
+
+    changed = set()
+    if pending_ids:
+        await db.execute(
+            update(model)
+            .where(model.id.in_(pending_ids), status_column == pending_value)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        # 目标行已被本事务锁定，状态等于新值的行就是本次更新的行
+        result = await db.execute(
+            select(model.id).where(model.id.in_(pending_ids), status_column == values[status_column.key])
+        )
+        changed = set(result.scalars().all())
+        if changed and before_commit is not None:
+            await before_commit([i for i in pending_ids if i in changed])
+    await db.commit()
+
+    outcomes = []
+    for i in ids:
+        if i not in current:
+            outcome = "not_found"
+        elif i not in changed:
+            outcome = "already_reviewed"
+        else:
+            outcome = "updated"
+        outcomes.append(ReviewOutcome(id=i, outcome=outcome))
+    return BatchReviewResult(updated=len(changed), results=outcomes)
@@ -0,0 +1,216 @@
+"""
+审核状态计数
+
+moderation_count 表按 (对象类型, 分类, 状态) 保存门店和商家的数量。
+创建、修改、审核门店和商家时调用 adjust，在业务写入的同一事务中累加变化量，
+管理后台读取计数只需扫描这张小表，与门店、商家的数量无关。
+
+对账任务定期对 store、merchant 表做一次 GROUP BY，与计数表比较并补上差值，
+用于发现和修复绕过服务层的写入（手工 SQL、旧数据导入等）造成的偏差。
+"""
+import logging
+from collections import Counter as Tally
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, select, text, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.jobs import enqueue, job_handler
+from core.metrics import Counter, Gauge, registry
+from models.job import Job
+from models.merchant import Merchant
+from models.moderation_count import ModerationCount
+from models.store import Store
+
+logger = logging.getLogger(__name__)
+
+reconcile_drift = registry.register(Gauge(
+    "moderation_count_drift", "最近一次对账发现的计数偏差（各项差值绝对值之和）",
+))
+reconcile_runs = registry.register(Counter(
+    "moderation_reconcile_total", "审核计数对账次数", ("result",),
+))
+
+# (对象类型, 分类, 状态)
+CountKey = Tuple[str, str, str]
+
+# 门店 is_pass 与状态名的对应关系，其他取值（含空值）按待审核统计
+STORE_STATUSES = {0: "pending", 1: "approved", 2: "rejected"}
+
+RECONCILE_JOB = "reconcile_moderation_counts"
+
+# 最近一次对账的结果（本进程内）
+last_reconcile: Dict[str, object] = {}
+
+
+def store_key(store_type: str, is_pass: Optional[int]) -> CountKey:
+    return ("store", store_type, STORE_STATUSES.get(is_pass, "pending"))
+
+
+def merchant_key(status: str) -> CountKey:
+    return ("merchant", "", status)
+
+
+async def adjust(db: AsyncSession, deltas: Dict[CountKey, int]):
+    """
+    在当前事务中累加计数，随业务数据一起提交
+
+    Args:
+        db: 业务数据所在的数据库会话
+        deltas: 各计数项的变化量
+    """
+    rows = [
+        {"entity": entity, "category": category, "status": status, "count": delta}
+        for (entity, category, status), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    table = ModerationCount.__table__
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.entity, table.c.category, table.c.status],
+            set_={"count": table.c.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+    elif dialect == "mysql":
+        stmt = mysql_insert(table).values(rows)
+        await db.execute(stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count))
+    else:
+        for row in rows:
+            result = await db.execute(
+                update(table)
+                .where(
+                    table.c.entity == row["entity"],
+                    table.c.category == row["category"],
+                    table.c.status == row["status"],
+                )
+                .values(count=table.c.count + row["count"])
+            )
+            if result.rowcount == 0:
+                await db.execute(table.insert().values(**row))
+
+
+def transition(before: CountKey, after: CountKey, count: int = 1) -> Dict[CountKey, int]:
+    """状态或分类变化对应的变化量"""
+    if before == after:
+        return {}
+    return {before: -count, after: count}
+
+
+async def get_counts(db: AsyncSession) -> dict:
+    """
+    读取计数表，按门店类型、商家状态汇总
+
+    Returns:
+        dict: {"stores": {"total": {...}, "by_type": {...}}, "merchants": {...}}
+    """
+    result = await db.execute(select(
+        ModerationCount.entity, ModerationCount.category, ModerationCount.status, ModerationCount.count
+    ))
+    statuses = dict.fromkeys(STORE_STATUSES.values(), 0)
+    stores = {"total": dict(statuses), "by_type": {}}
+    merchants = dict(statuses)
+    for entity, category, status, count in result.all():
+        if entity == "store":
+            stores["total"][status] = stores["total"].get(status, 0) + count
+            stores["by_type"].setdefault(category, dict(statuses))[status] = count
+        else:
+            merchants[status] = merchants.get(status, 0) + count
+    return {"stores": stores, "merchants": merchants}
+
+
+async def _actual_counts(db: AsyncSession) -> Tally:
+    status = case(
+        (Store.is_pass == 1, "approved"),
+        (Store.is_pass == 2, "rejected"),
+        else_="pending",
+    )
+    actual = Tally()
+    result = await db.execute(
+        select(Store.store_type, status, func.count()).group_by(Store.store_type, status)
+    )
+    for store_type, store_status, count in result.all():
+        actual[("store", store_type, store_status)] = count
+    result = await db.execute(select(Merchant.status, func.count()).group_by(Merchant.status))
+    for merchant_status, count in result.all():
+        actual[merchant_key(merchant_status)] = count
+    return actual
+
+
+async def reconcile(db: AsyncSession, repair: bool = True) -> Dict[CountKey, int]:
+    """
+    对账：重新统计门店和商家数量，与计数表比较
+
+    统计与读取计数表在同一事务中完成，补差时累加差值而不是覆盖，
+    对账期间并发写入的增量不会丢失。
+
+    Args:
+        db: 数据库会话
+        repair: 为 True 时把差值补到计数表
+
+    Returns:
+        Dict[CountKey, int]: 有偏差的计数项及差值（实际数量 - 计数表）
+    """
+    if db.bind.dialect.name == "sqlite":
+        # SQLite 的 SELECT 不会开启事务，先执行一条不修改数据的写语句取得写锁，
+        # 使两次统计和计数表读取看到同一时刻的数据
+        await db.execute(text("UPDATE moderation_count SET count = count WHERE 0"))
+    actual = await _actual_counts(db)
+    result = await db.execute(select(
+        ModerationCount.entity, ModerationCount.category, ModerationCount.status, ModerationCount.count
+    ))
+    recorded = Tally({(entity, category, status): count for entity, category, status, count in result.all()})
+
+    drift = {
+        key: actual[key] - recorded[key]
+        for key in set(actual) | set(recorded)
+        if actual[key] != recorded[key]
+    }
+    if repair and drift:
+        await adjust(db, drift)
+    await db.commit()
+
+    total = sum(abs(delta) for delta in drift.values())
+    reconcile_drift.set((), total)
+    reconcile_runs.inc(("drift" if drift else "ok",))
+    last_reconcile.update({
+        "at": datetime.utcnow().isoformat(),
+        "drift": total,
+        "repaired": repair and bool(drift),
+    })
+    if drift:
+        logger.warning("审核计数与实际数据不一致，%s: %s", "已修正" if repair else "未修正", drift)
+    return drift
+
+
+async def schedule_reconcile(db: AsyncSession):
+    """
+    安排下一次对账：已有待执行的对账任务时不重复安排
+
+    多个进程同时安排时可能各写入一个任务，之后执行的任务发现已有待执行任务就不再续排，
+    最终只保留一条对账任务链。
+    """
+    if settings.MODERATION_RECONCILE_INTERVAL <= 0:
+        return
+    result = await db.execute(
+        select(Job.id).where(Job.kind == RECONCILE_JOB, Job.status == "pending").limit(1)
+    )
+    if result.first() is None:
+        enqueue(db, RECONCILE_JOB, {}, delay=settings.MODERATION_RECONCILE_INTERVAL)
+    await db.commit()
+
+
+@job_handler(RECONCILE_JOB)
+async def reconcile_job(payload: dict):
+    """定期对账任务，执行后安排下一次"""
+    async with AsyncSessionLocal() as db:
+        await reconcile(db)
+        await schedule_reconcile(db)
@@ -0,0 +1,322 @@
+"""
+门店照片存储
+
+上传的照片按内容的 SHA-256 寻址：MEDIA_ROOT/photos/<前两位>/<摘要>/ 下保存原图
+original.<扩展名>，以及每个缩略图边长的 <边长>.jpg / <边长>.webp 和全尺寸的 full.webp。
+相同内容的照片只保存一份；文件写入后不再修改，可以长期缓存。
+"""
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from typing import AsyncIterable, List, Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from core.config import settings
+from core.hash_pool import HashPool, HashPoolBusy
+
+# 文件头 -> 扩展名
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+MEDIA_TYPES = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+
+# 允许访问的文件名：原图、缩略图和全尺寸 WebP
+VARIANT_NAME = re.compile(r"^(original\.(jpg|png|gif|webp)|\d+\.(jpg|webp)|full\.webp)$")
+DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+# 请求体累积到该字节数后交给线程池解析并写入临时文件，减少线程切换次数
+WRITE_BUFFER_BYTES = 256 * 1024
+
+# 缩略图生成工作池，与密码哈希池相互独立
+image_pool = HashPool(
+    kind=settings.IMAGE_POOL_KIND,
+    workers=settings.IMAGE_POOL_WORKERS,
+    max_pending=settings.IMAGE_POOL_MAX_PENDING,
+    name="image-pool",
+)
+
+
+def thumb_sizes() -> List[int]:
+    return sorted({int(size) for size in settings.PHOTO_THUMB_SIZES.split(",") if size.strip()})
+
+
+def photo_dir(digest: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, "photos", digest[:2], digest)
+
+
+def photo_url(digest: str, name: str) -> str:
+    return f"/stores/photos/{digest}/{name}"
+
+
+def sniff_image(head: bytes) -> Optional[str]:
+    """按文件头判断图片格式，返回扩展名"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def render_variants(source: str, target_dir: str, sizes: List[int]) -> List[str]:
+    """
+    生成缩略图和 WebP 版本（在工作池中执行）
+
+    已存在的文件不会重新生成；每个文件先写入临时文件再改名，读取方不会看到写了一半的文件。
+
+    Returns:
+        List[str]: 生成的文件名
+
+    Raises:
+        ValueError: 文件无法解码为图片
+    """
+    # 在工作池中才导入 Pillow，应用启动时不加载
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return []
+    try:
+        with Image.open(source) as image:
+            image.load()
+            image = ImageOps.exif_transpose(image)
+    except Exception:
+        raise ValueError("无法解码的图片")
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    outputs = [("full.webp", image, "WEBP")]
+    for size in sizes:
+        thumb = image.copy()
+        thumb.thumbnail((size, size))
+        outputs.append((f"{size}.webp", thumb, "WEBP"))
+        outputs.append((f"{size}.jpg", thumb.convert("RGB"), "JPEG"))
+
+    names = []
+    for name, variant, fmt in outputs:
+        path = os.path.join(target_dir, name)
+        if not os.path.exists(path):
+            tmp = path + ".tmp"
+            variant.save(tmp, fmt, quality=82)
+            os.replace(tmp, path)
+        names.append(name)
+    return names
+
+
+class _PhotoPart:
+    """
+    流式解析 multipart 请求体，把名为 file 的部分边接收边写入临时文件并计算摘要
+    """
+
+    def __init__(self, tmp_dir: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.file = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="upload-", delete=False)
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.found = False
+        self._field = b""
+        self._value = b""
+        self._disposition = b""
+        self._capturing = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self):
+        self._disposition = b""
+        self._field = self._value = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._value += data[start:end]
+
+    def _on_header_end(self):
+        if self._field.lower() == b"content-disposition":
+            self._disposition = self._value
+        self._field = self._value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        # 只接收第一个名为 file 的部分，其余部分忽略
+        self._capturing = not self.found and options.get(b"name") == b"file"
+        self.found = self.found or self._capturing
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if not self._capturing:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"照片不能超过 {self.max_bytes} 字节"
+            )
+        if len(self.head) < 16:
+            self.head += chunk[:16 - len(self.head)]
+        self.sha256.update(chunk)
+        self.file.write(chunk)
+
+    def _on_part_end(self):
+        self._capturing = False
+
+
+def _open_part(max_bytes: int) -> _PhotoPart:
+    tmp_dir = os.path.join(settings.MEDIA_ROOT, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    return _PhotoPart(tmp_dir, max_bytes)
+
+
+def _store_original(part: _PhotoPart, target_dir: str, original: str) -> bool:
+    """把临时文件移动到内容寻址的位置，已存在相同照片时返回 False"""
+    if os.path.exists(original):
+        return False
+    os.makedirs(target_dir, exist_ok=True)
+    os.replace(part.file.name, original)
+    return True
+
+
+def _discard_part(part: _PhotoPart):
+    part.file.close()
+    if os.path.exists(part.file.name):
+        os.unlink(part.file.name)
+
+
+async def save_photo(chunks: AsyncIterable[bytes], content_type: Optional[str]) -> dict:
+    """
+    接收 multipart 上传的照片并按内容寻址保存，同时生成缩略图
+
+    请求体边接收边写入磁盘，内存中最多保留 WRITE_BUFFER_BYTES 字节；
+    解析和文件读写在线程池中执行，缩略图在工作池中生成，都不阻塞事件循环。
+    相同内容的照片已存在时直接复用。
+
+    Args:
+        chunks: 请求体数据块
+        content_type: 请求的 Content-Type，需为 multipart/form-data
+
+    Returns:
+        dict: 摘要、大小、原图地址和各版本地址
+
+    Raises:
+        HTTPException: 请求格式错误、文件过大或不是支持的图片时抛出异常
+    """
+    ctype, options = parse_options_header(content_type or "")
+    boundary = options.get(b"boundary")
+    if ctype != b"multipart/form-data" or not boundary:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请使用 multipart/form-data 上传，文件字段名为 file"
+        )
+
+    part = await run_in_threadpool(_open_part, settings.PHOTO_MAX_BYTES)
+    target_dir = None
+    created = False
+    try:
+        parser = MultipartParser(boundary, part.callbacks())
+        try:
+            buffered: List[bytes] = []
+            size = 0
+            async for chunk in chunks:
+                buffered.append(chunk)
+                size += len(chunk)
+                if size >= WRITE_BUFFER_BYTES:
+                    await run_in_threadpool(parser.write, b"".join(buffered))
+                    buffered, size = [], 0
+            if buffered:
+                await run_in_threadpool(parser.write, b"".join(buffered))
+            await run_in_threadpool(parser.finalize)
+        except MultipartParseError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"multipart 请求体格式错误: {e}"
+            )
+        await run_in_threadpool(part.file.close)
+
+        if not part.found or part.size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="缺少照片文件（字段名 file）"
+            )
+        ext = sniff_image(part.head)
+        if ext is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="只支持 JPEG、PNG、GIF 或 WebP 图片"
+            )
+
+        digest = part.sha256.hexdigest()
+        target_dir = photo_dir(digest)
+        original = os.path.join(target_dir, f"original.{ext}")
+        created = await run_in_threadpool(_store_original, part, target_dir, original)
+
+        try:
+            variants = await image_pool.run(render_variants, original, target_dir, thumb_sizes())
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except HashPoolBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry later",
+                headers={"Retry-After": str(settings.HASH_POOL_RETRY_AFTER)},
+            )
+    except HTTPException as e:
+        # 本次新建但处理失败的照片不保留
+        if created and e.status_code == status.HTTP_400_BAD_REQUEST:
+            await run_in_threadpool(shutil.rmtree, target_dir, ignore_errors=True)
+        raise
+    finally:
+        await run_in_threadpool(_discard_part, part)
+
+    return {
+        "digest": digest,
+        "size": part.size,
+        "url": photo_url(digest, f"original.{ext}"),
+        "variants": {name: photo_url(digest, name) for name in variants},
+    }
+
+
+def photo_path(digest: str, name: str) -> str:
+    """
+    获取照片文件路径
+
+    Raises:
+        HTTPException: 名称不合法或文件不存在时抛出404
+    """
+    path = None
+    if DIGEST.match(digest) and VARIANT_NAME.match(name):
+        path = os.path.join(photo_dir(digest), name)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="照片不存在"
+        )
+    return path
@@ -0,0 +1,137 @@
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.store import Store
+# 导入以注册全文检索表的 DDL
+from models import store_search  # noqa: F401
+
+# SQLite FTS5 虚拟表
+store_fts = table(
+    "store_fts",
+    column("rowid"),
+    column("store_address"),
+    column("store_type"),
+    column("merchant_name"),
+    column("merchant_description"),
+)
+
+# trigram 分词只能匹配长度不少于3个字符的片段
+TRIGRAM_MIN_LENGTH = 3
+# 搜索关键词最多取前若干个
+MAX_TERMS = 8
+
+
+def split_terms(q: str) -> List[str]:
+    """
+    按空白拆分关键词
+
+    Raises:
+        HTTPException: 关键词为空时抛出400
+    """
+    terms = [term for term in q.split() if term][:MAX_TERMS]
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="搜索关键词不能为空"
+        )
+    return terms
+
+
+def _fts5_phrase(term: str) -> str:
+    """将关键词转为 FTS5 短语，避免用户输入被解析为查询语法"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _sqlite_query(terms: List[str]):
+    long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+
+    query = select(Store).join(store_fts, store_fts.c.rowid == Store.id)
+    if long_terms:
+        query = query.where(
+            text("store_fts MATCH :match").bindparams(
+                match=" AND ".join(_fts5_phrase(t) for t in long_terms)
+            )
+        ).order_by(text("bm25(store_fts)"), Store.id.desc())
+    else:
+        # 全部是短关键词时无法使用索引，退化为扫描索引表
+        query = query.order_by(Store.id.desc())
+
+    document = (
+        func.coalesce(store_fts.c.store_address, "") + " "
+        + func.coalesce(store_fts.c.store_type, "") + " "
+        + func.coalesce(store_fts.c.merchant_name, "") + " "
+        + func.coalesce(store_fts.c.merchant_description, "")
+    )
+    for term in short_terms:
+        query = query.where(func.instr(document, term) > 0)
+    return query
+
+
+# MySQL：门店与商家两组 FULLTEXT 索引的相关度之和
+_MYSQL_SEARCH = """
+SELECT store.* FROM store
+LEFT JOIN merchant ON merchant.user_id = store.owner_id
+WHERE (
+    MATCH (store.store_address, store.store_type) AGAINST (:keywords)
+    OR MATCH (merchant.name, merchant.description) AGAINST (:keywords)
+)
+{filters}
+ORDER BY
+    MATCH (store.store_address, store.store_type) AGAINST (:keywords)
+    + COALESCE(MATCH (merchant.name, merchant.description) AGAINST (:keywords), 0) DESC,
+    store.id DESC
+LIMIT :limit OFFSET :offset
+"""
+
+
+def _mysql_query(terms: List[str], limit: int, offset: int, is_pass: Optional[int]):
+    params = {"keywords": " ".join(terms), "limit": limit, "offset": offset}
+    filters = ""
+    if is_pass is not None:
+        filters = "AND store.is_pass = :is_pass"
+        params["is_pass"] = is_pass
+    statement = text(_MYSQL_SEARCH.format(filters=filters)).bindparams(**params)
+    return select(Store).from_statement(statement)
+
+
+async def search_stores(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    offset: int = 0,
+    is_pass: Optional[int] = None
+) -> Tuple[List[Store], Optional[int]]:
+    """
+    按地址、门店类型以及所属商家的名称/描述全文检索门店，结果按相关度排序
+
+    Args:
+        db: 数据库会话
+        q: 搜索关键词，空白分隔的多个关键词需同时匹配
+        limit: 每页条数
+        offset: 偏移量
+        is_pass: 按审核状态筛选
+
+    Returns:
+        Tuple[List[Store], Optional[int]]: 门店列表和下一页偏移量
+    """
+    terms = split_terms(q)
+    # 多取一行用于判断是否还有下一页
+    if db.bind.dialect.name == "mysql":
+        query = _mysql_query(terms, limit + 1, offset, is_pass)
+    else:
+        query = _sqlite_query(terms)
+        if is_pass is not None:
+            query = query.where(Store.is_pass == is_pass)
+        query = query.limit(limit + 1).offset(offset)
+
+    result = await db.execute(query)
+    stores = result.scalars().all()
+    next_offset = None
+    if len(stores) > limit:
+        stores = stores[:limit]
+        next_offset = offset + limit
+    return stores, next_offset
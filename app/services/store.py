@@ -1,48 +1,70 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
 from fastapi import HTTPException, status
+from core.config import settings
 from models.store import Store
 from models.user import User
+from core.audit import audit_log
+from core.cache import ReadThroughCache
+from core.events import event_broker
+from core.jobs import enqueue
+from core.pagination import encode_cursor, keyset_before
+from core.principal_cache import Principal
+from schemas.moderation import StoreReviewRequest, BatchReviewResult
+from services.moderation import apply_review, check_batch_ids
 from schemas.store import StoreCreate, StoreUpdate
+from services.geocoding import GEOCODE_STORE_JOB
+from services.moderation_stats import adjust, store_key, transition
+
+def _owner_id_of(username: str):
+    """按用户名取用户ID的标量子查询，按归属人筛选时走 owner_id 索引"""
+    return select(User.id).where(User.username == username).scalar_subquery()
+
+
+# 门店详情读缓存，键为门店ID
+store_cache = ReadThroughCache("store")
 
 class StoreService:
     @staticmethod
-    async def create_store(db: Session, owner_account: str, store_data: StoreCreate) -> Store:
+    async def create_store(
+        db: AsyncSession,
+        owner_id: int,
+        owner_account: str,
+        store_data: StoreCreate
+    ) -> Store:
         """
         创建门店信息
         
+        归属人即当前已认证用户，不再按用户名查询用户表，由外键保证 owner_id 有效
+        
         Args:
             db: 数据库会话
-            owner_account: 门店归属人账户标识
+            owner_id: 门店归属人用户ID
+            owner_account: 门店归属人用户名
             store_data: 门店信息数据
             
         Returns:
             Store: 创建的门店信息
-            
-        Raises:
-            HTTPException: 当用户不存在时抛出异常
         """
-        # 检查用户是否存在
-        user = db.query(User).filter(User.username == owner_account).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="用户不存在"
-            )
-            
-        # 创建门店信息
         store = Store(
+            owner_id=owner_id,
             owner_account=owner_account,
             **store_data.model_dump()
         )
         
         db.add(store)
-        db.commit()
-        db.refresh(store)
+        await db.flush()
+        # 地理编码在提交后由后台任务完成，不计入请求耗时
+        enqueue(db, GEOCODE_STORE_JOB, {"store_id": store.id, "address": store.store_address})
+        await adjust(db, {store_key(store.store_type, store.is_pass): 1})
+        await db.commit()
+        await db.refresh(store)
         
         return store
         
     @staticmethod
-    async def get_store(db: Session, store_id: int) -> Store:
+    async def get_store(db: AsyncSession, store_id: int) -> Store:
         """
         获取门店信息
         
@@ -56,7 +78,7 @@ class StoreService:
         Raises:
             HTTPException: 当门店不存在时抛出异常
         """
-        store = db.query(Store).filter(Store.id == store_id).first()
+        store = await db.get(Store, store_id)
         if not store:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -66,9 +88,10 @@ class StoreService:
         
     @staticmethod
     async def update_store(
-        db: Session,
+        db: AsyncSession,
         store_id: int,
-        store_data: StoreUpdate
+        store_data: StoreUpdate,
+        owner_id: Optional[int] = None
     ) -> Store:
         """
         更新门店信息
@@ -77,34 +100,167 @@ class StoreService:
             db: 数据库会话
             store_id: 门店ID
             store_data: 更新的门店信息
+            owner_id: 指定时只允许该用户修改自己的门店
             
         Returns:
             Store: 更新后的门店信息
             
         Raises:
-            HTTPException: 当门店不存在时抛出异常
+            HTTPException: 门店不存在时抛出404，不是门店归属人时抛出403
         """
         store = await StoreService.get_store(db, store_id)
+        if owner_id is not None and store.owner_id != owner_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="无权修改其他门店的信息"
+            )
         
         # 更新门店信息
-        for field, value in store_data.model_dump(exclude_unset=True).items():
+        data = store_data.model_dump(exclude_unset=True)
+        counted_before = store_key(store.store_type, store.is_pass)
+        if data.get("store_address") not in (None, store.store_address):
+            # 地址变更后原坐标失效，由后台任务按新地址重新编码
+            store.latitude = store.longitude = store.geo_cell = None
+            enqueue(db, GEOCODE_STORE_JOB, {"store_id": store_id, "address": data["store_address"]})
+        for field, value in data.items():
             setattr(store, field, value)
+        await adjust(db, transition(counted_before, store_key(store.store_type, store.is_pass)))
             
-        db.commit()
-        db.refresh(store)
+        # 会话提交后不过期属性，门店也没有由数据库生成的更新列，无需再 refresh
+        await db.commit()
+        store_cache.invalidate(store_id)
         
         return store
         
     @staticmethod
-    async def get_stores_by_owner(db: Session, owner_account: str) -> list[Store]:
+    async def list_stores(
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        owner_id: Optional[int] = None,
+        owner_account: Optional[str] = None,
+        is_pass: Optional[int] = None,
+        store_type: Optional[str] = None
+    ) -> Tuple[list[Store], Optional[str]]:
+        """
+        按创建时间倒序分页获取门店列表（游标分页）
+        
+        Args:
+            db: 数据库会话
+            limit: 每页条数
+            cursor: 上一页返回的游标，为空时从第一页开始
+            owner_id: 按门店归属人用户ID筛选
+            owner_account: 按门店归属人用户名筛选
+            is_pass: 按审核状态筛选
+            store_type: 按门店类型筛选
+            
+        Returns:
+            Tuple[list[Store], Optional[str]]: 门店列表和下一页游标（没有更多数据时为None）
+        """
+        query = select(Store)
+        if owner_id is not None:
+            query = query.where(Store.owner_id == owner_id)
+        if owner_account is not None:
+            query = query.where(Store.owner_id == _owner_id_of(owner_account))
+        if is_pass is not None:
+            query = query.where(Store.is_pass == is_pass)
+        if store_type is not None:
+            query = query.where(Store.store_type == store_type)
+        after = keyset_before(Store.created_at, Store.id, cursor)
+        if after is not None:
+            query = query.where(after)
+        
+        # 多取一行用于判断是否还有下一页
+        query = query.order_by(Store.created_at.desc(), Store.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        stores = result.scalars().all()
+        
+        next_cursor = None
+        if len(stores) > limit:
+            stores = stores[:limit]
+            last = stores[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return stores, next_cursor
+        
+    @staticmethod
+    async def get_stores_by_owner(
+        db: AsyncSession,
+        owner_id: int,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[list[Store], Optional[str]]:
         """
-        获取用户的所有门店
+        分页获取用户的门店
         
         Args:
             db: 数据库会话
-            owner_account: 门店归属人账户标识
+            owner_id: 门店归属人用户ID
+            limit: 每页条数
+            cursor: 上一页返回的游标
             
         Returns:
-            list[Store]: 门店列表
+            Tuple[list[Store], Optional[str]]: 门店列表和下一页游标
         """
-        return db.query(Store).filter(Store.owner_account == owner_account).all() 
\ No newline at end of file
+        return await StoreService.list_stores(db, limit, cursor, owner_id=owner_id)
+        
+    @staticmethod
+    async def review_stores(
+        db: AsyncSession,
+        review: StoreReviewRequest,
+        actor: Optional[Principal] = None
+    ) -> BatchReviewResult:
+        """
+        批量审核门店（is_pass 0 -> 1/2）
+        
+        Args:
+            db: 数据库会话
+            review: 批量审核请求，指定ID列表或筛选条件
+            actor: 审核人，记入审计日志
+            
+        Returns:
+            BatchReviewResult: 更新条数和每个门店的处理结果
+        """
+        if review.ids is not None:
+            ids = review.ids
+        else:
+            # 按条件选取待审核门店，先到先审
+            query = select(Store.id).where(Store.is_pass == 0)
+            if review.filter is not None:
+                if review.filter.store_type is not None:
+                    query = query.where(Store.store_type == review.filter.store_type)
+                if review.filter.owner_account is not None:
+                    query = query.where(Store.owner_id == _owner_id_of(review.filter.owner_account))
+            query = query.order_by(Store.id).limit(min(review.limit, settings.MODERATION_BATCH_MAX))
+            result = await db.execute(query)
+            ids = result.scalars().all()
+            if not ids:
+                return BatchReviewResult(updated=0, results=[])
+        
+        async def count_reviewed(updated_ids):
+            result = await db.execute(
+                select(Store.store_type, func.count())
+                .where(Store.id.in_(updated_ids), Store.is_pass == review.is_pass)
+                .group_by(Store.store_type)
+            )
+            deltas = {}
+            for store_type, count in result.all():
+                deltas.update(transition(store_key(store_type, 0), store_key(store_type, review.is_pass), count))
+            await adjust(db, deltas)
+        
+        result = await apply_review(
+            db, Store, Store.is_pass, 0, check_batch_ids(ids), {"is_pass": review.is_pass},
+            before_commit=count_reviewed
+        )
+        updated_ids = [item.id for item in result.results if item.outcome == "updated"]
+        for store_id in updated_ids:
+            store_cache.invalidate(store_id)
+        if updated_ids:
+            # 按归属人推送审核结果
+            owners = await db.execute(select(Store.id, Store.owner_id).where(Store.id.in_(updated_ids)))
+            for store_id, owner_id in owners.all():
+                event_broker.publish(
+                    owner_id, "store_status", {"store_id": store_id, "is_pass": review.is_pass}
+                )
+        for store_id in updated_ids:
+            audit_log.record("store.review", actor, "store", store_id, {"from": 0, "to": review.is_pass})
+        return result
\ No newline at end of file
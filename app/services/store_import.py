@@ -0,0 +1,172 @@
+import csv
+import json
+from collections import Counter
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.store import Store
+from schemas.store import ImportRowError, StoreCreate, StoreImportReport
+from services.moderation_stats import adjust, store_key
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    将字节流切分为文本行，只在内存中保留当前未结束的一行
+    """
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            if first:
+                text = text.lstrip("\ufeff")
+                first = False
+            yield text
+    if buffer:
+        text = buffer.decode("utf-8", errors="replace").rstrip("\r")
+        yield text.lstrip("\ufeff") if first else text
+
+
+async def iter_ndjson_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, object]]:
+    """逐行解析 NDJSON，返回 (行号, 数据)；解析失败时数据为异常对象"""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+
+
+async def iter_csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, object]]:
+    """
+    逐条解析 CSV（首行为表头），返回 (起始行号, 数据)
+    引号内的换行会使一条记录跨越多行：双引号个数为偶数时记录才完整
+    """
+    header = None
+    pending = []
+    start = 0
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, ValueError(f"列数为 {len(values)}，表头为 {len(header)} 列")
+            continue
+        # 空字符串视为未填写
+        yield start, {k: (v if v != "" else None) for k, v in zip(header, values)}
+    if pending:
+        yield start, ValueError("引号未闭合")
+
+
+async def import_stores(
+    db: AsyncSession,
+    owner_id: int,
+    owner_account: str,
+    lines: AsyncIterable[str],
+    fmt: str = "ndjson",
+    batch_size: Optional[int] = None,
+    chunk_rows: Optional[int] = None
+) -> StoreImportReport:
+    """
+    流式导入门店
+
+    每行按 StoreCreate 校验，合法的行累积到 batch_size 后以 executemany 写入，
+    每 chunk_rows 行提交一次事务。内存中只保留当前批次和有限条错误信息，
+    与文件大小无关。
+
+    Args:
+        db: 数据库会话
+        owner_id: 门店归属人用户ID
+        owner_account: 门店归属人用户名
+        lines: 文本行
+        fmt: ndjson 或 csv
+        batch_size: 单次 executemany 的行数
+        chunk_rows: 单个事务提交的行数
+
+    Returns:
+        StoreImportReport: 导入条数和失败行
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的导入格式: {fmt}"
+        )
+    batch_size = batch_size or settings.STORE_IMPORT_BATCH_SIZE
+    chunk_rows = max(chunk_rows or settings.STORE_IMPORT_CHUNK_ROWS, batch_size)
+    rows = iter_ndjson_rows(lines) if fmt == "ndjson" else iter_csv_rows(lines)
+
+    inserted = 0
+    uncommitted = 0
+    failed = 0
+    errors = []
+    batch = []
+
+    async def flush():
+        nonlocal inserted, uncommitted, batch
+        if not batch:
+            return
+        await db.execute(insert(Store), batch)
+        await adjust(db, Counter(store_key(row["store_type"], 0) for row in batch))
+        inserted += len(batch)
+        uncommitted += len(batch)
+        batch = []
+        if uncommitted >= chunk_rows:
+            await db.commit()
+            uncommitted = 0
+
+    async for line_no, data in rows:
+        error = None
+        if isinstance(data, Exception):
+            error = str(data)
+        elif not isinstance(data, dict):
+            error = "每行必须是一个对象"
+        else:
+            try:
+                store = StoreCreate.model_validate(data)
+            except ValidationError as e:
+                error = "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+        if error is not None:
+            failed += 1
+            if len(errors) < settings.STORE_IMPORT_MAX_ERRORS:
+                errors.append(ImportRowError(line=line_no, error=error))
+            continue
+
+        batch.append({**store.model_dump(), "owner_id": owner_id, "owner_account": owner_account})
+        if len(batch) >= batch_size:
+            await flush()
+
+    await flush()
+    await db.commit()
+
+    return StoreImportReport(
+        inserted=inserted,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
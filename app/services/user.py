@@ -0,0 +1,220 @@
+import asyncio
+import re
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.hash_pool import HashPoolBusy, hash_pool
+from models.user import User, UserRole
+from schemas.auth import RegisterRequest, UserProvisionResult, UserProvisionSkipped
+from services.auth import get_password_hash, get_password_hash_async
+
+# 从唯一约束冲突的错误信息中识别冲突的列：
+# SQLite "UNIQUE constraint failed: user.username"，MySQL "Duplicate entry '...' for key 'user.username'"
+_DUPLICATE_COLUMN = re.compile(r"(?:user\.|key ')(username|account)\b")
+
+_DUPLICATE_DETAIL = {
+    "username": "Username already registered",
+    "account": "Account already registered",
+}
+
+# 批量创建时哈希工作池排队已满的重试间隔（秒）与最多重试次数，约 5 秒后放弃
+HASH_RETRY_DELAY = 0.05
+HASH_RETRY_LIMIT = 100
+
+
+async def _duplicate_column(db: AsyncSession, error: IntegrityError, username: str, account: str) -> Optional[str]:
+    """判断唯一约束冲突发生在哪一列，错误信息中识别不出时查询一次"""
+    match = _DUPLICATE_COLUMN.search(str(error.orig))
+    if match:
+        return match.group(1)
+    result = await db.execute(
+        select(User.username).where(or_(User.username == username, User.account == account)).limit(1)
+    )
+    existing = result.scalar()
+    if existing is None:
+        return None
+    return "username" if existing == username else "account"
+
+
+async def create_user(db: AsyncSession, request: RegisterRequest) -> User:
+    """
+    注册新用户
+
+    不预先查询用户名和账号是否已存在，直接插入并由唯一约束判断重复，
+    只需一次数据库往返，也没有"先查后插"之间的并发窗口。
+
+    Args:
+        db: 数据库会话
+        request: 注册请求数据
+
+    Returns:
+        User: 新建的用户
+
+    Raises:
+        HTTPException: 用户名或账号已存在时抛出400
+    """
+    db_user = User(
+        username=request.username,
+        account=request.account,
+        password=await get_password_hash_async(request.password),
+        phone_number=request.phone_number,
+        social_preference=request.social_preference,
+        role=UserRole.NORMAL
+    )
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        column = await _duplicate_column(db, e, request.username, request.account)
+        if column is None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_DUPLICATE_DETAIL[column]
+        )
+    return db_user
+
+
+async def _hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """
+    并行计算一批密码哈希
+
+    同时提交的任务数不超过 USER_PROVISION_CONCURRENCY，给登录和注册请求留出工作池容量；
+    工作池排队已满时稍后重试，重试 HASH_RETRY_LIMIT 次仍然已满时放弃。
+
+    Raises:
+        HashPoolBusy: 工作池持续排队已满
+    """
+    semaphore = asyncio.Semaphore(settings.USER_PROVISION_CONCURRENCY)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            for _ in range(HASH_RETRY_LIMIT):
+                try:
+                    return await hash_pool.run(get_password_hash, password)
+                except HashPoolBusy:
+                    await asyncio.sleep(HASH_RETRY_DELAY)
+            return await hash_pool.run(get_password_hash, password)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+
+async def _provision_batch(
+    db: AsyncSession,
+    batch: List[RegisterRequest],
+    skipped: List[UserProvisionSkipped]
+) -> int:
+    """
+    创建一批用户：一次查询筛掉已存在的用户，哈希剩余用户的密码后以一条多行 INSERT 写入
+
+    与并发注册冲突导致 INSERT 失败时，重新筛选后再试一次；仍然冲突时本批待创建的用户
+    以 conflict 原因跳过，不影响其他批次。
+
+    Raises:
+        HashPoolBusy: 工作池持续排队已满，本批未写入
+    """
+    hashes: Dict[str, str] = {}
+    for attempt in range(2):
+        result = await db.execute(
+            select(User.username, User.account).where(or_(
+                User.username.in_([user.username for user in batch]),
+                User.account.in_([user.account for user in batch]),
+            ))
+        )
+        rows = result.all()
+        taken_usernames = {row.username for row in rows}
+        taken_accounts = {row.account for row in rows}
+
+        fresh = []
+        batch_skipped = []
+        for user in batch:
+            if user.username in taken_usernames:
+                batch_skipped.append(UserProvisionSkipped(account=user.account, reason="duplicate_username"))
+            elif user.account in taken_accounts:
+                batch_skipped.append(UserProvisionSkipped(account=user.account, reason="duplicate_account"))
+            else:
+                fresh.append(user)
+        if not fresh:
+            skipped.extend(batch_skipped)
+            return 0
+
+        missing = [user for user in fresh if user.account not in hashes]
+        for user, hashed in zip(missing, await _hash_passwords([user.password for user in missing])):
+            hashes[user.account] = hashed
+
+        try:
+            await db.execute(insert(User.__table__), [
+                {
+                    "username": user.username,
+                    "account": user.account,
+                    "password": hashes[user.account],
+                    "phone_number": user.phone_number,
+                    "social_preference": user.social_preference.value if user.social_preference else None,
+                    "role": UserRole.NORMAL,
+                    "is_disabled": False,
+                }
+                for user in fresh
+            ])
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            if attempt:
+                skipped.extend(batch_skipped)
+                skipped.extend(UserProvisionSkipped(account=user.account, reason="conflict") for user in fresh)
+                return 0
+            continue
+        skipped.extend(batch_skipped)
+        return len(fresh)
+
+
+async def provision_users(db: AsyncSession, users: List[RegisterRequest]) -> UserProvisionResult:
+    """
+    批量创建用户，用于迁移其他系统的已有用户
+
+    按 USER_PROVISION_BATCH_SIZE 分批处理，每批一次查重、并行哈希密码、一条多行 INSERT 并提交；
+    与已有用户或本次请求中前面的用户重复的条目跳过并在结果中说明原因。
+    各批次独立提交，某一批失败时已提交的批次保留：与并发写入冲突的用户以 conflict 跳过，
+    哈希工作池持续繁忙时停止处理，剩余用户以 busy 跳过，结果中的 created 始终是实际创建的数量。
+
+    Args:
+        db: 数据库会话
+        users: 待创建的用户
+
+    Returns:
+        UserProvisionResult: 创建数量和跳过的用户（含因冲突或繁忙未创建、可以重试的用户）
+
+    Raises:
+        HTTPException: 用户数超出单次上限时抛出400
+    """
+    if len(users) > settings.USER_PROVISION_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"单次最多创建 {settings.USER_PROVISION_MAX} 个用户"
+        )
+
+    skipped: List[UserProvisionSkipped] = []
+    queue = []
+    seen_usernames, seen_accounts = set(), set()
+    for user in users:
+        if user.username in seen_usernames or user.account in seen_accounts:
+            skipped.append(UserProvisionSkipped(account=user.account, reason="duplicate_in_request"))
+            continue
+        seen_usernames.add(user.username)
+        seen_accounts.add(user.account)
+        queue.append(user)
+
+    created = 0
+    size = settings.USER_PROVISION_BATCH_SIZE
+    for start in range(0, len(queue), size):
+        try:
+            created += await _provision_batch(db, queue[start:start + size], skipped)
+        except HashPoolBusy:
+            skipped.extend(UserProvisionSkipped(account=user.account, reason="busy") for user in queue[start:])
+            break
+    return UserProvisionResult(created=created, skipped=skipped)
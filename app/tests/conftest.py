@@ -0,0 +1,59 @@
+"""
+测试公共配置
+
+在导入应用模块之前把数据库指向临时目录中的 SQLite 文件，并用 Alembic 迁移建表；
+所有测试共用一个事件循环（TestClient 也使用当前事件循环），连接池中的异步连接不会跨循环使用。
+
+运行方式（在 app 目录下）：
+    python -m pytest -q tests
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_tmp = tempfile.mkdtemp(prefix="iit-test-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["MEDIA_ROOT"] = os.path.join(_tmp, "media")
+sys.path.insert(0, APP_DIR)
+
+_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(_loop)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated():
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    command.upgrade(config, "head")
+    yield
+    # aiosqlite 的连接在独立线程中运行，不释放连接池进程无法退出
+    from core.database import async_engine, engine
+
+    _loop.run_until_complete(async_engine.dispose())
+    engine.dispose()
+
+
+@pytest.fixture
+def run():
+    """在共用的事件循环中执行协程"""
+    return _loop.run_until_complete
+
+
+@pytest.fixture
+def db(run):
+    """异步数据库会话"""
+    from core.database import AsyncSessionLocal
+
+    session = AsyncSessionLocal()
+    yield session
+    run(session.close())
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+import core.audit
+from core.audit import AuditLogger
+from core.database import AsyncSessionLocal
+from models.audit_log import AuditLog
+
+
+class _BrokenSession:
+    async def __aenter__(self):
+        raise ConnectionError("database unavailable")
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _count(run, action):
+    async def query():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.action == action))
+    return run(query())
+
+
+def test_failed_flush_requeues_in_order(run, monkeypatch):
+    action = f"test.{os.urandom(4).hex()}"
+    logger = AuditLogger(batch_size=2, flush_interval=1, max_buffer=10)
+    for target_id in range(5):
+        logger.record(action, target_type="store", target_id=target_id)
+
+    monkeypatch.setattr(core.audit, "AsyncSessionLocal", _BrokenSession)
+    with pytest.raises(ConnectionError):
+        run(logger.flush())
+    # 失败的一批放回缓冲区头部，顺序不变
+    assert [event["target_id"] for event in logger._buffer] == [0, 1, 2, 3, 4]
+    assert logger.stats()["failed_flushes"] == 1
+    assert logger.stats()["written"] == 0
+
+    monkeypatch.setattr(core.audit, "AsyncSessionLocal", AsyncSessionLocal)
+    run(logger.flush())
+    stats = logger.stats()
+    assert stats["buffered"] == 0
+    assert stats["written"] == 5
+    assert stats["flushes"] == 3
+    assert _count(run, action) == 5
+
+
+def test_full_buffer_drops_new_events():
+    logger = AuditLogger(batch_size=10, flush_interval=1, max_buffer=2)
+    for target_id in range(3):
+        logger.record("test.drop", target_type="store", target_id=target_id)
+    assert [event["target_id"] for event in logger._buffer] == [0, 1]
+    assert logger.stats()["dropped"] == 1
+    assert logger.stats()["recorded"] == 2
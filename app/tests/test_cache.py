@@ -0,0 +1,25 @@
+import pytest
+
+from core.cache import CacheBackend, MemoryCacheBackend
+
+
+def test_incomplete_backend_fails_on_creation():
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = MemoryCacheBackend(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+    assert cache.stats()["evictions"] == 1
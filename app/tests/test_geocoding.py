@@ -0,0 +1,18 @@
+import pytest
+
+from services.geocoding import Geocoder, LocalGeocoder
+
+
+def test_geocoder_requires_geocode():
+    class Incomplete(Geocoder):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_local_geocoder_prefers_longest_name():
+    geocoder = LocalGeocoder({"北京市": (1.0, 2.0), "北京市朝阳区": (3.0, 4.0)})
+    assert geocoder.geocode("北京市朝阳区建国路1号") == (3.0, 4.0)
+    assert geocoder.geocode("北京市海淀区") == (1.0, 2.0)
+    assert geocoder.geocode("上海市") is None
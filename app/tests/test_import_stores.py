@@ -0,0 +1,42 @@
+import argparse
+import os
+
+from core.database import AsyncSessionLocal
+from models.user import User
+from scripts import import_stores
+
+
+def _args(path, owner, **overrides):
+    values = {"path": str(path), "owner": owner, "format": None, "batch_size": None, "chunk_rows": None}
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def _create_owner(run) -> str:
+    name = f"importer-{os.urandom(4).hex()}"
+
+    async def create():
+        async with AsyncSessionLocal() as db:
+            db.add(User(username=name, account=name, password="p"))
+            await db.commit()
+    run(create())
+    return name
+
+
+def test_cli_reports_failed_rows(run, tmp_path, capsys):
+    owner = _create_owner(run)
+    path = tmp_path / "stores.ndjson"
+    path.write_text('{"store_type": \n[1, 2]\n', encoding="utf-8")
+
+    assert run(import_stores.run(_args(path, owner))) == 2
+    out = capsys.readouterr().out
+    assert "导入 0 条，失败 2 条" in out
+    assert "第 1 行" in out and "第 2 行: 每行必须是一个对象" in out
+
+
+def test_cli_unknown_owner(run, tmp_path, capsys):
+    path = tmp_path / "stores.csv"
+    path.write_text("store_type,store_address\n", encoding="utf-8")
+
+    assert run(import_stores.run(_args(path, "nobody-" + os.urandom(4).hex()))) == 1
+    assert "用户不存在" in capsys.readouterr().err
@@ -0,0 +1,84 @@
+import asyncio
+
+from sqlalchemy.sql import Select
+
+from core.database import AsyncSessionLocal
+from models.store import Store
+from services.moderation import apply_review
+
+
+async def _create_stores(count: int, is_pass: int = 0):
+    async with AsyncSessionLocal() as db:
+        stores = [
+            Store(store_type="review-test", store_address=f"addr{i}", owner_account="owner", is_pass=is_pass)
+            for i in range(count)
+        ]
+        db.add_all(stores)
+        await db.commit()
+        return [store.id for store in stores]
+
+
+async def _review(ids, is_pass, seen, barrier=None):
+    async def record(updated_ids):
+        seen.append(list(updated_ids))
+
+    async with AsyncSessionLocal() as db:
+        if barrier is not None:
+            _pause_after_first_select(db, barrier)
+        return await apply_review(db, Store, Store.is_pass, 0, ids, {"is_pass": is_pass}, before_commit=record)
+
+
+def _pause_after_first_select(db, barrier):
+    """读取审核状态后等待另一个批次也读取完毕，使两个批次的读取与更新交错执行"""
+    execute = db.execute
+    paused = []
+
+    async def paused_execute(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if isinstance(statement, Select) and not paused:
+            paused.append(True)
+            try:
+                # 另一个批次可能正在等待本批次的写锁，等待超时后继续
+                await asyncio.wait_for(barrier.wait(), 0.5)
+            except (asyncio.TimeoutError, asyncio.BrokenBarrierError):
+                pass
+        return result
+
+    db.execute = paused_execute
+
+
+def test_outcomes_distinguish_missing_and_reviewed(run):
+    pending = run(_create_stores(2))
+    reviewed = run(_create_stores(1, is_pass=2))
+    missing = max(pending + reviewed) + 1000
+    seen = []
+
+    result = run(_review(pending + reviewed + [missing], 1, seen))
+
+    outcomes = {item.id: item.outcome for item in result.results}
+    assert result.updated == 2
+    assert outcomes == {
+        pending[0]: "updated",
+        pending[1]: "updated",
+        reviewed[0]: "already_reviewed",
+        missing: "not_found",
+    }
+    assert seen == [pending]
+
+
+def test_concurrent_reviews_update_each_row_once(run):
+    ids = run(_create_stores(5))
+    seen = []
+
+    async def both():
+        barrier = asyncio.Barrier(2)
+        return await asyncio.gather(_review(ids, 1, seen, barrier), _review(ids, 2, seen, barrier))
+
+    first, second = run(both())
+
+    # 两个批次都看到这些门店处于待审核状态，但每个门店只能被其中一个批次更新
+    assert first.updated + second.updated == len(ids)
+    for left, right in zip(first.results, second.results):
+        assert sorted([left.outcome, right.outcome]) == ["already_reviewed", "updated"]
+    assert sorted(i for batch in seen for i in batch) == ids
+    assert sum(len(batch) for batch in seen) == first.updated + second.updated
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from core.database import AsyncSessionLocal
+from core.pagination import decode_cursor, encode_cursor, keyset_before
+from models.store import Store
+from services.store import StoreService
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 18, 12, 30, 45, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "", encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_before_without_cursor():
+    assert keyset_before(Store.created_at, Store.id, None) is None
+
+
+def test_keyset_pages_cover_every_row_once(run):
+    created_at = datetime(2001, 1, 1)
+    owner = "pagination-owner"
+
+    async def create():
+        async with AsyncSessionLocal() as db:
+            # 相同创建时间的行按 id 区分先后
+            db.add_all([
+                Store(store_type="page", store_address=f"a{i}", owner_account=owner, created_at=created_at)
+                for i in range(5)
+            ])
+            await db.commit()
+    run(create())
+
+    async def pages():
+        seen, cursor = [], None
+        async with AsyncSessionLocal() as db:
+            while True:
+                stores, cursor = await StoreService.list_stores(db, 2, cursor, owner_account=None, store_type="page")
+                seen.extend(store.id for store in stores)
+                if cursor is None:
+                    return seen
+
+    seen = run(pages())
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
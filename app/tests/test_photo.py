@@ -0,0 +1,60 @@
+import io
+import os
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from core.config import settings
+from services import photo
+from services.photo import save_photo
+
+BOUNDARY = "photo-test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _png(size=(64, 48)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _body(data: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        f"Content-Type: image/png\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def _chunks(body: bytes, size: int = 1000):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def _tmp_files():
+    tmp_dir = os.path.join(settings.MEDIA_ROOT, "tmp")
+    return os.listdir(tmp_dir) if os.path.isdir(tmp_dir) else []
+
+
+def test_save_photo_stores_original_and_variants(run, monkeypatch):
+    # 小于一个数据块的缓冲区，覆盖分段交给线程池写入的路径
+    monkeypatch.setattr(photo, "WRITE_BUFFER_BYTES", 4096)
+    data = _png()
+
+    saved = run(save_photo(_chunks(_body(data)), CONTENT_TYPE))
+
+    assert saved["size"] == len(data)
+    assert saved["url"].endswith("/original.png")
+    with open(photo.photo_path(saved["digest"], "original.png"), "rb") as f:
+        assert f.read() == data
+    assert saved["variants"]
+    assert _tmp_files() == []
+
+
+def test_save_photo_rejects_oversized_upload(run, monkeypatch):
+    monkeypatch.setattr(settings, "PHOTO_MAX_BYTES", 100)
+
+    with pytest.raises(HTTPException) as exc:
+        run(save_photo(_chunks(_body(_png((200, 200)))), CONTENT_TYPE))
+    assert exc.value.status_code == 413
+    assert _tmp_files() == []
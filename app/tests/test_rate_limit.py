@@ -0,0 +1,57 @@
+import pytest
+
+from core import rate_limit
+from core.rate_limit import MemoryRateLimitStore, RateLimitRule, RateLimitStore, lockout_seconds, parse_rules
+
+
+def test_parse_rules():
+    assert parse_rules("ip:300/60, token:600/60") == [
+        RateLimitRule("ip", 300, 60), RateLimitRule("token", 600, 60),
+    ]
+    assert parse_rules("") == []
+
+
+@pytest.mark.parametrize("text", ["ip:300", "ip300/60", "ip:x/60", "user:1/60", "ip:0/60", "ip:1/0"])
+def test_parse_rules_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_rules(text)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class Incomplete(RateLimitStore):
+        async def hit(self, key, limit, window):
+            return 0
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sliding_window_limits_and_recovers(run, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    store = MemoryRateLimitStore(shards=1)
+
+    assert [run(store.hit("k", 3, 10)) for _ in range(3)] == [0, 0, 0]
+    retry_after = run(store.hit("k", 3, 10))
+    assert retry_after > 0
+
+    # 下一个窗口开始时上一窗口的计数按时间加权，仍然超限
+    now[0] = 1010.5
+    assert run(store.hit("k", 3, 10)) > 0
+    # 两个窗口之后计数清零
+    now[0] = 1030.0
+    assert run(store.hit("k", 3, 10)) == 0
+
+
+def test_lockout_grows_after_threshold(run, monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "LOGIN_LOCKOUT_THRESHOLD", 3)
+    monkeypatch.setattr(rate_limit.settings, "LOGIN_LOCKOUT_BASE", 30)
+    monkeypatch.setattr(rate_limit.settings, "LOGIN_LOCKOUT_MAX", 100)
+    assert [lockout_seconds(n) for n in range(1, 7)] == [0, 0, 30, 60, 100, 100]
+
+    store = MemoryRateLimitStore(shards=1)
+    assert [run(store.record_failure("login:a|ip")) for _ in range(3)] == [0, 0, 30]
+    assert 29 < run(store.locked_for("login:a|ip")) <= 30
+
+    run(store.reset_failures("login:a|ip"))
+    assert run(store.locked_for("login:a|ip")) == 0
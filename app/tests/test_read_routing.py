@@ -0,0 +1,22 @@
+from starlette.requests import Request
+
+from core.database import client_key
+
+
+def _request(headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+def test_client_key_does_not_keep_raw_token():
+    key = client_key(_request({"authorization": "Bearer secret-token"}))
+    assert "secret-token" not in key
+    assert key == client_key(_request({"authorization": "bearer secret-token"}))
+    assert key != client_key(_request({"authorization": "Bearer other-token"}))
+
+
+def test_client_key_falls_back_to_address():
+    assert client_key(_request({})) == "10.0.0.1"
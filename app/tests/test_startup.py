@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+
+from core.audit import audit_log
+from core.config import settings
+from core.jobs import job_queue
+
+
+def test_app_starts_and_stops_background_workers():
+    from main import app
+
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+        assert audit_log.running
+        assert job_queue.running == settings.JOB_QUEUE_ENABLED
+        assert client.get("/metrics").status_code == 200
+    assert not audit_log.running
+    assert not job_queue.running
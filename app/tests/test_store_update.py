@@ -0,0 +1,14 @@
+import pytest
+from pydantic import ValidationError
+
+from schemas.store import StoreUpdate
+
+
+def test_owner_update_cannot_set_review_status():
+    with pytest.raises(ValidationError):
+        StoreUpdate(is_pass=1)
+
+
+def test_owner_update_accepts_store_fields():
+    update = StoreUpdate(store_hours="9-5")
+    assert update.store_hours == "9-5"
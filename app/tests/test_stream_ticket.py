@@ -0,0 +1,37 @@
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from core.auth import create_stream_ticket, get_current_user, get_ticket_user
+from core.principal_cache import Principal
+from models.user import User
+from services.auth import create_access_token
+
+
+@pytest.fixture
+def principal(run, db):
+    async def create():
+        name = f"ticket-{os.urandom(4).hex()}"
+        user = User(username=name, account=name, password="x")
+        db.add(user)
+        await db.commit()
+        return Principal.from_user(user)
+    return run(create())
+
+
+def test_ticket_is_single_use(run, db, principal):
+    ticket = create_stream_ticket(principal)
+
+    assert run(get_ticket_user(ticket, db)).id == principal.id
+    with pytest.raises(HTTPException) as exc:
+        run(get_ticket_user(ticket, db))
+    assert exc.value.status_code == 401
+
+
+def test_ticket_and_access_token_are_not_interchangeable(run, db, principal):
+    access_token = create_access_token(data={"sub": principal.account})
+    with pytest.raises(HTTPException):
+        run(get_ticket_user(access_token, db))
+    with pytest.raises(HTTPException):
+        run(get_current_user(create_stream_ticket(principal), db))
@@ -0,0 +1,28 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from models.user import User, UserRole
+from services.auth import create_access_token
+
+
+def _token(run, db, role: UserRole) -> str:
+    async def create():
+        name = f"system-{os.urandom(4).hex()}"
+        db.add(User(username=name, account=name, password="x", role=role))
+        await db.commit()
+        return name
+    return create_access_token(data={"sub": run(create())})
+
+
+def test_system_stats_require_admin(run, db):
+    from main import app
+
+    client = TestClient(app)
+    assert client.get("/system/stats/jobs").status_code == 401
+
+    user = {"Authorization": f"Bearer {_token(run, db, UserRole.NORMAL)}"}
+    assert client.get("/system/stats/jobs", headers=user).status_code == 403
+
+    admin = {"Authorization": f"Bearer {_token(run, db, UserRole.ADMIN)}"}
+    assert client.get("/system/stats/jobs", headers=admin).status_code == 200
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from core.hash_pool import HashPoolBusy
+from schemas.auth import RegisterRequest
+from services import user as user_service
+from services.user import create_user, provision_users
+
+
+def _request(prefix: str) -> RegisterRequest:
+    name = f"{prefix}-{os.urandom(4).hex()}"
+    return RegisterRequest(username=name, account=name, password="p")
+
+
+def test_duplicate_registration_is_400(run, db):
+    request = _request("register")
+    run(create_user(db, request))
+
+    duplicate_account = RegisterRequest(username=request.username + "x", account=request.account, password="p")
+    with pytest.raises(HTTPException) as exc:
+        run(create_user(db, duplicate_account))
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Account already registered"
+
+    duplicate_username = RegisterRequest(username=request.username, account=request.account + "x", password="p")
+    with pytest.raises(HTTPException) as exc:
+        run(create_user(db, duplicate_username))
+    assert exc.value.detail == "Username already registered"
+
+
+def test_provision_reports_busy_users_instead_of_waiting_forever(run, db, monkeypatch):
+    async def busy(*args):
+        raise HashPoolBusy()
+
+    monkeypatch.setattr(user_service.hash_pool, "run", busy)
+    monkeypatch.setattr(user_service, "HASH_RETRY_DELAY", 0)
+    users = [_request("busy") for _ in range(3)]
+
+    result = run(provision_users(db, users))
+
+    assert result.created == 0
+    assert [(item.account, item.reason) for item in result.skipped] == [(user.account, "busy") for user in users]
+
+
+def test_provision_keeps_committed_batches_when_hash_pool_stays_busy(run, db, monkeypatch):
+    run_in_pool = user_service.hash_pool.run
+    calls = []
+
+    async def busy_after_first_batch(*args):
+        calls.append(args)
+        if len(calls) > 2:
+            raise HashPoolBusy()
+        return await run_in_pool(*args)
+
+    monkeypatch.setattr(user_service.hash_pool, "run", busy_after_first_batch)
+    monkeypatch.setattr(user_service, "HASH_RETRY_DELAY", 0)
+    monkeypatch.setattr(user_service.settings, "USER_PROVISION_BATCH_SIZE", 2)
+    users = [_request("partial") for _ in range(4)]
+
+    result = run(provision_users(db, users))
+
+    assert result.created == 2
+    assert [item.account for item in result.skipped] == [user.account for user in users[2:]]